@@ -0,0 +1,913 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Benchmarks Module
+
+Timing and memory measurements for the game's data loaders.
+
+Run from the project root:
+    python benchmarks.py loaders --kind items --sizes 1000 100000
+    python benchmarks.py tokenizer --sizes 100000
+    python benchmarks.py compression --sizes 100000
+    python benchmarks.py saves --sizes 10000
+    python benchmarks.py bulk --sizes 10000 100000
+    python benchmarks.py summary --sizes 5000
+    python benchmarks.py locks --sizes 2000
+    python benchmarks.py records --sizes 100000
+    python benchmarks.py levels --sizes 1000 1000000 100000000
+    python benchmarks.py cache --sizes 100
+    python benchmarks.py population --sizes 100000 1000000
+    python benchmarks.py leaderboard --sizes 1000 10000
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+import character_manager
+import combat_system
+import content_generator
+import file_utils
+import game_data
+import leaderboard
+import population
+
+# ============================================================================
+# TOKENIZER BENCHMARK
+# ============================================================================
+
+def _tokenize_lines(filename, kept=None):
+    """Run the line based tokenizer only, discarding the pairs unless kept is a list"""
+    blocks = 0
+    for start_line, block in game_data._read_blocks(filename):
+        pairs = game_data._split_lines(block)
+        if kept is not None:
+            kept.append(pairs)
+        blocks += 1
+    return blocks
+
+
+def _tokenize_mmap(filename, kept=None):
+    """Run the mmap tokenizer only, discarding the pairs unless kept is a list"""
+    blocks = 0
+    for pairs in game_data._iter_mmap_blocks(filename):
+        if kept is not None:
+            kept.append(pairs)
+        blocks += 1
+    return blocks
+
+
+def measure(function, filename):
+    """
+    Time one pass of function(filename), trace its memory on another,
+    and count its allocations on a third
+
+    The allocation count comes from tracemalloc snapshots taken before
+    and after a pass that keeps every block's pairs: the number of new
+    memory blocks allocated in game_data.py, per data block. Allocations
+    that were freed again during the pass don't show up in a snapshot,
+    so this counts the objects each block leaves behind.
+
+    Returns: Dictionary with blocks, seconds, peak_bytes (tracemalloc)
+             and allocations (per data block)
+    """
+    start = time.perf_counter()
+    blocks = function(filename)
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    function(filename)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    kept = []
+    only_game_data = [tracemalloc.Filter(True, game_data.__file__)]
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot().filter_traces(only_game_data)
+    function(filename, kept)
+    after = tracemalloc.take_snapshot().filter_traces(only_game_data)
+    tracemalloc.stop()
+    allocations = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    allocations /= blocks
+    del kept
+
+    return {"blocks": blocks, "seconds": seconds, "peak_bytes": peak,
+            "allocations": allocations}
+
+
+def compare_tokenizers(count=100000):
+    """
+    Compare the line based and mmap tokenizers on a generated items file
+
+    Returns: Dictionary {"lines": results, "mmap": results}
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        filename = os.path.join(directory, "items.txt")
+        content_generator.write_items(filename, count)
+        for name, function in (("lines", _tokenize_lines), ("mmap", _tokenize_mmap)):
+            results[name] = measure(function, filename)
+    return results
+
+
+def print_tokenizer_report(results):
+    """Print the output of compare_tokenizers as a table"""
+    print(f"{'tokenizer':<10}{'blocks':>10}{'us/block':>12}{'peak KiB':>12}"
+          f"{'allocs/block':>14}")
+    for name, result in results.items():
+        per_block = result["seconds"] / result["blocks"] * 1e6
+        print(f"{name:<10}{result['blocks']:>10}{per_block:>12.2f}"
+              f"{result['peak_bytes'] / 1024:>12.1f}{result['allocations']:>14.1f}")
+
+# ============================================================================
+# LOADER BENCHMARK
+# ============================================================================
+
+def peak_rss_kib():
+    """Peak resident set size of this process in KiB, or None if unknown"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":  # macOS reports bytes
+        peak //= 1024
+    return peak
+
+
+def time_phases(filename, kind):
+    """
+    Stream a data file once, timing the read, parse and validate phases
+
+    Nothing is kept, so memory stays flat however big the file is.
+
+    Returns: Dictionary with blocks and read/parse/validate/total seconds
+    """
+    parse, validate, id_field = game_data._kind_functions(kind)
+    clock = time.perf_counter
+    read_time = parse_time = validate_time = 0.0
+    blocks = 0
+
+    start = clock()
+    iterator = game_data._read_blocks(filename)
+    while True:
+        before_read = clock()
+        try:
+            start_line, block = next(iterator)
+        except StopIteration:
+            read_time += clock() - before_read
+            break
+        before_parse = clock()
+        block_data = parse(block)
+        before_validate = clock()
+        validate(block_data)
+        after = clock()
+        read_time += before_parse - before_read
+        parse_time += before_validate - before_parse
+        validate_time += after - before_validate
+        blocks += 1
+
+    return {"blocks": blocks, "read": read_time, "parse": parse_time,
+            "validate": validate_time, "total": clock() - start}
+
+
+def time_load(filename, kind, mode):
+    """
+    Time one full load_items / load_quests call in the given mode
+
+    Modes: "serial", "mmap", "parallel" (one worker per CPU), "cached"
+    (a warm compiled cache)
+
+    Returns: Dictionary with blocks and total seconds
+    """
+    load = game_data.load_items if kind == "item" else game_data.load_quests
+    options = {"use_cache": False}
+    if mode == "mmap":
+        options["use_mmap"] = True
+    elif mode == "parallel":
+        options["workers"] = os.cpu_count() or 1
+    elif mode == "cached":
+        options["use_cache"] = True
+        load(filename, use_cache=True)
+
+    start = time.perf_counter()
+    data = load(filename, **options)
+    return {"blocks": len(data), "total": time.perf_counter() - start}
+
+
+def _run_in_child(filename, kind, mode):
+    """Run one measurement (in a fresh process) and add its peak RSS"""
+    if mode == "phases":
+        result = time_phases(filename, kind)
+    else:
+        result = time_load(filename, kind, mode)
+    result["peak_rss_kib"] = peak_rss_kib()
+    return result
+
+
+def benchmark_loaders(kind="item", sizes=(1000, 10000, 100000),
+                      modes=("phases", "serial", "mmap", "parallel", "cached"),
+                      chain_depth=5, directory=None):
+    """
+    Generate files of each size and measure the loaders on them
+
+    Every measurement runs in its own process so peak RSS isn't carried
+    over from the one before.
+
+    Args:
+        kind: "item" or "quest"
+        sizes: Block counts to generate
+        modes: "phases" plus any time_load mode
+        chain_depth: Prerequisite chain depth for generated quests
+        directory: Where to write the files (a temporary directory if None)
+
+    Returns: List of result dictionaries with size and mode added
+    """
+    results = []
+    with tempfile.TemporaryDirectory(dir=directory) as work_directory:
+        for size in sizes:
+            filename = os.path.join(work_directory, f"{kind}s_{size}.txt")
+            if kind == "item":
+                content_generator.write_items(filename, size)
+            else:
+                content_generator.write_quests(filename, size, chain_depth)
+            for mode in modes:
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    result = executor.submit(_run_in_child, filename, kind, mode).result()
+                result["size"] = size
+                result["mode"] = mode
+                results.append(result)
+            for leftover in (filename, filename + game_data.CACHE_SUFFIX):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+    return results
+
+
+def print_loader_report(results):
+    """Print the output of benchmark_loaders as a table"""
+    print(f"{'size':>10} {'mode':<9}{'blocks/s':>12}{'read s':>9}{'parse s':>9}"
+          f"{'valid s':>9}{'total s':>9}{'peak RSS MiB':>14}")
+    for result in results:
+        rate = result["blocks"] / result["total"] if result["total"] else 0
+        phases = ""
+        for phase in ("read", "parse", "validate"):
+            phases += f"{result[phase]:>9.3f}" if phase in result else f"{'-':>9}"
+        rss = result["peak_rss_kib"]
+        rss = f"{rss / 1024:>14.1f}" if rss is not None else f"{'-':>14}"
+        print(f"{result['size']:>10} {result['mode']:<9}{rate:>12.0f}{phases}"
+              f"{result['total']:>9.3f}{rss}")
+
+# ============================================================================
+# COMPRESSION BENCHMARK
+# ============================================================================
+
+def benchmark_compression(size=100000, extensions=("", ".gz", ".bz2", ".xz"), directory=None):
+    """
+    Compare loading a plain items file against compressed copies of it
+
+    Returns: List of dictionaries with extension, file bytes, seconds
+             and blocks/s
+    """
+    results = []
+    with tempfile.TemporaryDirectory(dir=directory) as work_directory:
+        plain = os.path.join(work_directory, "items.txt")
+        content_generator.write_items(plain, size)
+        for extension in extensions:
+            filename = plain + extension
+            if extension:
+                with open(plain, "rb") as source, file_utils.open_binary(filename, "wb") as target:
+                    shutil.copyfileobj(source, target)
+            start = time.perf_counter()
+            items = game_data.load_items(filename, use_cache=False)
+            seconds = time.perf_counter() - start
+            results.append({"extension": extension or "(none)",
+                            "bytes": os.path.getsize(filename),
+                            "seconds": seconds,
+                            "rate": len(items) / seconds})
+    return results
+
+
+def print_compression_report(results):
+    """Print the output of benchmark_compression as a table"""
+    print(f"{'format':<8}{'MiB':>9}{'load s':>9}{'blocks/s':>12}")
+    for result in results:
+        print(f"{result['extension']:<8}{result['bytes'] / 1048576:>9.2f}"
+              f"{result['seconds']:>9.3f}{result['rate']:>12.0f}")
+
+# ============================================================================
+# SAVE FORMAT BENCHMARK
+# ============================================================================
+
+def make_characters(count, list_length=None):
+    """
+    Create count characters with a few items and quests each
+
+    With list_length, every character gets that many inventory items and
+    completed quests instead (a long-running save).
+    """
+    classes = ["Warrior", "Mage", "Rogue", "Cleric"]
+    characters = []
+    for i in range(count):
+        character = character_manager.create_character(f"Hero{i}", classes[i % 4])
+        character["level"] = i % 50 + 1
+        character["experience"] = i * 7 % 5000
+        character["gold"] = i * 13 % 100000
+        character["inventory"] = [f"item_{(i + j) % 500}" for j in range(i % 8)]
+        character["active_quests"] = [f"quest_{i % 300}"]
+        character["completed_quests"] = [f"quest_{j}" for j in range(i % 12)]
+        if list_length is not None:
+            character["inventory"] = [f"item_{j % 500}" for j in range(list_length)]
+            character["completed_quests"] = [f"quest_{j}" for j in range(list_length)]
+        characters.append(character)
+    return characters
+
+
+def benchmark_save_formats(count=10000, directory=None):
+    """
+    Compare the text and binary save formats on count characters
+
+    "encode"/"decode" time the format alone; "save"/"load" are full
+    save_character / load_character calls including the file I/O.
+
+    Returns: Dictionary {format: {"bytes", "encode", "decode", "save", "load"}}
+    """
+    characters = make_characters(count)
+    encoders = {"text": lambda c: character_manager._format_save(c).encode("utf-8"),
+                "binary": character_manager._format_binary_save}
+    decoders = {"text": character_manager._parse_text_save,
+                "binary": character_manager._parse_binary_save}
+    results = {}
+    with tempfile.TemporaryDirectory(dir=directory) as work_directory:
+        for save_format in character_manager.SAVE_FORMATS:
+            result = {}
+            start = time.perf_counter()
+            blobs = [encoders[save_format](character) for character in characters]
+            result["encode"] = time.perf_counter() - start
+            start = time.perf_counter()
+            for blob in blobs:
+                decoders[save_format](blob)
+            result["decode"] = time.perf_counter() - start
+
+            save_directory = os.path.join(work_directory, save_format)
+            start = time.perf_counter()
+            for character in characters:
+                character_manager.save_character(character, save_directory,
+                                                 save_format=save_format)
+            result["save"] = time.perf_counter() - start
+            start = time.perf_counter()
+            for character in characters:
+                character_manager.load_character(character["name"], save_directory)
+            result["load"] = time.perf_counter() - start
+            result["bytes"] = sum(entry.stat().st_size for entry in os.scandir(save_directory))
+            results[save_format] = result
+    return results
+
+
+def print_save_format_report(results, count):
+    """Print the output of benchmark_save_formats as a table"""
+    print(f"{count} characters")
+    print(f"{'format':<8}{'MiB':>8}{'encode s':>10}{'decode s':>10}{'save s':>9}{'load s':>9}")
+    for save_format, result in results.items():
+        print(f"{save_format:<8}{result['bytes'] / 1048576:>8.2f}{result['encode']:>10.3f}"
+              f"{result['decode']:>10.3f}{result['save']:>9.3f}{result['load']:>9.3f}")
+
+def benchmark_summary(count=5000, list_length=200, directory=None):
+    """
+    Time reading a roster (name, class, level, gold) of count saves with
+    load_character and with load_character_summary, in both formats
+
+    Returns: Dictionary {format: {"full": seconds, "summary": seconds}}
+    """
+    characters = make_characters(count, list_length)
+    results = {}
+    with tempfile.TemporaryDirectory(dir=directory) as work_directory:
+        for save_format in character_manager.SAVE_FORMATS:
+            save_directory = os.path.join(work_directory, save_format)
+            for character in characters:
+                character_manager.save_character(character, save_directory,
+                                                 save_format=save_format)
+            result = {}
+            for method, load in (("full", character_manager.load_character),
+                                 ("summary", character_manager.load_character_summary)):
+                start = time.perf_counter()
+                for character in characters:
+                    load(character["name"], save_directory)
+                result[method] = time.perf_counter() - start
+            results[save_format] = result
+    return results
+
+
+def print_summary_report(results, count):
+    """Print the output of benchmark_summary as a table"""
+    print(f"{count} saves")
+    print(f"{'format':<8}{'full s':>9}{'summary s':>11}{'speedup':>9}")
+    for save_format, result in results.items():
+        print(f"{save_format:<8}{result['full']:>9.3f}{result['summary']:>11.3f}"
+              f"{result['full'] / result['summary']:>9.1f}")
+
+# ============================================================================
+# BULK LOAD/SAVE BENCHMARK
+# ============================================================================
+
+def benchmark_bulk(count=10000, workers=(1, 4, 16), latency=0.0, directory=None):
+    """
+    Time saving and loading count characters one at a time and through
+    save_characters / load_characters with each thread count
+
+    Args:
+        latency: Seconds of delay added to every save file open, to model
+                 network storage on a local disk (0 = none)
+
+    Returns: List of dictionaries with method, workers and save/load
+             characters per second
+    """
+    characters = make_characters(count)
+    names = [character["name"] for character in characters]
+    results = []
+    real_open_binary = file_utils.open_binary
+
+    def slow_open_binary(filename, mode="rb"):
+        time.sleep(latency)
+        return real_open_binary(filename, mode)
+
+    if latency:
+        file_utils.open_binary = slow_open_binary
+    try:
+        with tempfile.TemporaryDirectory(dir=directory) as work_directory:
+            _run_bulk(characters, names, workers, work_directory, results)
+    finally:
+        file_utils.open_binary = real_open_binary
+    return results
+
+
+def _run_bulk(characters, names, workers, work_directory, results):
+    """Measurement loop of benchmark_bulk"""
+    count = len(characters)
+    save_directory = os.path.join(work_directory, "loop")
+    start = time.perf_counter()
+    for character in characters:
+        character_manager.save_character(character, save_directory)
+    save_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for name in names:
+        character_manager.load_character(name, save_directory)
+    load_seconds = time.perf_counter() - start
+    results.append({"method": "loop", "workers": 1,
+                    "save_rate": count / save_seconds, "load_rate": count / load_seconds})
+
+    for worker_count in workers:
+        save_directory = os.path.join(work_directory, f"bulk{worker_count}")
+        start = time.perf_counter()
+        character_manager.save_characters(characters, save_directory, worker_count)
+        save_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        character_manager.load_characters(names, save_directory, worker_count)
+        load_seconds = time.perf_counter() - start
+        results.append({"method": "bulk", "workers": worker_count,
+                        "save_rate": count / save_seconds,
+                        "load_rate": count / load_seconds})
+
+
+def print_bulk_report(results, count):
+    """Print the output of benchmark_bulk as a table"""
+    print(f"{count} characters")
+    print(f"{'method':<8}{'workers':>8}{'saves/s':>10}{'loads/s':>10}")
+    for result in results:
+        print(f"{result['method']:<8}{result['workers']:>8}{result['save_rate']:>10.0f}"
+              f"{result['load_rate']:>10.0f}")
+
+# ============================================================================
+# LOCKING BENCHMARK
+# ============================================================================
+
+def benchmark_locks(count=2000, processes=(1, 2, 4, 8), characters=1, directory=None):
+    """
+    Time count update_character calls spread over several processes all
+    updating the same few characters, and check that none was lost
+
+    Returns: List of dictionaries with processes, updates per second,
+             conflicts, contended locks, mean wait per contended lock (ms)
+             and lost updates (should be 0)
+    """
+    results = []
+    names = [f"Hot{i}" for i in range(characters)]
+    for process_count in processes:
+        with tempfile.TemporaryDirectory(dir=directory) as save_directory:
+            for name in names:
+                character_manager.save_character(
+                    character_manager.create_character(name, "Warrior"), save_directory)
+            per_process = count // process_count
+            start = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=process_count) as executor:
+                stats = list(executor.map(_update_gold, [save_directory] * process_count,
+                                          [names] * process_count,
+                                          [per_process] * process_count))
+            seconds = time.perf_counter() - start
+            gold = sum(character_manager.load_character(name, save_directory)["gold"] - 100
+                       for name in names)
+        contended = sum(stat["contended"] for stat in stats)
+        wait = sum(stat["wait_seconds"] for stat in stats)
+        results.append({"processes": process_count,
+                        "rate": per_process * process_count / seconds,
+                        "conflicts": sum(stat["conflicts"] for stat in stats),
+                        "contended": contended,
+                        "mean_wait_ms": wait / contended * 1000 if contended else 0.0,
+                        "lost": per_process * process_count - gold})
+    return results
+
+
+def _update_gold(save_directory, names, count):
+    """Worker process of benchmark_locks: add 1 gold count times"""
+    def change(character):
+        character["gold"] += 1
+    character_manager.reset_save_stats()
+    for i in range(count):
+        character_manager.update_character(names[i % len(names)], change, save_directory)
+    return character_manager.get_lock_stats()
+
+
+def print_lock_report(results, count):
+    """Print the output of benchmark_locks as a table"""
+    print(f"{count} updates")
+    print(f"{'procs':<6}{'updates/s':>10}{'conflicts':>10}{'contended':>10}"
+          f"{'wait ms':>9}{'lost':>6}")
+    for result in results:
+        print(f"{result['processes']:<6}{result['rate']:>10.0f}{result['conflicts']:>10}"
+              f"{result['contended']:>10}{result['mean_wait_ms']:>9.2f}{result['lost']:>6}")
+
+# ============================================================================
+# RECORD BENCHMARK
+# ============================================================================
+
+def _enemy_dict(enemy_type):
+    """A goblin built the way create_enemy did before records"""
+    base_stats = {"health": 50, "strength": 8, "magic": 2, "xp_reward": 25, "gold_reward": 10}
+    return {"name": "Goblin",
+            "enemy_type": enemy_type,
+            "health": base_stats["health"],
+            "max_health": base_stats["health"],
+            "strength": base_stats["strength"],
+            "magic": base_stats["magic"],
+            "xp_reward": base_stats["xp_reward"],
+            "gold_reward": base_stats["gold_reward"]}
+
+
+def benchmark_records(count=100000):
+    """
+    Compare slotted Enemy records with the plain dictionaries they replace
+
+    For each kind: memory per enemy (tracemalloc, including the objects
+    themselves but not shared strings), enemies created per second, and
+    rounds per second of a damage loop (calculate and apply damage, as
+    in SimpleBattle) using subscripts and, for records, attributes.
+
+    Returns: List of dictionaries with kind, bytes, create_rate and
+             damage_rate
+    """
+    results = []
+    for kind, create in (("dict", _enemy_dict), ("record", combat_system.create_enemy)):
+        tracemalloc.start()
+        start = time.perf_counter()
+        enemies = [create("goblin") for _ in range(count)]
+        create_seconds = time.perf_counter() - start
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for attacker, defender in zip(enemies, reversed(enemies)):
+            damage = max(attacker["strength"] - defender["strength"] // 4, 1)
+            defender["health"] = max(defender["health"] - damage, 0)
+        damage_seconds = time.perf_counter() - start
+        results.append({"kind": kind, "bytes": memory / count,
+                        "create_rate": count / create_seconds,
+                        "damage_rate": count / damage_seconds})
+        if kind == "record":
+            start = time.perf_counter()
+            for attacker, defender in zip(enemies, reversed(enemies)):
+                damage = max(attacker.strength - defender.strength // 4, 1)
+                defender.health = max(defender.health - damage, 0)
+            damage_seconds = time.perf_counter() - start
+            results.append({"kind": "attribute", "bytes": memory / count,
+                            "create_rate": count / create_seconds,
+                            "damage_rate": count / damage_seconds})
+        del enemies
+    return results
+
+
+def _calculate_damage_dict(attacker, defender):
+    """SimpleBattle.calculate_damage as it was before records"""
+    damage = attacker["strength"] - (defender["strength"] // 4)
+    if damage < 1:
+        damage = 1
+    return damage
+
+
+def _apply_damage_dict(target, damage):
+    """SimpleBattle.apply_damage as it was before records"""
+    target["health"] -= damage
+    if target["health"] < 0:
+        target["health"] = 0
+
+
+def benchmark_battle(count=100000, repeat=5):
+    """
+    Time combat rounds (calculate_damage then apply_damage) between
+    enemies, with SimpleBattle on records and with the subscript code
+    it replaced on plain dictionaries
+
+    Each rate is the best of repeat runs, so one slow run doesn't decide
+    the comparison.
+
+    Returns: Dictionary {"dict": rounds per second, "record": rounds per second}
+    """
+    battle = combat_system.SimpleBattle(None, None)
+    kinds = (("dict", _enemy_dict, _calculate_damage_dict, _apply_damage_dict),
+             ("record", combat_system.create_enemy, battle.calculate_damage,
+              battle.apply_damage))
+    results = {}
+    for kind, create, calculate_damage, apply_damage in kinds:
+        enemies = [create("goblin") for _ in range(count)]
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for attacker, defender in zip(enemies, reversed(enemies)):
+                apply_damage(defender, calculate_damage(attacker, defender))
+            seconds = time.perf_counter() - start
+            if best is None or seconds < best:
+                best = seconds
+        results[kind] = count / best
+    return results
+
+
+def print_record_report(results, count):
+    """Print the output of benchmark_records as a table"""
+    print(f"{count} enemies")
+    print(f"{'access':<10}{'bytes each':>11}{'creates/s':>11}{'rounds/s':>11}")
+    for result in results:
+        print(f"{result['kind']:<10}{result['bytes']:>11.0f}{result['create_rate']:>11.0f}"
+              f"{result['damage_rate']:>11.0f}")
+
+# ============================================================================
+# LEVELING BENCHMARK
+# ============================================================================
+
+def _gain_experience_loop(character, xp_amount):
+    """gain_experience as it was before: one loop pass per level gained"""
+    character["experience"] += xp_amount
+    level_up_xp = character["level"] * 100
+    while character["experience"] >= level_up_xp:
+        character["experience"] -= level_up_xp
+        character["level"] += 1
+        character["max_health"] += 10
+        character["strength"] += 2
+        character["magic"] += 2
+        character["health"] = character["max_health"]
+        level_up_xp = character["level"] * 100
+
+
+def benchmark_levels(xp_amount=1000000, repeat=200):
+    """
+    Time granting xp_amount experience to a fresh character, with the
+    old level-by-level loop and with gain_experience
+
+    Returns: Dictionary {"levels": levels gained, "loop": seconds per
+             grant, "closed_form": seconds per grant}
+    """
+    results = {}
+    for method, gain in (("loop", _gain_experience_loop),
+                         ("closed_form", character_manager.gain_experience)):
+        characters = [character_manager.create_character("Bench", "Warrior")
+                      for _ in range(repeat)]
+        start = time.perf_counter()
+        for character in characters:
+            gain(character, xp_amount)
+        results[method] = (time.perf_counter() - start) / repeat
+        results["levels"] = characters[0]["level"] - 1
+    return results
+
+
+def print_level_report(results, xp_amount):
+    """Print the output of benchmark_levels as one table row"""
+    print(f"{xp_amount:>12} xp {results['levels']:>7} levels  "
+          f"loop {results['loop'] * 1e6:>9.1f} us  "
+          f"closed form {results['closed_form'] * 1e6:>6.1f} us")
+
+# ============================================================================
+# CHARACTER CACHE BENCHMARK
+# ============================================================================
+
+def benchmark_cache(count=100, rounds=50, directory=None):
+    """
+    Time loading the same count characters rounds times over, with the
+    load_character cache off and on
+
+    Returns: Dictionary {"uncached": loads per second, "cached": loads
+             per second, "hit_rate": fraction of cached loads that hit}
+    """
+    characters = make_characters(count)
+    names = [character["name"] for character in characters]
+    old_size = character_manager.CHARACTER_CACHE_SIZE
+    results = {}
+    with tempfile.TemporaryDirectory(dir=directory) as save_directory:
+        for character in characters:
+            character_manager.save_character(character, save_directory)
+        try:
+            for method, size in (("uncached", 0), ("cached", max(count, old_size))):
+                character_manager.clear_character_cache()
+                character_manager.set_cache_size(size)
+                before = character_manager.get_cache_stats()
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    for name in names:
+                        character_manager.load_character(name, save_directory)
+                results[method] = count * rounds / (time.perf_counter() - start)
+                after = character_manager.get_cache_stats()
+            results["hit_rate"] = (after["hits"] - before["hits"]) / (count * rounds)
+        finally:
+            character_manager.set_cache_size(old_size)
+    return results
+
+
+def print_cache_report(results, count):
+    """Print the output of benchmark_cache"""
+    print(f"{count} characters: uncached {results['uncached']:.0f} loads/s, "
+          f"cached {results['cached']:.0f} loads/s "
+          f"({results['cached'] / results['uncached']:.1f}x, "
+          f"hit rate {results['hit_rate']:.0%})")
+
+# ============================================================================
+# POPULATION BENCHMARK
+# ============================================================================
+
+def benchmark_population(count=1000000):
+    """
+    Time creating count NPCs with create_character in a loop, with
+    population.spawn_characters and with population.spawn_population
+
+    Returns: Dictionary {method: characters per second}
+    """
+    classes = population.CLASS_NAMES
+    methods = {
+        "create_character": lambda: [character_manager.create_character(f"NPC{i}",
+                                                                         classes[i % 4])
+                                     for i in range(count)],
+        "spawn_characters": lambda: population.spawn_characters(count, seed=1),
+        "spawn_population": lambda: population.spawn_population(count, seed=1),
+    }
+    results = {}
+    for method, create in methods.items():
+        start = time.perf_counter()
+        created = create()
+        results[method] = count / (time.perf_counter() - start)
+        del created
+    return results
+
+
+def print_population_report(results, count):
+    """Print the output of benchmark_population"""
+    print(f"{count} NPCs")
+    for method, rate in results.items():
+        print(f"{method:<18}{rate:>14,.0f} /s")
+
+# ============================================================================
+# LEADERBOARD BENCHMARK
+# ============================================================================
+
+def _naive_top(save_directory, names, stat, count):
+    """Load every character and sort, the way a leaderboard was built before"""
+    characters = [character_manager.load_character(name, save_directory) for name in names]
+    characters.sort(key=lambda character: (-character[stat], character["name"]))
+    return [(character["name"], character[stat]) for character in characters[:count]]
+
+
+def benchmark_leaderboard(count=10000, queries=1000, directory=None):
+    """
+    Time a leaderboard over count saved characters: rebuilding it, the
+    extra cost of a save it follows, top-100 and rank queries, and the
+    load-everything-and-sort query it replaces
+
+    Returns: Dictionary {measurement: seconds}
+    """
+    characters = make_characters(count)
+    names = [character["name"] for character in characters]
+    old_size = character_manager.CHARACTER_CACHE_SIZE
+    results = {}
+    with tempfile.TemporaryDirectory(dir=directory) as save_directory:
+        character_manager.save_characters(characters, save_directory)
+        character_manager.set_cache_size(0)
+        try:
+            start = time.perf_counter()
+            _naive_top(save_directory, names, "gold", 100)
+            results["naive top 100"] = time.perf_counter() - start
+
+            # The first rebuild also rebuilds the save index the bulk save left stale
+            board = leaderboard.Leaderboard(save_directory, ["level", "gold"])
+            for measurement in ("rebuild (new index)", "rebuild"):
+                start = time.perf_counter()
+                board.rebuild()
+                results[measurement] = time.perf_counter() - start
+
+            saved = characters[:min(count, 500)]
+            for attached in (False, True):
+                if attached:
+                    board.attach()
+                start = time.perf_counter()
+                for character in saved:
+                    character["gold"] += 1
+                    character_manager.save_character(character, save_directory)
+                results[f"save ({'attached' if attached else 'detached'})"] = (
+                    (time.perf_counter() - start) / len(saved))
+            board.detach()
+
+            start = time.perf_counter()
+            for _ in range(queries):
+                board.top("gold", 100)
+            results["top 100"] = (time.perf_counter() - start) / queries
+            start = time.perf_counter()
+            for i in range(queries):
+                board.rank(names[i % count], "gold")
+            results["rank"] = (time.perf_counter() - start) / queries
+        finally:
+            character_manager.set_cache_size(old_size)
+    return results
+
+
+def print_leaderboard_report(results, count):
+    """Print the output of benchmark_leaderboard"""
+    print(f"{count} characters")
+    for measurement, seconds in results.items():
+        print(f"{measurement:<20}{seconds * 1e6:>14,.1f} us")
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main(argv=None):
+    """Run the benchmark named on the command line"""
+    parser = argparse.ArgumentParser(description="Quest Chronicles benchmarks.")
+    parser.add_argument("benchmark", choices=["loaders", "tokenizer", "compression", "saves",
+                                              "bulk", "summary", "locks", "records",
+                                              "levels", "cache", "population",
+                                              "leaderboard"])
+    parser.add_argument("--kind", choices=["items", "quests"], default="items")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--modes", nargs="+",
+                        default=["phases", "serial", "mmap", "parallel", "cached"])
+    parser.add_argument("--depth", type=int, default=5, help="quest prerequisite chain depth")
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="seconds added to each save file open (bulk benchmark)")
+    args = parser.parse_args(argv)
+
+    if args.benchmark == "tokenizer":
+        for size in args.sizes:
+            print_tokenizer_report(compare_tokenizers(size))
+    elif args.benchmark == "leaderboard":
+        for size in args.sizes:
+            print_leaderboard_report(benchmark_leaderboard(size), size)
+    elif args.benchmark == "population":
+        for size in args.sizes:
+            print_population_report(benchmark_population(size), size)
+    elif args.benchmark == "cache":
+        for size in args.sizes:
+            print_cache_report(benchmark_cache(size), size)
+    elif args.benchmark == "levels":
+        for size in args.sizes:
+            print_level_report(benchmark_levels(size), size)
+    elif args.benchmark == "records":
+        for size in args.sizes:
+            print_record_report(benchmark_records(size), size)
+            battle = benchmark_battle(size)
+            print(f"battle rounds/s: dict {battle['dict']:.0f}, record {battle['record']:.0f}")
+            if battle["record"] < battle["dict"]:
+                print("Combat on records is slower than the dictionary baseline")
+                return 1
+    elif args.benchmark == "locks":
+        for size in args.sizes:
+            print_lock_report(benchmark_locks(size), size)
+    elif args.benchmark == "summary":
+        for size in args.sizes:
+            print_summary_report(benchmark_summary(size), size)
+    elif args.benchmark == "bulk":
+        for size in args.sizes:
+            print_bulk_report(benchmark_bulk(size, latency=args.latency), size)
+    elif args.benchmark == "saves":
+        for size in args.sizes:
+            print_save_format_report(benchmark_save_formats(size), size)
+    elif args.benchmark == "compression":
+        for size in args.sizes:
+            print_compression_report(benchmark_compression(size))
+    else:
+        kind = args.kind[:-1]
+        print_loader_report(benchmark_loaders(kind, args.sizes, args.modes, args.depth))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
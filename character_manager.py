@@ -10,15 +10,130 @@ This module handles character creation, loading, and saving.
 """
 
 from fileinput import filename
+import contextlib
+import hashlib
+import math
 import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import file_utils
+import save_index
+from records import Character
 from custom_exceptions import (
     InvalidCharacterClassError,
     CharacterNotFoundError,
     SaveFileCorruptedError,
     InvalidSaveDataError,
+    SaveConflictError,
     CharacterDeadError
 )
 
+try:
+    import fcntl
+except ImportError:     # Windows: no advisory locks, so saves aren't locked
+    fcntl = None
+
+SAVE_SUFFIX = "_save.txt"
+
+# A save directory holding this file uses the sharded layout: each save
+# lives in a subdirectory named by the first SHARD_PREFIX_LENGTH hex
+# digits of the SHA-1 of the character name (see get_save_directory)
+SHARD_MARKER = ".sharded"
+SHARD_PREFIX_LENGTH = 2
+
+# Journaled saves (save_character(..., journal=True)) append the changed
+# fields to {name}_journal.log instead of rewriting the save, and fold the
+# journal back into a full save after this many records
+JOURNAL_SUFFIX = "_journal.log"
+JOURNAL_COMPACT_RECORDS = 50
+JOURNAL_COMMIT = "COMMIT"
+SAVE_FORMATS = ["text", "binary"]
+
+# Binary saves start with one fixed-size header: magic, format version,
+# the numeric stats (NUMERIC_SAVE_FIELDS order), the byte lengths of
+# name and class, then an entry count and a byte length for each list in
+# LIST_SAVE_FIELDS, and (from format version 2) the save's version stamp.
+# The strings and NUL-joined lists follow it in order.
+BINARY_SAVE_MAGIC = b"QCSV"
+BINARY_SAVE_VERSION = 2
+NUMERIC_SAVE_FIELDS = ["level", "health", "max_health", "strength", "magic", "experience", "gold"]
+STRING_SAVE_FIELDS = ["name", "class"]
+LIST_SAVE_FIELDS = ["inventory", "active_quests", "completed_quests"]
+SAVE_FIELDS = STRING_SAVE_FIELDS + NUMERIC_SAVE_FIELDS + LIST_SAVE_FIELDS
+SUMMARY_FIELDS = ["name", "class", "level", "gold"]
+_BINARY_HEADERS = {1: struct.Struct("<4sB7I2H3H3I"), 2: struct.Struct("<4sB7I2H3H3II")}
+_BINARY_HEADER = _BINARY_HEADERS[BINARY_SAVE_VERSION]
+
+# How many save_character calls wrote a file and how many were skipped
+# because the character hadn't changed (see get_save_stats)
+SAVE_STATS = {"written": 0, "skipped": 0}
+
+# Journal records appended, compactions into a full save, and bytes
+# appended (see get_journal_stats)
+JOURNAL_STATS = {"appended": 0, "compacted": 0, "bytes": 0}
+
+# Guards the counters above; saves can run on several threads
+_STATS_LOCK = threading.Lock()
+
+# Saves, loads and deletes hold an advisory lock (fcntl.flock) so several
+# game processes can share one save directory. Characters are spread over
+# 16 ** LOCK_STRIPE_DIGITS lock files (by the last hex digits of the SHA-1
+# of their name) in this subdirectory of the save directory, so the
+# number of lock files never grows with the number of saves. They are
+# never deleted: removing one while another process has it open would let
+# two processes lock different files for the same character
+LOCK_DIRNAME = ".locks"
+LOCK_STRIPE_DIGITS = 2
+
+# Locks taken, how many had to wait for another holder, the total
+# seconds spent waiting, and saves refused with SaveConflictError (see
+# get_lock_stats)
+LOCK_STATS = {"acquired": 0, "contended": 0, "wait_seconds": 0.0, "conflicts": 0}
+
+# Attempts update_character makes before giving up on a conflict
+UPDATE_ATTEMPTS = 100
+
+# Starting stats of each class (see create_character). Every new
+# character also starts at STARTING_LEVEL with STARTING_GOLD gold, no
+# experience and empty lists.
+CLASS_BASE_STATS = {
+    "Warrior": {"health": 120, "strength": 15, "magic": 5},
+    "Mage": {"health": 80, "strength": 8, "magic": 20},
+    "Rogue": {"health": 90, "strength": 12, "magic": 10},
+    "Cleric": {"health": 100, "strength": 10, "magic": 15},
+}
+STARTING_LEVEL = 1
+STARTING_GOLD = 100
+
+# Leveling from level n to n + 1 takes n * LEVEL_XP_STEP experience, so
+# reaching level n from level 1 takes LEVEL_XP_STEP * n * (n - 1) / 2 in
+# total. Each level gained adds LEVEL_UP_GAINS to the character's stats.
+LEVEL_XP_STEP = 100
+LEVEL_UP_GAINS = {"max_health": 10, "strength": 2, "magic": 2}
+
+# load_character keeps up to CHARACTER_CACHE_SIZE characters, least
+# recently used dropped first (see set_cache_size; 0 turns it off). An
+# entry is only used while every file the load read, or could have read,
+# still has the same mtime and size. CACHE_STATS counts hits, misses,
+# evictions and entries dropped by a save or delete (see get_cache_stats).
+CHARACTER_CACHE_SIZE = 256
+CACHE_STATS = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+_CHARACTER_CACHE = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+# Functions called after every save and delete (see add_save_listener)
+_SAVE_LISTENERS = []
+
+# Default thread count for load_characters / save_characters
+BULK_WORKERS = 16
+
+# journal path -> {"values": last persisted fields, "records": int}, for
+# characters saved or loaded with a journal in this process
+_JOURNAL_STATE = {}
+
 # ============================================================================
 # CHARACTER MANAGEMENT FUNCTIONS
 # ============================================================================
@@ -29,37 +144,29 @@ def create_character(name, character_class):
     
     Valid classes: Warrior, Mage, Rogue, Cleric
     
-    Returns: Dictionary with character data including:
+    Returns: Character record (used like a dictionary) including:
             - name, class, level, health, max_health, strength, magic
             - experience, gold, inventory, active_quests, completed_quests
     
     Raises: InvalidCharacterClassError if class is not valid
     """
     
-    if character_class not in ["Warrior","Mage","Rogue","Cleric"]:
+    base_stats = CLASS_BASE_STATS.get(character_class)
+    if base_stats is None:
         raise InvalidCharacterClassError(f"Class not in valid list: {character_class}")
-    
-    if character_class == "Warrior":
-        base_stats = {"health":120,"strength":15,"magic":5}
-    elif character_class =="Mage":
-        base_stats = {"health":80,"strength":8,"magic":20}
-    elif character_class =="Rogue":
-        base_stats = {"health":90,"strength":12,"magic":10}
-    elif character_class == "Cleric":
-        base_stats ={"health":100, "strength":10,"magic":15}
-
-    character = {"name":name,
-    "class":character_class,
-     "level":1,
-     "health":base_stats["health"],
-     "max_health":base_stats["health"],
-     "strength":base_stats["strength"],
-     "magic":base_stats["magic"],
-     "experience":0,
-     "gold":100,
-     "inventory":[],
-     "active_quests":[],
-     "completed_quests":[]}
+
+    character = Character(name,
+     character_class,
+     STARTING_LEVEL,
+     base_stats["health"],
+     base_stats["health"],
+     base_stats["strength"],
+     base_stats["magic"],
+     0,
+     STARTING_GOLD,
+     [],
+     [],
+     [])
     
     
     return character
@@ -83,13 +190,44 @@ def create_character(name, character_class):
     # Raise InvalidCharacterClassError if class not in valid list
     
 
-def save_character(character, save_directory="data/save_games"):
+def save_character(character, save_directory="data/save_games", compression=None,
+                   only_if_dirty=False, save_format="text", journal=False,
+                   expected_version=None):
     """
     Save character to file
     
     Filename format: {character_name}_save.txt
+    With compression="gz", "bz2" or "xz" the file gets that extension too
+    (e.g. Hero_save.txt.gz) and is compressed while it is written. Any
+    other saved copy of the character is removed.
+    
+    With only_if_dirty=True nothing is written if the character hasn't
+    changed since it was last saved or loaded (see mark_dirty).
+    
+    save_format="binary" writes the compact binary layout described in
+    _format_binary_save instead of the text below. The filename is the
+    same; load_character tells the two apart by the first bytes.
+    
+    With journal=True, once the character has a full save (written or
+    loaded in this process) later saves only append the fields that
+    changed to {character_name}_journal.log, e.g.
+        VERSION: 7
+        GOLD: 130
+        INVENTORY: health_potion,iron_sword
+        COMMIT
+    Every JOURNAL_COMPACT_RECORDS records a full save is written again
+    and the journal removed. load_character replays the journal.
+    
+    Every save carries a version stamp, one more than the save it
+    replaces, and character["_version"] is set to it. Pass
+    expected_version=character["_version"] to save only if nobody else
+    saved the character since it was loaded (compare-and-swap); 0 means
+    it must not have been saved yet. The whole save holds the
+    character's exclusive lock (see _lock_character), so saves from
+    several processes never interleave.
     
     File format:
+    VERSION: 1
     NAME: character_name
     CLASS: class_name
     LEVEL: 1
@@ -103,86 +241,175 @@ def save_character(character, save_directory="data/save_games"):
     ACTIVE_QUESTS: quest1,quest2
     COMPLETED_QUESTS: quest1,quest2
     
-    Returns: True if successful
+    The file is written under a temporary name and then renamed, so a
+    crash mid-save leaves the previous save intact. The directory's save
+    index (see save_index) gets the new name/class/level/gold.
+    
+    Returns: True if successful, False if the save was skipped
     Raises: PermissionError, IOError (let them propagate or handle)
+            SaveConflictError if expected_version doesn't match the save
     """
-    if not os.path.exists(save_directory):
-        os.makedirs(save_directory)
-
-    filename= os.path.join(save_directory,f"{character['name']}_save.txt")
-    with open (filename,"w") as file:
-        file.write(f"NAME: {character['name']}\n")
-        file.write(f"CLASS: {character['class']}\n")
-        file.write(f"LEVEL: {character['level']}\n")    
-        file.write(f"HEALTH: {character['health']}\n")
-        file.write(f"MAX_HEALTH: {character['max_health']}\n")
-        file.write(f"STRENGTH: {character['strength']}\n")
-        file.write(f"MAGIC: {character['magic']}\n")
-        file.write(f"EXPERIENCE: {character['experience']}\n")
-        file.write(f"GOLD: {character['gold']}\n")
-        file.write(f"INVENTORY: {','.join(character['inventory'])}\n")
-        file.write(f"ACTIVE_QUESTS: {','.join(character['active_quests'])}\n")
-        file.write(f"COMPLETED_QUESTS: {','.join(character['completed_quests'])}\n")
+    if only_if_dirty and not is_dirty(character):
+        _count(SAVE_STATS, "skipped")
+        return False
+    if compression is not None and compression not in file_utils.COMPRESSION_EXTENSIONS:
+        raise ValueError(f"Unknown compression: {compression}")
+    if save_format not in SAVE_FORMATS:
+        raise ValueError(f"Unknown save format: {save_format}")
+    character_directory = get_save_directory(character['name'], save_directory)
+    if not os.path.exists(character_directory):
+        os.makedirs(character_directory, exist_ok=True)
+
+    with _lock_character(character['name'], save_directory, exclusive=True):
+        save_files = _find_save_files(character['name'], save_directory)
+        journal_files = _find_journal_files(character['name'], save_directory)
+        version = _read_save_version(save_files, journal_files)
+        if expected_version is not None and version != expected_version:
+            _count(LOCK_STATS, "conflicts")
+            raise SaveConflictError(f"{character['name']} was saved elsewhere "
+                                    f"(version {version}, expected {expected_version})")
+        with _lock_directory(character_directory):
+            _save_locked(character, save_directory, character_directory, compression,
+                         save_format, journal, version, save_files, journal_files)
+    _notify_listeners("save", save_directory, character['name'], character)
     return True 
 
     # TODO: Implement save functionality
     # Create save_directory if it doesn't exist
     # Handle any file I/O errors appropriately
     # Lists should be saved as comma-separated values
+
+
+def _save_locked(character, save_directory, character_directory, compression,
+                 save_format, journal, version, save_files, journal_files):
+    """
+    Write a save for save_character, which holds the character's lock
+    and the lock on its directory's index
+    
+    Args:
+        version: Version stamp of the save being replaced
+        save_files, journal_files: The character's existing save files
+                                   and journals
+    """
+    # Checked before writing, since writing the save makes the directory
+    # newer than the index
+    index_fresh = save_index.is_fresh(character_directory)
+    _cache_invalidate(save_directory, character['name'])
+
+    # The journal state is only trusted if no other process has saved
+    # the character since this one last did
+    journal_path = get_journal_path(character['name'], save_directory)
+    journal_state = _JOURNAL_STATE.get(journal_path)
+    if (journal and journal_state is not None and journal_state["version"] == version
+            and journal_state["records"] < JOURNAL_COMPACT_RECORDS):
+        if _append_journal(journal_path, character, journal_state, version + 1):
+            version += 1
+            if index_fresh:
+                save_index.record_save(character_directory,
+                                       _index_entry(character, journal_path))
+        character["_version"] = version
+        character["_dirty"] = False
+        return
+
+    # Bring any journal up to exactly this state before the full save
+    # replaces it; if we crash before the journal is removed, replaying
+    # it over the new save then changes nothing
+    version += 1
+    for journal_file in journal_files:
+        _append_journal(journal_file, character, None, version)
+
+    filename = get_save_path(character['name'], save_directory)
+    if compression is not None:
+        filename += file_utils.COMPRESSION_EXTENSIONS[compression]
+    if save_format == "binary":
+        _write_atomic(filename, _format_binary_save(character, version))
+    else:
+        _write_atomic(filename, _format_save(character, version).encode("utf-8"))
+
+    for other_file in save_files:
+        if other_file != filename:
+            os.remove(other_file)
+    for journal_file in journal_files:
+        os.remove(journal_file)
+        _JOURNAL_STATE.pop(journal_file, None)
+    if journal_files:
+        _count(JOURNAL_STATS, "compacted")
+    if journal:
+        _JOURNAL_STATE[journal_path] = {"values": _journal_values(character), "records": 0,
+                                        "version": version}
+    if index_fresh:
+        save_index.record_save(character_directory, _index_entry(character, filename))
+    character["_version"] = version
+    character["_dirty"] = False
+    _count(SAVE_STATS, "written")
     
 
 def load_character(character_name, save_directory="data/save_games"):
     """
     Load character from save file
     
+    Text and binary saves are both accepted; binary ones start with
+    BINARY_SAVE_MAGIC. A journal (see save_character) is replayed on top.
+    Reading holds the character's shared lock, so it never sees a save
+    from another process half done. character["_version"] is the version
+    stamp of the save (0 for saves written before stamps existed).
+    
+    Characters are cached (see CHARACTER_CACHE_SIZE). Every call returns
+    a fresh copy, so changing it never affects the cache or other copies.
+    
     Args:
         character_name: Name of character to load
         save_directory: Directory containing save files
     
-    Returns: Character dictionary
+    Returns: Character record (see records.Character)
     Raises: 
         CharacterNotFoundError if save file doesn't exist
         SaveFileCorruptedError if file exists but can't be read
         InvalidSaveDataError if data format is wrong
     """
-    filename = os.path.join(save_directory,f"{character_name}_save.txt")
-
-    if not os.path.exists(filename):
-        raise CharacterNotFoundError(f"Save directory does not exist")
+    # A cache hit needs no lock: a save in progress has already changed
+    # at least one file of the stamp, or else hasn't changed anything yet
+    cache_key = (os.path.abspath(save_directory), character_name)
+    if CHARACTER_CACHE_SIZE:
+        cached = _cache_get(cache_key, _cache_stamp(character_name, save_directory))
+        if cached is not None:
+            return cached
     
-    try:
-        with open (filename,"r") as file:
-            lines = file.readlines()
-    except:
-        raise SaveFileCorruptedError(f"Could not read save file")
-    
-    character={}
+    with _lock_character(character_name, save_directory, exclusive=False):
+        if CHARACTER_CACHE_SIZE:
+            stamp = _cache_stamp(character_name, save_directory)
+        save_files = _find_save_files(character_name, save_directory)
 
-    for line in lines:
-        if ":" not in line:
-            raise InvalidSaveDataError(f"Format not valid")
+        if not save_files:
+            raise CharacterNotFoundError(f"Save directory does not exist")
         
-        key,value = line.strip().split(":",1)
-        key = key.strip()
-        value = value.strip()
-
-        if key in ["NAME", "CLASS"]:
-            character[key.lower()] = value 
-    
-        elif key in ["LEVEL","HEALTH","MAX_HEALTH","STRENGTH","MAGIC","EXPERIENCE","GOLD"]:
-            if not value.isdigit():
-                raise InvalidSaveDataError(f"Expected Integer value for {key}")
-            character[key.lower()] = int(value)
-
-        elif key in ["INVENTORY","ACTIVE_QUESTS","COMPLETED_QUESTS"]:
-            if value == "":
-                character[key.lower()] = []
-            else:
-                character[key.lower()] = value.split(",")
-    
+        try:
+            with file_utils.open_binary(save_files[0]) as file:
+                data = file.read()
+        except:
+            raise SaveFileCorruptedError(f"Could not read save file")
+        
+        if data.startswith(BINARY_SAVE_MAGIC):
+            character = _parse_binary_save(data)
         else:
-            raise InvalidSaveDataError(f"Unexpected key: {key}")
-    
+            character = _parse_text_save(data)
+        # Last, after the saved fields, like in create_character
+        character["_version"] = character.pop("_version", 0)
+        
+        journal_files = _find_journal_files(character_name, save_directory)
+        journal_path = get_journal_path(character_name, save_directory)
+        if journal_files:
+            records = _replay_journal(character, journal_files[0])
+            _JOURNAL_STATE[journal_files[0]] = {"values": _journal_values(character),
+                                                "records": records,
+                                                "version": character["_version"]}
+        else:
+            _JOURNAL_STATE.pop(journal_path, None)
+        
+        character = Character.from_mapping(character)
+        character.dirty = False
+        if CHARACTER_CACHE_SIZE:
+            _cache_put(cache_key, stamp, character)
     return character
     
 
@@ -194,24 +421,53 @@ def load_character(character_name, save_directory="data/save_games"):
     # Validate data format → InvalidSaveDataError
     # Parse comma-separated lists back into Python lists
 
-def list_saved_characters(save_directory="data/save_games"):
+def load_character_summary(character_name, save_directory="data/save_games",
+                           fields=SUMMARY_FIELDS):
     """
-    Get list of all saved character names
+    Load only some fields of a saved character
+    
+    Reads no more of the file than it has to: a text save is read line
+    by line until every requested field has been seen (the lists come
+    last), and a binary save is read from its fixed header, seeking to a
+    list only if one is requested. A journal is still applied on top.
     
-    Returns: List of character names (without _save.txt extension)
+    Args:
+        character_name: Name of character to load
+        save_directory: Directory containing save files
+        fields: Field names to return (see SAVE_FIELDS)
+    
+    Returns: Dictionary with just the requested fields, in that order
+    Raises:
+        ValueError if a field isn't a save field
+        CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError
+        like load_character
     """
-    if not os.path.exists(save_directory):
-        return []
+    for field in fields:
+        if field not in SAVE_FIELDS:
+            raise ValueError(f"Not a save field: {field}")
+    with _lock_character(character_name, save_directory, exclusive=False):
+        character = _read_summary(_find_save_files(character_name, save_directory),
+                                  _find_journal_files(character_name, save_directory), fields)
+    if character is None:
+        raise CharacterNotFoundError(f"Character does not exist")
     
-    files = os.listdir(save_directory)
+    missing = [field for field in fields if field not in character]
+    if missing:
+        raise InvalidSaveDataError(f"Save file is missing: {', '.join(missing)}")
+    return {field: character[field] for field in fields}
 
-    saved_characters = []
 
-    for filename in files:
-        if filename.endswith("_save.txt"):
-            name = filename.replace("_save.txt","")
-            saved_characters.append(name)
-    return saved_characters
+def list_saved_characters(save_directory="data/save_games"):
+    """
+    Get list of all saved character names
+    
+    Read from the save index, so the directory isn't scanned (see
+    get_roster).
+    
+    Returns: List of character names (without _save.txt extension),
+             sorted by name
+    """
+    return [entry["name"] for entry in get_roster(save_directory)]
     # TODO: Implement this function
     # Return empty list if directory doesn't exist
     # Extract character names from filenames
@@ -227,18 +483,229 @@ def delete_character(character_name, save_directory="data/save_games"):
     if not os.path.exists(save_directory):
         raise CharacterNotFoundError(f"Character does not exist")
     
-    filepath = os.path.join(save_directory,f"{character_name}_save.txt")
+    save_files = _find_save_files(character_name, save_directory)
 
-    if not os.path.exists(filepath):
+    if not save_files:
         raise CharacterNotFoundError(f"Character does not exist")
     
-    os.remove(filepath)
+    character_directory = get_save_directory(character_name, save_directory)
+    with _lock_character(character_name, save_directory, exclusive=True), \
+            _lock_directory(character_directory):
+        index_fresh = save_index.is_fresh(character_directory)
+        _cache_invalidate(save_directory, character_name)
+        for filepath in (_find_save_files(character_name, save_directory)
+                         + _find_journal_files(character_name, save_directory)):
+            os.remove(filepath)
+            _JOURNAL_STATE.pop(filepath, None)
+        if index_fresh:
+            save_index.record_delete(character_directory, character_name)
+    _notify_listeners("delete", save_directory, character_name, None)
     return True
    
     # TODO: Implement character deletion
     # Verify file exists before attempting deletion
     
 
+def update_character(character_name, change, save_directory="data/save_games",
+                     attempts=UPDATE_ATTEMPTS, **save_options):
+    """
+    Load a character, apply change to it and save it, without losing a
+    save made by another process in between
+    
+    The save is a compare-and-swap on the version that was loaded; on a
+    SaveConflictError the character is loaded again and change applied
+    to the fresh copy. change must therefore be safe to run more than
+    once (e.g. "add 10 gold", not "set gold to what I saw plus 10").
+    
+    Args:
+        character_name: Character to update
+        change: Function taking the character dictionary and changing it
+        save_directory: Directory containing save files
+        attempts: Most loads/saves tried before giving up
+        save_options: Passed on to save_character (compression,
+                      save_format, journal)
+    
+    Returns: The updated character as saved
+    Raises: SaveConflictError if every attempt lost the race,
+            plus the errors of load_character and save_character
+    """
+    for attempt in range(attempts):
+        character = load_character(character_name, save_directory)
+        change(character)
+        try:
+            save_character(character, save_directory,
+                           expected_version=character["_version"], **save_options)
+            return character
+        except SaveConflictError:
+            if attempt == attempts - 1:
+                raise
+
+
+def load_characters(character_names, save_directory="data/save_games",
+                    max_workers=BULK_WORKERS):
+    """
+    Load many characters at once, reading the files on a thread pool
+    
+    A save that is missing or broken doesn't stop the others; its error
+    is returned instead.
+    
+    Args:
+        character_names: Names to load
+        save_directory: Directory containing save files
+        max_workers: Most files read at the same time
+    
+    Returns: Tuple of ({name: character}, {name: exception}); the
+             exceptions are CharacterNotFoundError, SaveFileCorruptedError
+             or InvalidSaveDataError
+    """
+    def load(name):
+        try:
+            return name, load_character(name, save_directory), None
+        except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError) as error:
+            return name, None, error
+    
+    characters = {}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for name, character, error in executor.map(load, character_names):
+            if error is None:
+                characters[name] = character
+            else:
+                errors[name] = error
+    return characters, errors
+
+
+def save_characters(characters, save_directory="data/save_games", max_workers=BULK_WORKERS,
+                    **save_options):
+    """
+    Save many characters at once, writing the files on a thread pool
+    
+    Args:
+        characters: Character dictionaries to save (one per name)
+        save_directory: Directory to save into
+        max_workers: Most files written at the same time
+        save_options: Passed on to save_character (compression,
+                      save_format, only_if_dirty, journal)
+    
+    Returns: Tuple of ([names written], {name: exception}); unchanged
+             characters skipped by only_if_dirty are in neither. The
+             exceptions are OSError (e.g. PermissionError),
+             InvalidSaveDataError, SaveConflictError or ValueError
+    """
+    def save(character):
+        try:
+            return character["name"], save_character(character, save_directory,
+                                                     **save_options), None
+        except (OSError, InvalidSaveDataError, SaveConflictError, ValueError) as error:
+            return character["name"], False, error
+    
+    saved = []
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for name, written, error in executor.map(save, characters):
+            if error is not None:
+                errors[name] = error
+            elif written:
+                saved.append(name)
+    return saved, errors
+
+
+def get_roster(save_directory="data/save_games", sort_by="name", reverse=False,
+               offset=0, limit=None):
+    """
+    List saved characters with their class, level and gold, without
+    loading the saves
+    
+    Comes from the save indexes (one per directory, so one per shard in
+    the sharded layout). Any that are missing or out of date are rebuilt
+    first (see rebuild_save_index).
+    
+    Args:
+        save_directory: Directory containing save files
+        sort_by: "name", "class", "level", "gold" or "mtime"
+        reverse: Sort descending
+        offset: Number of entries to skip (for paging)
+        limit: Maximum number of entries to return (None = all)
+    
+    Returns: List of dictionaries with name, class, level, gold and mtime
+             (class/level/gold are None for saves that couldn't be read)
+    Raises: ValueError if sort_by isn't an index field
+    """
+    if sort_by not in save_index.SORT_FIELDS:
+        raise ValueError(f"Cannot sort saves by: {sort_by}")
+    if not os.path.isdir(save_directory):
+        return []
+    
+    entries = {}
+    for directory in _index_directories(save_directory):
+        log = save_index.read_index_log(directory)
+        if log is None:
+            directory_entries = _rebuild_directory_index(directory)
+        else:
+            directory_entries = log[0]
+            if save_index.needs_compaction(*log):
+                with _lock_directory(directory):
+                    save_index.compact_index(directory)
+        entries.update(directory_entries)
+    
+    # Saves that couldn't be read have None fields; they go last
+    known = [entry for entry in entries.values() if entry[sort_by] is not None]
+    unknown = [entry for entry in entries.values() if entry[sort_by] is None]
+    roster = sorted(known, key=lambda entry: (entry[sort_by], entry["name"]), reverse=reverse)
+    roster += sorted(unknown, key=lambda entry: entry["name"])
+    end = None if limit is None else offset + limit
+    return roster[offset:end]
+
+
+def rebuild_save_index(save_directory="data/save_games"):
+    """
+    Recreate the save indexes of a save directory (and its shards) from
+    the save files themselves
+    
+    One os.scandir pass per directory finds the saves; the class, level
+    and gold of each come from load_character_summary. A save that can't be loaded is
+    still listed, with those fields set to None.
+    
+    Returns: Dictionary {name: index entry}
+    """
+    entries = {}
+    for directory in _index_directories(save_directory):
+        entries.update(_rebuild_directory_index(directory))
+    return entries
+
+
+def _rebuild_directory_index(save_directory):
+    """
+    Rebuild the save index of one directory (see rebuild_save_index)
+    
+    Holds the directory's index lock throughout, so no save in it can
+    happen between the scan and writing the index. The saves are read
+    without their character locks: taking those after the directory's
+    would deadlock with save_character, and nothing can write them here.
+    """
+    with _lock_directory(save_directory):
+        names = {}
+        with os.scandir(save_directory) as scan:
+            for entry in scan:
+                filename = file_utils.strip_compression(entry.name)
+                if filename.endswith(SAVE_SUFFIX) and entry.is_file():
+                    names[filename[:-len(SAVE_SUFFIX)]] = True
+        
+        entries = {}
+        for name in names:
+            save_files = _find_save_files(name, save_directory)
+            try:
+                character = _read_summary(save_files,
+                                          _find_journal_files(name, save_directory),
+                                          SUMMARY_FIELDS)
+            except (SaveFileCorruptedError, InvalidSaveDataError):
+                character = None
+            if character is None or any(field not in character for field in SUMMARY_FIELDS):
+                character = {"name": name, "class": None, "level": None, "gold": None}
+            entries[name] = _index_entry(character, save_files[0])
+        save_index.write_index(save_directory, entries)
+    return entries
+
 # ============================================================================
 # CHARACTER OPERATIONS
 # ============================================================================
@@ -255,24 +722,30 @@ def gain_experience(character, xp_amount):
     - Increase magic by 2
     - Restore health to max_health
     
+    The new level is worked out directly from the total experience (see
+    level_for_total_xp), so a huge grant costs the same as a small one.
+    experience keeps counting from the start of the current level.
+    
     Raises: CharacterDeadError if character health is 0
     """
 
     if character["health"] ==0:
         raise CharacterDeadError("Character is dead and cannot gain experience")
     
-    character["experience"] += xp_amount
-    level_up_xp = character["level"] * 100
+    level = character["level"]
+    total_xp = total_xp_for_level(level) + character["experience"] + xp_amount
+    new_level = max(level, level_for_total_xp(total_xp))
+    character["experience"] = total_xp - total_xp_for_level(new_level)
     
-    while character["experience"] >= level_up_xp:
-        character["experience"] -= level_up_xp
-        character["level"] += 1
-        character["max_health"] += 10
-        character["strength"] += 2
-        character["magic"] += 2
+    if new_level > level:
+        levels_gained = new_level - level
+        character["level"] = new_level
+        character["max_health"] += LEVEL_UP_GAINS["max_health"] * levels_gained
+        character["strength"] += LEVEL_UP_GAINS["strength"] * levels_gained
+        character["magic"] += LEVEL_UP_GAINS["magic"] * levels_gained
         character["health"] = character["max_health"]
-        level_up_xp = character["level"] * 100
 
+    mark_dirty(character)
     return character
     # TODO: Implement experience gain and leveling
     # Check if character is dead first
@@ -281,6 +754,30 @@ def gain_experience(character, xp_amount):
     # Update stats on level up
     
 
+def total_xp_for_level(level):
+    """Return the total experience needed to reach level from level 1"""
+    return LEVEL_XP_STEP * level * (level - 1) // 2
+
+
+def level_for_total_xp(total_xp):
+    """
+    Return the level reached with total_xp experience since level 1
+    
+    Solves total_xp_for_level(n) <= total_xp for the largest n in
+    integers, so it's exact for any amount.
+    """
+    if total_xp < 0:
+        return 1
+    # n * (n - 1) <= q  <=>  (2n - 1)^2 <= 4q + 1
+    q = total_xp * 2 // LEVEL_XP_STEP
+    return (math.isqrt(4 * q + 1) + 1) // 2
+
+
+def xp_to_next_level(character):
+    """Return how much more experience the character needs to level up"""
+    return max(character["level"] * LEVEL_XP_STEP - character["experience"], 0)
+
+
 def add_gold(character, amount):
     """
     Add gold to character's inventory
@@ -296,6 +793,7 @@ def add_gold(character, amount):
     if new_gold < 0:
         raise ValueError("Gold cannot be negative")
     character["gold"] = new_gold
+    mark_dirty(character)
     return character["gold"]
     # TODO: Implement gold management
     # Check that result won't be negative
@@ -313,6 +811,8 @@ def heal_character(character, amount):
     missing_health = character["max_health"] - character["health"]
     actual_heal = min(amount, missing_health)
     character["health"] += actual_heal
+    if actual_heal:
+        mark_dirty(character)
     return actual_heal
     
     # TODO: Implement healing
@@ -344,11 +844,782 @@ def revive_character(character):
         return False 
     
     character["health"] = character["max_health"]//2
+    mark_dirty(character)
     return True 
     # TODO: Implement revival
     # Restore health to half of max_health
 
 
+# ============================================================================
+# CHANGE TRACKING
+# ============================================================================
+
+def mark_dirty(character):
+    """
+    Flag a character as changed since its last save
+    
+    Every function that modifies a character calls this, so
+    save_character(..., only_if_dirty=True) knows when it can skip
+    rewriting the file.
+    """
+    character["_dirty"] = True
+
+
+def is_dirty(character):
+    """
+    Check if a character has unsaved changes
+    
+    Characters that were never created, saved or loaded by this module
+    have no flag and always count as dirty.
+    """
+    return character.get("_dirty", True)
+
+
+def get_save_stats():
+    """Return a copy of SAVE_STATS: {"written": int, "skipped": int}"""
+    return dict(SAVE_STATS)
+
+
+def reset_save_stats():
+    """Set the save, journal, lock and cache counters back to 0"""
+    for stats in (SAVE_STATS, JOURNAL_STATS, LOCK_STATS, CACHE_STATS):
+        for key in stats:
+            stats[key] = 0
+
+
+def _count(stats, key, amount=1):
+    """Add to one of the stats counters, safely across threads"""
+    with _STATS_LOCK:
+        stats[key] += amount
+
+
+def get_journal_stats():
+    """Return a copy of JOURNAL_STATS: {"appended", "compacted", "bytes"}"""
+    return dict(JOURNAL_STATS)
+
+
+def get_lock_stats():
+    """
+    Return a copy of LOCK_STATS:
+    {"acquired", "contended", "wait_seconds", "conflicts"}
+    """
+    return dict(LOCK_STATS)
+
+# ============================================================================
+# SAVE LISTENERS
+# ============================================================================
+
+def add_save_listener(listener):
+    """
+    Call listener after every successful save_character and
+    delete_character in this process
+    
+    It's called as listener(event, save_directory, character_name,
+    character), with event "save" (character is what was saved) or
+    "delete" (character is None). Calls happen after the save's lock is
+    released, on whichever thread saved (the save writer's, for queued
+    saves). A listener shouldn't raise: the save has already happened,
+    but the error would reach the caller of save_character.
+    """
+    _SAVE_LISTENERS.append(listener)
+
+
+def remove_save_listener(listener):
+    """Stop calling a listener added with add_save_listener"""
+    _SAVE_LISTENERS.remove(listener)
+
+
+def _notify_listeners(event, save_directory, character_name, character):
+    """Call every save listener (see add_save_listener)"""
+    for listener in list(_SAVE_LISTENERS):
+        listener(event, save_directory, character_name, character)
+
+# ============================================================================
+# CHARACTER CACHE
+# ============================================================================
+
+def get_cache_stats():
+    """
+    Return a copy of CACHE_STATS plus the current number of entries:
+    {"hits", "misses", "evictions", "invalidations", "size"}
+    """
+    with _CACHE_LOCK:
+        return dict(CACHE_STATS, size=len(_CHARACTER_CACHE))
+
+
+def set_cache_size(size):
+    """
+    Set how many characters load_character keeps cached
+    
+    Shrinking evicts the least recently used entries; 0 turns the cache
+    off and empties it.
+    """
+    global CHARACTER_CACHE_SIZE
+    if size < 0:
+        raise ValueError(f"Cache size can't be negative: {size}")
+    with _CACHE_LOCK:
+        CHARACTER_CACHE_SIZE = size
+        _evict()
+
+
+def clear_character_cache():
+    """Drop every cached character"""
+    with _CACHE_LOCK:
+        _CHARACTER_CACHE.clear()
+
+
+def _cache_stamp(character_name, save_directory):
+    """
+    Return the (mtime, size) of every file a load of the character could
+    read, None for the ones that don't exist
+    
+    Any save or journal being written, replaced, removed or appearing
+    behind the game's back changes the stamp.
+    """
+    # Spelled out instead of get_save_path / get_journal_path, which
+    # would each check for the shard marker again
+    sharded = is_sharded(save_directory)
+    directory = (os.path.join(save_directory, get_shard_name(character_name)) if sharded
+                 else save_directory)
+    bases = [os.path.join(directory, f"{character_name}{SAVE_SUFFIX}")]
+    journals = [os.path.join(directory, f"{character_name}{JOURNAL_SUFFIX}")]
+    if sharded:
+        bases.append(os.path.join(save_directory, f"{character_name}{SAVE_SUFFIX}"))
+        journals.append(os.path.join(save_directory, f"{character_name}{JOURNAL_SUFFIX}"))
+    stamp = []
+    for base in bases:
+        for path in [base] + [base + extension for extension in file_utils.COMPRESSION_MODULES]:
+            stamp.append(_file_stamp(path))
+    for path in journals:
+        stamp.append(_file_stamp(path))
+    return tuple(stamp)
+
+
+def _file_stamp(path):
+    """Return (mtime in ns, size) of a file, or None if it doesn't exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _cache_get(key, stamp):
+    """
+    Return a copy of the cached character for key if its stamp still
+    matches, else None (a stale entry is dropped)
+    """
+    with _CACHE_LOCK:
+        entry = _CHARACTER_CACHE.get(key)
+        if entry is not None and entry[0] == stamp:
+            _CHARACTER_CACHE.move_to_end(key)
+            CACHE_STATS["hits"] += 1
+            return _copy_character(entry[1])
+        if entry is not None:
+            del _CHARACTER_CACHE[key]
+        CACHE_STATS["misses"] += 1
+    return None
+
+
+def _cache_put(key, stamp, character):
+    """Cache a copy of a freshly loaded character"""
+    with _CACHE_LOCK:
+        _CHARACTER_CACHE[key] = (stamp, _copy_character(character))
+        _CHARACTER_CACHE.move_to_end(key)
+        _evict()
+
+
+def _cache_invalidate(save_directory, character_name):
+    """Drop a character's cache entry (before it is saved or deleted)"""
+    with _CACHE_LOCK:
+        if _CHARACTER_CACHE.pop((os.path.abspath(save_directory), character_name),
+                                None) is not None:
+            CACHE_STATS["invalidations"] += 1
+
+
+def _evict():
+    """Drop least recently used entries over the size limit; hold _CACHE_LOCK"""
+    while len(_CHARACTER_CACHE) > CHARACTER_CACHE_SIZE:
+        _CHARACTER_CACHE.popitem(last=False)
+        CACHE_STATS["evictions"] += 1
+
+
+def _copy_character(character):
+    """Copy a loaded character, lists included, so the copies share nothing mutable"""
+    return Character(character.name, character.character_class, character.level,
+                     character.health, character.max_health, character.strength,
+                     character.magic, character.experience, character.gold,
+                     list(character.inventory), list(character.active_quests),
+                     list(character.completed_quests), character.version, character.dirty)
+
+# ============================================================================
+# SAVE FILE HELPERS
+# ============================================================================
+
+def get_save_path(character_name, save_directory="data/save_games"):
+    """Return the path of a character's uncompressed save file"""
+    return os.path.join(get_save_directory(character_name, save_directory),
+                        f"{character_name}{SAVE_SUFFIX}")
+
+
+def get_save_directory(character_name, save_directory="data/save_games"):
+    """
+    Return the directory a character's save goes in
+    
+    That's save_directory itself, or its shard subdirectory if the
+    directory uses the sharded layout (see is_sharded).
+    """
+    if is_sharded(save_directory):
+        return os.path.join(save_directory, get_shard_name(character_name))
+    return save_directory
+
+
+def get_shard_name(character_name):
+    """Return the shard subdirectory name for a character (e.g. 3f)"""
+    digest = hashlib.sha1(character_name.encode("utf-8")).hexdigest()
+    return digest[:SHARD_PREFIX_LENGTH]
+
+
+def is_sharded(save_directory):
+    """Check if a save directory uses the sharded layout"""
+    return os.path.exists(os.path.join(save_directory, SHARD_MARKER))
+
+
+def _index_directories(save_directory):
+    """
+    Return every directory that can hold saves (and so has a save index)
+    
+    In the sharded layout that's each shard plus the top directory, which
+    may still have flat saves during a migration.
+    """
+    directories = [save_directory]
+    if is_sharded(save_directory):
+        with os.scandir(save_directory) as scan:
+            for entry in scan:
+                if len(entry.name) == SHARD_PREFIX_LENGTH and entry.is_dir():
+                    directories.append(entry.path)
+    return directories
+
+
+def _index_entry(character, filename):
+    """Return the save index entry for a character saved in filename"""
+    return {"name": character["name"], "class": character.get("class"),
+            "level": character.get("level"), "gold": character.get("gold"),
+            "mtime": os.stat(filename).st_mtime_ns}
+
+
+def _format_save(character, version=None):
+    """
+    Return the text of a save file for character
+    
+    version is the stamp to write; by default character["_version"]
+    """
+    if version is None:
+        version = character.get("_version", 0)
+    return (f"VERSION: {version}\n"
+            f"NAME: {character['name']}\n"
+            f"CLASS: {character['class']}\n"
+            f"LEVEL: {character['level']}\n"
+            f"HEALTH: {character['health']}\n"
+            f"MAX_HEALTH: {character['max_health']}\n"
+            f"STRENGTH: {character['strength']}\n"
+            f"MAGIC: {character['magic']}\n"
+            f"EXPERIENCE: {character['experience']}\n"
+            f"GOLD: {character['gold']}\n"
+            f"INVENTORY: {','.join(character['inventory'])}\n"
+            f"ACTIVE_QUESTS: {','.join(character['active_quests'])}\n"
+            f"COMPLETED_QUESTS: {','.join(character['completed_quests'])}\n")
+
+
+def _parse_text_save(data):
+    """
+    Turn the bytes of a text save back into a character dictionary
+    
+    Raises: SaveFileCorruptedError if the bytes aren't UTF-8,
+            InvalidSaveDataError if a line is malformed
+    """
+    try:
+        lines = data.decode("utf-8").splitlines()
+    except UnicodeDecodeError:
+        raise SaveFileCorruptedError(f"Could not read save file")
+    
+    character={}
+
+    for line in lines:
+        _apply_save_line(character, line)
+    
+    return character
+
+
+def _apply_save_line(character, line):
+    """
+    Set the field named by one "KEY: value" save line on character
+    
+    Raises: InvalidSaveDataError if the line is malformed
+    """
+    if ":" not in line:
+        raise InvalidSaveDataError(f"Format not valid")
+    
+    key,value = line.strip().split(":",1)
+    key = key.strip()
+    value = value.strip()
+
+    if key in ["NAME", "CLASS"]:
+        character[key.lower()] = value 
+
+    elif key in ["LEVEL","HEALTH","MAX_HEALTH","STRENGTH","MAGIC","EXPERIENCE","GOLD"]:
+        if not value.isdigit():
+            raise InvalidSaveDataError(f"Expected Integer value for {key}")
+        character[key.lower()] = int(value)
+
+    elif key in ["INVENTORY","ACTIVE_QUESTS","COMPLETED_QUESTS"]:
+        if value == "":
+            character[key.lower()] = []
+        else:
+            character[key.lower()] = value.split(",")
+
+    elif key == "VERSION":
+        if not value.isdigit():
+            raise InvalidSaveDataError(f"Expected Integer value for {key}")
+        character["_version"] = int(value)
+
+    else:
+        raise InvalidSaveDataError(f"Unexpected key: {key}")
+
+
+def _format_binary_save(character, version=None):
+    """
+    Return the bytes of a binary save file for character
+    
+    Layout (little-endian, see _BINARY_HEADER):
+        4s magic, B format version, 7 x uint32 stats,
+        2 x uint16 name/class byte lengths,
+        3 x uint16 list entry counts, 3 x uint32 list byte lengths,
+        uint32 save version stamp (by default character["_version"]),
+        then name, class and each list's UTF-8 entries joined by NUL
+    
+    Raises: InvalidSaveDataError if a value doesn't fit its field
+    """
+    if version is None:
+        version = character.get("_version", 0)
+    # Spelled out field by field: this runs once per character in bulk
+    # exports, and comprehensions over the field lists cost 2-3x more
+    name = character["name"].encode("utf-8")
+    character_class = character["class"].encode("utf-8")
+    inventory = character["inventory"]
+    active_quests = character["active_quests"]
+    completed_quests = character["completed_quests"]
+    inventory_table = "\0".join(inventory).encode("utf-8")
+    active_table = "\0".join(active_quests).encode("utf-8")
+    completed_table = "\0".join(completed_quests).encode("utf-8")
+    try:
+        header = _BINARY_HEADER.pack(
+            BINARY_SAVE_MAGIC, BINARY_SAVE_VERSION,
+            character["level"], character["health"], character["max_health"],
+            character["strength"], character["magic"], character["experience"],
+            character["gold"],
+            len(name), len(character_class),
+            len(inventory), len(active_quests), len(completed_quests),
+            len(inventory_table), len(active_table), len(completed_table),
+            version)
+    except struct.error as error:
+        raise InvalidSaveDataError(f"Character doesn't fit the binary save format: {error}")
+    return b"".join((header, name, character_class,
+                     inventory_table, active_table, completed_table))
+
+
+def _parse_binary_save(data):
+    """
+    Turn the bytes of a binary save back into a character dictionary
+    
+    Version 1 saves (no version stamp) load with "_version" 0.
+    
+    Raises: InvalidSaveDataError for an unknown format version,
+            SaveFileCorruptedError if the data is truncated or garbled
+    """
+    header = _BINARY_HEADERS.get(data[4] if len(data) > 4 else None)
+    if header is None and len(data) > 4:
+        raise InvalidSaveDataError(f"Unsupported save version: {data[4]}")
+    try:
+        fields = header.unpack_from(data)
+    except (AttributeError, struct.error):
+        raise SaveFileCorruptedError("Could not read save file")
+    stats = fields[2:9]
+    string_lengths = fields[9:11]
+    counts = fields[11:14]
+    table_lengths = fields[14:17]
+    if header.size + sum(string_lengths) + sum(table_lengths) != len(data):
+        raise SaveFileCorruptedError("Save file is the wrong length")
+    
+    # Same key order as a loaded text save
+    character = {}
+    offset = header.size
+    try:
+        for field, length in zip(STRING_SAVE_FIELDS, string_lengths):
+            character[field] = data[offset:offset + length].decode("utf-8")
+            offset += length
+        character.update(zip(NUMERIC_SAVE_FIELDS, stats))
+        for field, count, length in zip(LIST_SAVE_FIELDS, counts, table_lengths):
+            entries = data[offset:offset + length].decode("utf-8").split("\0") if count else []
+            if len(entries) != count:
+                raise SaveFileCorruptedError("Save file list doesn't match its count")
+            character[field] = entries
+            offset += length
+    except UnicodeDecodeError:
+        raise SaveFileCorruptedError("Could not read save file")
+    character["_version"] = fields[17] if len(fields) > 17 else 0
+    return character
+
+
+def _format_save_line(field, value):
+    """Return the "KEY: value" save line for one field"""
+    if isinstance(value, list):
+        value = ",".join(value)
+    return f"{field.upper()}: {value}\n"
+
+
+def _write_atomic(filename, data):
+    """
+    Replace filename with data (bytes) in one step
+    
+    The data goes to a temporary file next to filename (keeping its
+    compression extension) which is then renamed over it with os.replace.
+    The temporary name doesn't end in _save.txt, so it's never listed.
+    """
+    plain = file_utils.strip_compression(filename)
+    temp_filename = plain + ".tmp" + filename[len(plain):]
+    try:
+        with file_utils.open_binary(temp_filename, "wb") as file:
+            file.write(data)
+        os.replace(temp_filename, filename)
+    except BaseException:
+        if os.path.exists(temp_filename):
+            os.remove(temp_filename)
+        raise
+
+
+def get_journal_path(character_name, save_directory="data/save_games"):
+    """Return the path of a character's journal (see save_character)"""
+    return os.path.join(get_save_directory(character_name, save_directory),
+                        f"{character_name}{JOURNAL_SUFFIX}")
+
+
+def _find_journal_files(character_name, save_directory):
+    """
+    Find a character's journal, plus a flat one left over from before a
+    migration to the sharded layout
+    
+    Returns: List of existing journal paths, current location first
+    """
+    paths = [get_journal_path(character_name, save_directory)]
+    if is_sharded(save_directory):
+        paths.append(os.path.join(save_directory, f"{character_name}{JOURNAL_SUFFIX}"))
+    return [path for path in paths if os.path.exists(path)]
+
+
+def _journal_values(character):
+    """Copy the saved fields of a character, for diffing against later"""
+    return {field: list(character[field]) if field in LIST_SAVE_FIELDS else character[field]
+            for field in SAVE_FIELDS}
+
+
+def _append_journal(journal_path, character, state, version):
+    """
+    Append one record with the fields that changed since state
+    
+    Args:
+        journal_path: Journal to append to
+        character: Character being saved
+        state: Entry of _JOURNAL_STATE (updated here), or None to write
+               every field
+        version: Version stamp the record brings the save to
+    
+    Returns: True if a record was written, False if nothing changed
+    """
+    values = _journal_values(character)
+    previous = state["values"] if state is not None else {}
+    lines = [_format_save_line(field, value) for field, value in values.items()
+             if previous.get(field) != value]
+    if lines:
+        record = f"VERSION: {version}\n" + "".join(lines) + JOURNAL_COMMIT + "\n"
+        # One write call, so a crash leaves at most one torn record
+        with open(journal_path, "a", encoding="utf-8") as file:
+            file.write(record)
+        _count(JOURNAL_STATS, "appended")
+        _count(JOURNAL_STATS, "bytes", len(record))
+    if state is not None and lines:
+        state["values"] = values
+        state["records"] += 1
+        state["version"] = version
+    return bool(lines)
+
+
+def _replay_journal(character, journal_path, fields=None):
+    """
+    Apply every complete record of a journal to character
+    
+    A record cut short by a crash (no COMMIT line yet) is ignored and
+    trimmed off the file, so the next append starts on a clean line.
+    With fields, lines for other fields are skipped unparsed.
+    
+    Returns: Number of records applied
+    Raises: SaveFileCorruptedError, InvalidSaveDataError
+    """
+    try:
+        with open(journal_path, "rb") as file:
+            data = file.read()
+    except OSError:
+        raise SaveFileCorruptedError(f"Could not read save journal")
+    
+    marker = f"\n{JOURNAL_COMMIT}\n".encode("utf-8")
+    end = data.rfind(marker)
+    committed = data[:end + len(marker)] if end >= 0 else b""
+    if len(committed) < len(data):
+        with open(journal_path, "r+b") as file:
+            file.truncate(len(committed))
+    try:
+        lines = committed.decode("utf-8").splitlines()
+    except UnicodeDecodeError:
+        raise SaveFileCorruptedError(f"Could not read save journal")
+    
+    records = 0
+    for line in lines:
+        if line == JOURNAL_COMMIT:
+            records += 1
+        elif fields is None or _line_field(line) in fields:
+            _apply_save_line(character, line)
+    return records
+
+
+def _line_field(line):
+    """
+    Return the character key a "KEY: value" save line sets (e.g. "gold",
+    or "_version" for the VERSION line)
+    """
+    field = line.split(":", 1)[0].strip().lower()
+    return "_version" if field == "version" else field
+
+
+def _read_text_summary(file, head, fields):
+    """
+    Read text save lines until every field in fields has been found
+    
+    Args:
+        file: Binary file object positioned just after head
+        head: Bytes already read from the start of the file
+        fields: Field names wanted
+    
+    Returns: Dictionary with the fields found
+    """
+    character = {}
+    wanted = set(fields)
+    pending = head
+    while wanted:
+        newline = pending.find(b"\n")
+        if newline < 0:
+            more = file.readline()
+            if more:
+                pending += more
+                continue
+            if not pending:
+                break
+            newline = len(pending)
+        line = pending[:newline].decode("utf-8")
+        pending = pending[newline + 1:]
+        field = _line_field(line)
+        if field in wanted:
+            _apply_save_line(character, line)
+            wanted.discard(field)
+    return character
+
+
+def _read_binary_summary(file, head, fields):
+    """
+    Read fields from a binary save using only its header, plus a seek
+    and read for each list field wanted
+    
+    Args:
+        file: Binary file object positioned just after head
+        head: The _BINARY_HEADER bytes at the start of the file
+        fields: Field names wanted
+    
+    Returns: Dictionary with the fields
+    Raises: InvalidSaveDataError for an unknown format version,
+            struct.error if the header is short
+    """
+    layout = _BINARY_HEADERS.get(head[4] if len(head) > 4 else None)
+    if layout is None:
+        raise InvalidSaveDataError(f"Unsupported save version: {head[4:5]}")
+    header = layout.unpack_from(head)
+    character = dict(zip(NUMERIC_SAVE_FIELDS, header[2:9]))
+    character["_version"] = header[17] if len(header) > 17 else 0
+    string_lengths = header[9:11]
+    counts = header[11:14]
+    table_lengths = header[14:17]
+    
+    if "name" in fields or "class" in fields:
+        file.seek(layout.size)
+        strings = file.read(sum(string_lengths))
+        character["name"] = strings[:string_lengths[0]].decode("utf-8")
+        character["class"] = strings[string_lengths[0]:].decode("utf-8")
+    offset = layout.size + sum(string_lengths)
+    for field, count, length in zip(LIST_SAVE_FIELDS, counts, table_lengths):
+        if field in fields:
+            file.seek(offset)
+            table = file.read(length)
+            if len(table) != length:
+                raise EOFError("Save file list is cut short")
+            character[field] = table.decode("utf-8").split("\0") if count else []
+        offset += length
+    return character
+
+
+def _read_summary(save_files, journal_files, fields):
+    """
+    Read fields of a save plus its journal (see load_character_summary)
+    
+    Args:
+        save_files: The character's save files (see _find_save_files)
+        journal_files: The character's journals (see _find_journal_files)
+        fields: Field names wanted
+    
+    Returns: Dictionary with the fields found, or None if there's no save
+    Raises: SaveFileCorruptedError, InvalidSaveDataError
+    """
+    if not save_files:
+        return None
+    
+    try:
+        with file_utils.open_binary(save_files[0]) as file:
+            head = file.read(_BINARY_HEADER.size)
+            if head.startswith(BINARY_SAVE_MAGIC):
+                character = _read_binary_summary(file, head, fields)
+            else:
+                character = _read_text_summary(file, head, fields)
+    except (OSError, EOFError, struct.error, UnicodeDecodeError):
+        raise SaveFileCorruptedError(f"Could not read save file")
+    
+    if journal_files:
+        _replay_journal(character, journal_files[0], fields)
+    return character
+
+
+def _read_save_version(save_files, journal_files):
+    """
+    Return the version stamp of a character's save, journal included
+    
+    Returns: The version, or 0 if there's no save (or it has no stamp)
+    Raises: SaveFileCorruptedError, InvalidSaveDataError
+    """
+    character = _read_summary(save_files, journal_files, ["_version"])
+    return character.get("_version", 0) if character is not None else 0
+
+
+@contextlib.contextmanager
+def _lock_character(character_name, save_directory, exclusive):
+    """
+    Hold the advisory lock on one character's saves for a with block
+    
+    The lock is an fcntl.flock on one of the lock files in the save
+    directory's LOCK_DIRNAME subdirectory (see LOCK_STRIPE_DIGITS), so it
+    works across processes and across threads of one process. Two
+    characters can share a lock file; that only makes one wait for the
+    other. Exclusive for saving and deleting, shared for loading. A
+    shared lock is skipped if the lock file can't be created (a missing
+    or read-only save directory). Without fcntl nothing is locked.
+    
+    Args:
+        character_name: Character whose saves are locked
+        save_directory: Top save directory (not the shard)
+        exclusive: True for an exclusive lock, False for a shared one
+    """
+    if fcntl is None:
+        yield
+        return
+    digest = hashlib.sha1(character_name.encode("utf-8")).hexdigest()
+    lock_directory = os.path.join(save_directory, LOCK_DIRNAME)
+    lock_path = os.path.join(lock_directory, digest[-LOCK_STRIPE_DIGITS:] + ".lock")
+    try:
+        try:
+            descriptor = os.open(lock_path, os.O_RDONLY | os.O_CREAT, 0o666)
+        except FileNotFoundError:
+            # Only the lock directory: a load mustn't create the save directory
+            try:
+                os.mkdir(lock_directory)
+            except FileExistsError:
+                pass
+            descriptor = os.open(lock_path, os.O_RDONLY | os.O_CREAT, 0o666)
+    except OSError:
+        if exclusive:
+            raise
+        yield
+        return
+    with _hold_flock(descriptor, exclusive):
+        yield
+
+
+@contextlib.contextmanager
+def _lock_directory(directory):
+    """
+    Hold the exclusive lock on one directory's save index for a with block
+    
+    Saves and deletes hold it from checking that the index is fresh until
+    they have appended to it, and rebuilds while they scan and rewrite
+    it. Otherwise one thread's append could make the index look fresh
+    while another's save, written in between, is missing from it. Always
+    taken after the character's lock (see _lock_character), never before.
+    
+    The lock is an fcntl.flock on the directory itself, so no lock file
+    is needed.
+    
+    Args:
+        directory: The directory holding the saves (the shard, if sharded)
+    """
+    if fcntl is None:
+        yield
+        return
+    with _hold_flock(os.open(directory, os.O_RDONLY), exclusive=True):
+        yield
+
+
+@contextlib.contextmanager
+def _hold_flock(descriptor, exclusive):
+    """Hold an fcntl.flock on descriptor, closing it afterwards"""
+    operation = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+    try:
+        try:
+            fcntl.flock(descriptor, operation | fcntl.LOCK_NB)
+        except BlockingIOError:
+            start = time.perf_counter()
+            fcntl.flock(descriptor, operation)
+            _count(LOCK_STATS, "contended")
+            _count(LOCK_STATS, "wait_seconds", time.perf_counter() - start)
+        _count(LOCK_STATS, "acquired")
+        yield
+    finally:
+        # Closing the descriptor releases the lock
+        os.close(descriptor)
+
+
+def _find_save_files(character_name, save_directory):
+    """
+    Find every save file for a character (plain or compressed)
+    
+    In the sharded layout a flat save left over from before migration is
+    found too, after the sharded ones.
+    
+    Returns: List of paths, uncompressed first
+    """
+    bases = [get_save_path(character_name, save_directory)]
+    if is_sharded(save_directory):
+        bases.append(os.path.join(save_directory, f"{character_name}{SAVE_SUFFIX}"))
+    found = []
+    for base in bases:
+        candidates = [base] + [base + extension for extension in file_utils.COMPRESSION_MODULES]
+        found += [path for path in candidates if os.path.exists(path)]
+    return found
+
+
 # ============================================================================
 # VALIDATION
 # ============================================================================
@@ -10,6 +10,8 @@ Handles combat mechanics
 """
 
 import random
+from character_manager import mark_dirty
+from records import Enemy
 from custom_exceptions import (
     InvalidTargetError,
     CombatNotActiveError,
@@ -30,7 +32,7 @@ def create_enemy(enemy_type):
     - orc: health=80, strength=12, magic=5, xp_reward=50, gold_reward=25
     - dragon: health=200, strength=25, magic=15, xp_reward=200, gold_reward=100
     
-    Returns: Enemy dictionary
+    Returns: Enemy record (used like a dictionary)
     Raises: InvalidTargetError if enemy_type not recognized
     """
     if enemy_type == "goblin":
@@ -41,14 +43,14 @@ def create_enemy(enemy_type):
        base_stats =  {"health": 200, "strength": 25, "magic": 15, "xp_reward": 200, "gold_reward": 100}
     else:
         raise InvalidTargetError(f"Unknown enemy type: {enemy_type}")
-    enemy = {"name":"",
-             "enemy_type":enemy_type,
-             "health":base_stats["health"],
-             "max_health":base_stats["health"],
-             "strength":base_stats["strength"],
-             "magic":base_stats["magic"],
-             "xp_reward":base_stats["xp_reward"],
-             "gold_reward":base_stats["gold_reward"]}
+    enemy = Enemy("",
+                  enemy_type,
+                  base_stats["health"],
+                  base_stats["health"],
+                  base_stats["strength"],
+                  base_stats["magic"],
+                  base_stats["xp_reward"],
+                  base_stats["gold_reward"])
     if enemy_type == "goblin":
         enemy["name"] = "Goblin"
     elif enemy_type == "orc":
@@ -98,7 +100,10 @@ class SimpleBattle:
     """
     Simple turn-based combat system
     
-    Manages combat between character and enemy
+    Manages combat between character and enemy. Both are records
+    (records.Character from create_character / load_character and
+    records.Enemy from create_enemy), and every turn reads and writes
+    their fields as attributes, which is faster than subscripting.
     """
     
     def __init__(self, character, enemy):
@@ -126,19 +131,19 @@ class SimpleBattle:
         
         Raises: CharacterDeadError if character is already dead
         """
-        if self.character['health'] <= 0:
+        if self.character.health <= 0:
             raise CharacterDeadError("Character is already dead and cannot fight")
        
         while self.combat_active == True:
             self.player_turn()
-            if self.enemy['health'] <= 0:
+            if self.enemy.health <= 0:
                 self.combat_active = False
 
                 rewards = get_victory_rewards(self.enemy)
                 return {'winner': 'player', 'xp_gained': rewards['xp'], 'gold_gained': rewards['gold']}
             
             self.enemy_turn()
-            if self.character['health'] <= 0:
+            if self.character.health <= 0:
                 self.combat_active = False
                 raise CharacterDeadError("Character has died in battle")
         # TODO: Implement battle loop
@@ -172,7 +177,7 @@ class SimpleBattle:
             print(f" You did {damage} damage to the enemy.")
 
         elif choice == "2":
-            if self.character["class"] == "Cleric":
+            if self.character.character_class == "Cleric":
                 heal_amount = use_special_ability(self.character, self.enemy)
                 print(f"You healed yourself for {heal_amount} health.")
             else:
@@ -222,12 +227,12 @@ class SimpleBattle:
         """
         Calculate damage from attack
         
-        Damage formula: attacker['strength'] - (defender['strength'] // 4)
+        Damage formula: attacker.strength - (defender.strength // 4)
         Minimum damage: 1
         
         Returns: Integer damage amount
         """
-        damage = attacker["strength"] - (defender["strength"] // 4)
+        damage = attacker.strength - (defender.strength // 4)
         if damage < 1:
             damage = 1 
         return damage
@@ -240,9 +245,12 @@ class SimpleBattle:
         
         Reduces health, prevents negative health
         """
-        target["health"] -= damage
-        if target["health"] < 0:
-            target["health"] = 0 
+        health = target.health - damage
+        if health < 0:
+            health = 0
+        target.health = health
+        if target is self.character:
+            mark_dirty(target)
         
         # TODO: Implement damage application
         
@@ -253,9 +261,9 @@ class SimpleBattle:
         
         Returns: 'player' if enemy dead, 'enemy' if character dead, None if ongoing
         """
-        if self.enemy['health'] <= 0:
+        if self.enemy.health <= 0:
             return 'player'
-        if self.character['health'] <= 0:
+        if self.character.health <= 0:
             return 'enemy'
         else:
             return None 
@@ -299,31 +307,31 @@ def use_special_ability(character, enemy):
     Returns: String describing what happened
     Raises: AbilityOnCooldownError if ability was used recently
     """
-    if character['class'] == "Warrior":
-        damage = character["strength"] * 2 
+    character_class = character.character_class
+    if character_class == "Warrior":
+        damage = character.strength * 2
         print("Warrior used Power Strike!")
         return damage 
     
-    elif character['class'] == "Mage":
-        damage = character["magic"] * 2
+    elif character_class == "Mage":
+        damage = character.magic * 2
         print("Mage used Fireball!")
         return damage 
     
-    elif character["class"] == "Rogue":
+    elif character_class == "Rogue":
         chance = random.randint(0,1)
         if chance == 1:
-            damage = character["strength"] * 3
+            damage = character.strength * 3
             print("Rogue used Critical Strike! It's super effective!")
             return damage
         else:
             print("Rogue Critical strike missed")
             return 0
     
-    elif character["class"] == "Cleric":
+    elif character_class == "Cleric":
         heal_amount = 30
-        character["health"] += heal_amount
-        if character["health"] > character["max_health"]:
-            character["health"] = character["max_health"]
+        character.health = min(character.health + heal_amount, character.max_health)
+        mark_dirty(character)
         print("Cleric used Heal!")
         return heal_amount 
 
@@ -372,6 +380,7 @@ def cleric_heal(character):
     character["health"] += heal_amount
     if character ["health"] > character["max_health"]:
         character["health"] = character["max_health"]
+    mark_dirty(character)
 
     return heal_amount
 
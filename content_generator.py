@@ -0,0 +1,110 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Content Generator Module
+
+Writes large, valid quest and item files for testing and benchmarking
+the data loaders. Files are written one block at a time, so even
+10 million blocks never sit in memory.
+
+Usage:
+    python content_generator.py items 100000 big_items.txt
+    python content_generator.py quests 100000 big_quests.txt --depth 20
+"""
+
+import argparse
+import random
+import sys
+
+# type -> stats its effect can modify
+ITEM_EFFECTS = {
+    "weapon": ["strength", "magic"],
+    "armor": ["max_health", "magic"],
+    "consumable": ["health", "strength", "magic"],
+}
+ITEM_TYPES = list(ITEM_EFFECTS)
+
+# ============================================================================
+# GENERATORS
+# ============================================================================
+
+def write_items(filename, count, seed=0):
+    """
+    Write a valid items file
+
+    Args:
+        filename: File to create (overwritten)
+        count: Number of item blocks
+        seed: Random seed, so the same arguments give the same file
+
+    Returns: Number of blocks written
+    """
+    rng = random.Random(seed)
+    with open(filename, "w") as file:
+        for i in range(count):
+            item_type = ITEM_TYPES[i % len(ITEM_TYPES)]
+            stat = rng.choice(ITEM_EFFECTS[item_type])
+            file.write(f"ITEM_ID: item_{i}\n"
+                       f"NAME: Generated {item_type.title()} {i}\n"
+                       f"TYPE: {item_type}\n"
+                       f"EFFECT: {stat}:{rng.randint(1, 50)}\n"
+                       f"COST: {rng.randint(1, 1000)}\n"
+                       f"DESCRIPTION: Generated {item_type} number {i}\n\n")
+    return count
+
+
+def write_quests(filename, count, chain_depth=5, seed=0):
+    """
+    Write a valid quests file made of prerequisite chains
+
+    Quests are grouped into chains of chain_depth quests. The first quest
+    of each chain has no prerequisite, every later one requires the quest
+    before it, and required_level rises along the chain.
+
+    Args:
+        filename: File to create (overwritten)
+        count: Number of quest blocks
+        chain_depth: Length of each prerequisite chain (1 = no chains)
+        seed: Random seed, so the same arguments give the same file
+
+    Returns: Number of blocks written
+    """
+    if chain_depth < 1:
+        raise ValueError("chain_depth must be at least 1")
+    rng = random.Random(seed)
+    with open(filename, "w") as file:
+        for i in range(count):
+            position = i % chain_depth
+            prerequisite = "NONE" if position == 0 else f"quest_{i - 1}"
+            file.write(f"QUEST_ID: quest_{i}\n"
+                       f"TITLE: Generated Quest {i}\n"
+                       f"DESCRIPTION: Step {position + 1} of chain {i // chain_depth}\n"
+                       f"REWARD_XP: {rng.randint(10, 500)}\n"
+                       f"REWARD_GOLD: {rng.randint(5, 250)}\n"
+                       f"REQUIRED_LEVEL: {position + 1}\n"
+                       f"PREREQUISITE: {prerequisite}\n\n")
+    return count
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Generate large game data files.")
+    parser.add_argument("kind", choices=["items", "quests"])
+    parser.add_argument("count", type=int, help="number of blocks to write")
+    parser.add_argument("filename")
+    parser.add_argument("--depth", type=int, default=5, help="quest prerequisite chain depth")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if args.kind == "items":
+        written = write_items(args.filename, args.count, args.seed)
+    else:
+        written = write_quests(args.filename, args.count, args.depth, args.seed)
+    print(f"Wrote {written} {args.kind} to {args.filename}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
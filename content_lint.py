@@ -0,0 +1,225 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Content Lint Module
+
+Checks quest and item files and reports every problem in one pass,
+instead of stopping at the first error like the loaders do.
+
+Usage:
+    python content_lint.py --quests data/quests.txt --items data/items.txt
+"""
+
+import argparse
+import sys
+
+import game_data
+from custom_exceptions import DataError, InvalidDataFormatError
+
+# ============================================================================
+# BLOCK CHECKS
+# ============================================================================
+
+def make_error(filename, block, line, field, reason):
+    """
+    Build one entry of a lint report
+
+    Args:
+        filename: Data file the problem is in
+        block: 1-based index of the block in the file (0 for the whole file)
+        line: 1-based line number (0 if not tied to a line)
+        field: Lowercase field name, or None
+        reason: Human readable description
+
+    Returns: Error dictionary
+    """
+    return {"file": filename, "block": block, "line": line,
+            "field": field, "reason": reason}
+
+
+def check_block(parser, filename, block_index, start_line, lines):
+    """
+    Check one block against a compiled schema and collect every problem
+
+    Args:
+        parser: game_data.QUEST_PARSER, game_data.ITEM_PARSER or any other
+                compiled schema
+        filename: Data file the block came from
+        block_index: 1-based index of the block in the file
+        start_line: Line number of the block's first line
+        lines: Stripped lines of the block
+
+    Returns: Tuple of (list of errors, record built from the good lines,
+             {field: line number})
+    """
+    errors = []
+    record = {}
+    seen = {}
+    for offset, (key, value) in enumerate(game_data._split_lines(lines)):
+        line_number = start_line + offset
+        if key in seen:
+            errors.append(make_error(filename, block_index, line_number, key,
+                                     f"Field repeated (first on line {seen[key]})"))
+            continue
+        try:
+            name, converted = game_data.convert_field(parser, key, value)
+        except InvalidDataFormatError as error:
+            errors.append(make_error(filename, block_index, line_number, key, str(error)))
+            if key is not None:
+                seen[key] = line_number
+            continue
+        seen[name] = line_number
+        record[name] = converted
+
+    for name, reason in game_data.record_errors(parser, record):
+        # Fields that failed to convert were already reported above
+        if name in seen and name not in record:
+            continue
+        errors.append(make_error(filename, block_index, seen.get(name, start_line),
+                                 name, reason))
+    return errors, record, seen
+
+
+def _summarize(parser, record, seen, start_line):
+    """Keep just what the cross-file checks need from a block"""
+    id_field = parser["kind"] + "_id"
+    return {"id": record.get(id_field),
+            "prerequisite": record.get("prerequisite"),
+            "line": seen.get(id_field, start_line),
+            "prerequisite_line": seen.get("prerequisite", start_line)}
+
+
+# ============================================================================
+# FILE AND CROSS-FILE CHECKS
+# ============================================================================
+
+def lint_file(filename, kind):
+    """
+    Check every block of one data file
+
+    Args:
+        filename: Data file to check
+        kind: "item" or "quest"
+
+    Returns: Tuple of (list of errors, list of block summaries)
+    """
+    parser = game_data.ITEM_PARSER if kind == "item" else game_data.QUEST_PARSER
+    errors = []
+    summaries = []
+    try:
+        for block_index, (start_line, lines) in enumerate(game_data._read_blocks(filename), 1):
+            block_errors, record, seen = check_block(parser, filename, block_index,
+                                                     start_line, lines)
+            errors.extend(block_errors)
+            summary = _summarize(parser, record, seen, start_line)
+            summary["file"] = filename
+            summary["block"] = block_index
+            summaries.append(summary)
+    except DataError as error:
+        errors.append(make_error(filename, 0, 0, None, str(error)))
+    return errors, summaries
+
+
+def check_duplicate_ids(summaries, field):
+    """
+    Report IDs defined by more than one block, across all given files
+
+    Returns: List of errors, one per repeated definition
+    """
+    errors = []
+    first_seen = {}
+    for summary in summaries:
+        block_id = summary["id"]
+        if block_id is None:
+            continue
+        if block_id in first_seen:
+            first = first_seen[block_id]
+            errors.append(make_error(summary["file"], summary["block"], summary["line"], field,
+                                     f"Duplicate ID '{block_id}' (first defined in "
+                                     f"{first['file']} line {first['line']})"))
+        else:
+            first_seen[block_id] = summary
+    return errors
+
+
+def check_prerequisites(quest_summaries):
+    """
+    Report quest prerequisites that don't name a known quest
+
+    Returns: List of errors
+    """
+    errors = []
+    quest_ids = {summary["id"] for summary in quest_summaries}
+    for summary in quest_summaries:
+        prerequisite = summary["prerequisite"]
+        if prerequisite is None or prerequisite == "NONE":
+            continue
+        if prerequisite == summary["id"]:
+            reason = f"Quest '{prerequisite}' is its own prerequisite"
+        elif prerequisite not in quest_ids:
+            reason = f"Unknown prerequisite quest '{prerequisite}'"
+        else:
+            continue
+        errors.append(make_error(summary["file"], summary["block"],
+                                 summary["prerequisite_line"], "prerequisite", reason))
+    return errors
+
+
+def lint_content(quest_files=(), item_files=()):
+    """
+    Check any number of quest and item files in one go
+
+    Every block is checked on its own, then duplicate IDs and quest
+    prerequisites are checked across all of the files together.
+
+    Returns: List of error dictionaries (empty if everything is valid)
+    """
+    errors = []
+    quest_summaries = []
+    item_summaries = []
+    for filename in quest_files:
+        file_errors, summaries = lint_file(filename, "quest")
+        errors.extend(file_errors)
+        quest_summaries.extend(summaries)
+    for filename in item_files:
+        file_errors, summaries = lint_file(filename, "item")
+        errors.extend(file_errors)
+        item_summaries.extend(summaries)
+
+    errors.extend(check_duplicate_ids(quest_summaries, "quest_id"))
+    errors.extend(check_duplicate_ids(item_summaries, "item_id"))
+    errors.extend(check_prerequisites(quest_summaries))
+    return errors
+
+
+def format_error(error):
+    """Format an error dictionary as file:line: block N: field: reason"""
+    field = error["field"] or "-"
+    return f"{error['file']}:{error['line']}: block {error['block']}: {field}: {error['reason']}"
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main(argv=None):
+    """
+    Command line entry point
+
+    Returns: Exit code (0 if valid, 1 if any errors were found)
+    """
+    parser = argparse.ArgumentParser(description="Validate quest and item data files.")
+    parser.add_argument("--quests", nargs="*", default=[], help="quest files to check")
+    parser.add_argument("--items", nargs="*", default=[], help="item files to check")
+    args = parser.parse_args(argv)
+    if not args.quests and not args.items:
+        args.quests = ["data/quests.txt"]
+        args.items = ["data/items.txt"]
+
+    errors = lint_content(args.quests, args.items)
+    for error in errors:
+        print(format_error(error))
+    print(f"{len(errors)} error(s) found")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
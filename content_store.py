@@ -0,0 +1,244 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Content Store Module
+
+Optional SQLite backend for quest and item data. The text files are
+imported into a local database with indexes on the fields the game
+filters by, so range queries don't have to scan every quest or item.
+
+Usage:
+    store = content_store.open_store()
+    store.quests["first_steps"]                   # same dicts as load_quests
+    store.items_by_type("weapon", max_cost=200)   # index lookup
+    quest_handler.get_quests_by_level(store.quests, 1, 3)
+"""
+
+import json
+import os
+import sqlite3
+from collections.abc import Mapping
+
+import game_data
+from custom_exceptions import CorruptedDataError
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS quests (
+    quest_id TEXT PRIMARY KEY,
+    required_level INTEGER NOT NULL,
+    prerequisite TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    item_id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    cost INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS quests_by_level ON quests (required_level);
+CREATE INDEX IF NOT EXISTS quests_by_prerequisite ON quests (prerequisite);
+CREATE INDEX IF NOT EXISTS items_by_type_cost ON items (type, cost);
+CREATE INDEX IF NOT EXISTS items_by_cost ON items (cost);
+"""
+
+# ============================================================================
+# OPENING AND IMPORTING
+# ============================================================================
+
+def open_store(db_path="data/content.db", quests_file="data/quests.txt",
+               items_file="data/items.txt"):
+    """
+    Open the content database, importing the text files if needed
+
+    The database remembers the size and mtime of the files it was built
+    from and re-imports them when either one changes.
+
+    Returns: ContentStore
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    try:
+        connection = sqlite3.connect(db_path)
+    except sqlite3.Error as error:
+        raise CorruptedDataError(f"Cannot open content database: {error}")
+    try:
+        connection.executescript(SCHEMA)
+    except sqlite3.Error as error:
+        connection.close()
+        raise CorruptedDataError(f"Cannot open content database: {error}")
+
+    try:
+        stamp = json.dumps([_file_stamp(quests_file), _file_stamp(items_file)])
+        row = connection.execute("SELECT value FROM meta WHERE key = 'source'").fetchone()
+        if row is None or row[0] != stamp:
+            import_content(connection, quests_file, items_file)
+            with connection:
+                connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('source', ?)",
+                                   (stamp,))
+    except sqlite3.Error as error:
+        connection.close()
+        raise CorruptedDataError(f"Cannot read content database: {error}")
+    except Exception:
+        connection.close()
+        raise
+    return ContentStore(connection)
+
+
+def import_content(connection, quests_file="data/quests.txt", items_file="data/items.txt"):
+    """
+    Replace the database contents with the quests and items in the files
+
+    The files are streamed with game_data.iter_quests / iter_items, so
+    every block is validated exactly as the normal loaders would. The
+    import runs in one transaction; a bad file leaves the old data.
+
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    quest_rows = ((quest["quest_id"], quest["required_level"], quest["prerequisite"],
+                   json.dumps(quest))
+                  for quest in game_data.iter_quests(quests_file))
+    item_rows = ((item["item_id"], item["type"], item["cost"], json.dumps(item))
+                 for item in game_data.iter_items(items_file))
+    with connection:
+        connection.execute("DELETE FROM quests")
+        connection.execute("DELETE FROM items")
+        # A repeated ID keeps the last definition but the rowid (and so
+        # the place in iteration order) of the first, like the dicts from
+        # load_quests / load_items. INSERT OR REPLACE would move it last.
+        connection.executemany(
+            "INSERT INTO quests VALUES (?, ?, ?, ?) ON CONFLICT (quest_id) DO UPDATE SET "
+            "required_level = excluded.required_level, "
+            "prerequisite = excluded.prerequisite, data = excluded.data", quest_rows)
+        connection.executemany(
+            "INSERT INTO items VALUES (?, ?, ?, ?) ON CONFLICT (item_id) DO UPDATE SET "
+            "type = excluded.type, cost = excluded.cost, data = excluded.data", item_rows)
+
+
+def _file_stamp(filename):
+    """Return [size, mtime_ns] of a file, or None if it doesn't exist"""
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+# ============================================================================
+# CONTENT STORE
+# ============================================================================
+
+class SqliteCatalog(Mapping):
+    """
+    Read-only {id: data} view of one table
+
+    Works anywhere the game expects the dicts from load_quests or
+    load_items. Each lookup is a primary key query.
+    """
+
+    def __init__(self, connection, table, id_column):
+        self._connection = connection
+        self._table = table
+        self._id_column = id_column
+
+    def __getitem__(self, key):
+        row = self._connection.execute(
+            f"SELECT data FROM {self._table} WHERE {self._id_column} = ?", (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return json.loads(row[0])
+
+    def __contains__(self, key):
+        row = self._connection.execute(
+            f"SELECT 1 FROM {self._table} WHERE {self._id_column} = ?", (key,)).fetchone()
+        return row is not None
+
+    def __iter__(self):
+        cursor = self._connection.execute(
+            f"SELECT {self._id_column} FROM {self._table} ORDER BY rowid")
+        for row in cursor:
+            yield row[0]
+
+    def __len__(self):
+        return self._connection.execute(f"SELECT COUNT(*) FROM {self._table}").fetchone()[0]
+
+    def values(self):
+        """Return every record, decoded in one query"""
+        cursor = self._connection.execute(f"SELECT data FROM {self._table} ORDER BY rowid")
+        return [json.loads(row[0]) for row in cursor]
+
+    def items(self):
+        """Return every (id, record) pair, decoded in one query"""
+        return [(record[self._id_column], record) for record in self.values()]
+
+    def _select(self, where, parameters):
+        """Run an indexed query and decode the matching records"""
+        cursor = self._connection.execute(
+            f"SELECT data FROM {self._table} WHERE {where}", parameters)
+        return [json.loads(row[0]) for row in cursor]
+
+
+class QuestCatalog(SqliteCatalog):
+    """Quest table view with the indexed quest queries"""
+
+    def __init__(self, connection):
+        SqliteCatalog.__init__(self, connection, "quests", "quest_id")
+
+    def quests_by_level(self, min_level, max_level):
+        """Return quests with min_level <= required_level <= max_level"""
+        return self._select("required_level BETWEEN ? AND ? ORDER BY required_level, rowid",
+                            (min_level, max_level))
+
+    def quests_requiring(self, prerequisite):
+        """Return quests that list prerequisite as their prerequisite"""
+        return self._select("prerequisite = ? ORDER BY rowid", (prerequisite,))
+
+
+class ItemCatalog(SqliteCatalog):
+    """Item table view with the indexed item queries"""
+
+    def __init__(self, connection):
+        SqliteCatalog.__init__(self, connection, "items", "item_id")
+
+    def items_by_type(self, item_type, min_cost=None, max_cost=None):
+        """Return items of one type, optionally within a cost range, cheapest first"""
+        where = "type = ?"
+        parameters = [item_type]
+        if min_cost is not None:
+            where += " AND cost >= ?"
+            parameters.append(min_cost)
+        if max_cost is not None:
+            where += " AND cost <= ?"
+            parameters.append(max_cost)
+        return self._select(where + " ORDER BY cost, rowid", parameters)
+
+    def items_by_cost(self, min_cost, max_cost):
+        """Return items of any type within a cost range, cheapest first"""
+        return self._select("cost BETWEEN ? AND ? ORDER BY cost, rowid", (min_cost, max_cost))
+
+
+class ContentStore:
+    """
+    An open content database
+
+    Attributes:
+        quests: QuestCatalog, usable wherever a quest dict is expected
+        items: ItemCatalog, usable wherever an item dict is expected
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.quests = QuestCatalog(connection)
+        self.items = ItemCatalog(connection)
+
+    def get_quests_by_level(self, min_level, max_level):
+        """Same as quest_handler.get_quests_by_level, as an index lookup"""
+        return self.quests.quests_by_level(min_level, max_level)
+
+    def items_by_type(self, item_type, min_cost=None, max_cost=None):
+        """Return items of one type, optionally within a cost range"""
+        return self.items.items_by_type(item_type, min_cost, max_cost)
+
+    def close(self):
+        """Close the database connection"""
+        self.connection.close()
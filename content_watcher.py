@@ -0,0 +1,172 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Content Watcher Module
+
+Hot-reloads quest and item files while the game is running. Only blocks
+whose text actually changed get parsed again.
+"""
+
+import hashlib
+import os
+
+import game_data
+from custom_exceptions import (
+    InvalidDataFormatError,
+    MissingDataFileError,
+    CorruptedDataError
+)
+
+# ============================================================================
+# CONTENT WATCHER
+# ============================================================================
+
+class ContentWatcher:
+    """
+    Polls data files and patches the live data dictionaries in place
+
+    Usage:
+        watcher = ContentWatcher()
+        watcher.watch("data/items.txt", "item", main.all_items)
+        ...
+        report = watcher.poll()   # call every so often
+    """
+
+    def __init__(self):
+        """Start with no watched files"""
+        self.watched = {}
+
+    def watch(self, filename, kind, target):
+        """
+        Start watching a data file
+
+        The file is read once to record a hash of every block. target
+        should already hold the file's data (e.g. from load_items), since
+        only later edits are applied to it.
+
+        Args:
+            filename: Data file to watch
+            kind: "item" or "quest"
+            target: Dictionary to keep up to date
+        """
+        parse, validate, id_field = game_data._kind_functions(kind)
+        self.watched[filename] = {
+            "kind": kind,
+            "target": target,
+            "stat": _stat_key(filename),
+            "hashes": _block_hashes(filename, id_field)[0],
+        }
+
+    def unwatch(self, filename):
+        """Stop watching a data file"""
+        self.watched.pop(filename, None)
+
+    def poll(self):
+        """
+        Check every watched file once and apply any changes
+
+        Files whose size and mtime haven't moved are skipped without
+        reading them. If a changed file has a bad block, nothing from that
+        file is applied and the error is raised; the next poll retries.
+        A file that is missing or can't be read is reported with an
+        "error" message instead, and the other files are still polled.
+        A deleted file is reported once and reloaded when it comes back;
+        its data stays in the target until then.
+
+        Returns: Dictionary {filename: {"added": [...], "removed": [...],
+                 "changed": [...]}} for files that changed, plus an
+                 "error" key for files that couldn't be read
+        Raises: InvalidDataFormatError
+        """
+        reports = {}
+        for filename, state in self.watched.items():
+            stat = _stat_key(filename)
+            if stat == state["stat"]:
+                continue
+            try:
+                report = self._reload(filename, state)
+            except (MissingDataFileError, CorruptedDataError, OSError) as error:
+                if stat is None:
+                    state["stat"] = None
+                reports[filename] = {"added": [], "removed": [], "changed": [],
+                                     "error": str(error)}
+                continue
+            state["stat"] = stat
+            if report["added"] or report["removed"] or report["changed"]:
+                reports[filename] = report
+        return reports
+
+    def _reload(self, filename, state):
+        """Re-parse only the blocks of filename whose text hash changed"""
+        parse, validate, id_field = game_data._kind_functions(state["kind"])
+        old_hashes = state["hashes"]
+        new_hashes, changed_blocks = _block_hashes(filename, id_field, old_hashes)
+
+        # Parse everything first so a bad edit can't half-apply
+        updates = {}
+        for block_id, block in changed_blocks.items():
+            block_data = parse(block)
+            validate(block_data)
+            updates[block_id] = block_data
+
+        target = state["target"]
+        removed = [block_id for block_id in old_hashes if block_id not in new_hashes]
+        for block_id in removed:
+            target.pop(block_id, None)
+        target.update(updates)
+        state["hashes"] = new_hashes
+
+        added = [block_id for block_id in updates if block_id not in old_hashes]
+        changed = [block_id for block_id in updates if block_id in old_hashes]
+        return {"added": added, "removed": removed, "changed": changed}
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def _stat_key(filename):
+    """Return (size, mtime_ns) for a file, or None if it can't be stat'd"""
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _block_hashes(filename, id_field, old_hashes=None):
+    """
+    Hash the raw text of every block in a data file
+
+    Args:
+        filename: Data file to read
+        id_field: "item_id" or "quest_id"
+        old_hashes: Previous {id: hash}; blocks that differ from it are
+                    returned so the caller can parse them
+
+    Returns: Tuple of ({id: hash}, {id: lines} for new or changed blocks)
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    id_key = id_field.upper()
+    hashes = {}
+    changed = {}
+    for start_line, block in game_data._read_blocks(filename):
+        block_id = _find_block_id(block, id_key)
+        if block_id is None:
+            raise InvalidDataFormatError(f"Missing required field: {id_field}")
+        block_hash = hashlib.sha1("\n".join(block).encode("utf-8")).digest()
+        hashes[block_id] = block_hash
+        # As in the loaders the last block with an ID wins, so only its
+        # comparison counts
+        if old_hashes is not None and old_hashes.get(block_id) != block_hash:
+            changed[block_id] = block
+        else:
+            changed.pop(block_id, None)
+    return hashes, changed
+
+
+def _find_block_id(block, id_key):
+    """Return the value of the ID line in a block without parsing the rest"""
+    for line in block:
+        key, colon, value = line.partition(":")
+        if colon and key.strip().upper() == id_key:
+            return value.strip()
+    return None
@@ -0,0 +1,80 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+File Utilities Module
+
+Opens game files that may be compressed. The compression is picked from
+the file extension (.gz, .bz2, .xz) and always streams, so a compressed
+file is never decompressed into memory all at once.
+"""
+
+import bz2
+import gzip
+import lzma
+
+# extension -> module with a gzip-style open() function
+COMPRESSION_MODULES = {
+    ".gz": gzip,
+    ".bz2": bz2,
+    ".xz": lzma,
+}
+
+# Short names accepted by save_character(compression=...)
+COMPRESSION_EXTENSIONS = {
+    "gz": ".gz",
+    "bz2": ".bz2",
+    "xz": ".xz",
+}
+
+# Errors a damaged compressed file can raise while being read
+DECOMPRESSION_ERRORS = (OSError, EOFError, lzma.LZMAError)
+
+
+def compression_module(filename):
+    """Return the compression module for filename, or None if it's plain"""
+    for extension, module in COMPRESSION_MODULES.items():
+        if filename.endswith(extension):
+            return module
+    return None
+
+
+def is_compressed(filename):
+    """Return True if filename has a compressed file extension"""
+    return compression_module(filename) is not None
+
+
+def strip_compression(filename):
+    """Remove a .gz/.bz2/.xz extension from filename, if it has one"""
+    for extension in COMPRESSION_MODULES:
+        if filename.endswith(extension):
+            return filename[:-len(extension)]
+    return filename
+
+
+def open_text(filename, mode="r"):
+    """
+    Open a text file, decompressing or compressing by extension
+
+    Args:
+        filename: File to open
+        mode: "r", "w" or "a"
+
+    Returns: Text file object
+    Raises: OSError (including FileNotFoundError) like open()
+    """
+    module = compression_module(filename)
+    if module is None:
+        return open(filename, mode)
+    return module.open(filename, mode + "t", encoding="utf-8")
+
+
+def open_binary(filename, mode="rb"):
+    """
+    Open a binary file, decompressing or compressing by extension
+
+    Returns: Binary file object
+    Raises: OSError (including FileNotFoundError) like open()
+    """
+    module = compression_module(filename)
+    if module is None:
+        return open(filename, mode)
+    return module.open(filename, mode)
@@ -10,17 +10,37 @@ This module handles loading and validating game data from text files.
 """
 
 import os
+import gc
+import hashlib
+import io
+import marshal
+import mmap
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
+
+import file_utils
 from custom_exceptions import (
     InvalidDataFormatError,
     MissingDataFileError,
     CorruptedDataError
 )
 
+# Parsed data is cached next to each data file as {filename}.cache
+CACHE_SUFFIX = ".cache"
+# Bump this whenever the parsed dictionaries or the cache layout change
+CACHE_VERSION = 2
+
+VALID_ITEM_TYPES = ["weapon", "armor", "consumable"]
+
+# Parallel loading never hands a worker more than this many bytes at once
+MAX_CHUNK_BYTES = 64 * 1024 * 1024
+
 # ============================================================================
 # DATA LOADING FUNCTIONS
 # ============================================================================
 
-def load_quests(filename="data/quests.txt"):
+def load_quests(filename="data/quests.txt", use_cache=True, workers=1,
+               use_mmap=False):
     """
     Load quest data from file
     
@@ -33,46 +53,21 @@ def load_quests(filename="data/quests.txt"):
     REQUIRED_LEVEL: 1
     PREREQUISITE: previous_quest_id (or NONE)
     
+    When use_cache is True the parsed quests are stored in a compiled
+    cache file next to the data file and reused until the file changes.
+    With workers > 1 the file is parsed by that many processes, and
+    use_mmap=True switches to the memory-mapped tokenizer. Files ending in
+    .gz, .bz2 or .xz are decompressed while streaming (those always load
+    serially through the text tokenizer).
+    
     Returns: Dictionary of quests {quest_id: quest_data_dict}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
-    try:
-        with open(filename, "r") as file:
-            lines = file.readlines()
-    except FileNotFoundError:
-        raise MissingDataFileError(f"Data file not found: {filename}")
-    except Exception:
-        raise CorruptedDataError(f"Error reading data file.")
+    return _load_data(filename, "quest", use_cache, workers, use_mmap)
     
-    quest = {}
-    current_block = []
 
-    for line in lines:
-        Line = line.strip()
-        if Line == "":
-            if current_block:
-                quest_data = parse_quest_block(current_block)
-                quest_id = quest_data["quest_id"]
-                quest[quest_id] = quest_data
-                current_block = []
-        else:
-            current_block.append(Line)
-
-    if current_block:
-        quest_data = parse_quest_block(current_block)
-        quest_id = quest_data["quest_id"]
-        quest[quest_id] = quest_data
-        
-    return quest 
-
-    # TODO: Implement this function
-    # Must handle:
-    # - FileNotFoundError → raise MissingDataFileError
-    # - Invalid format → raise InvalidDataFormatError
-    # - Corrupted/unreadable data → raise CorruptedDataError
-    
-
-def load_items(filename="data/items.txt"):
+def load_items(filename="data/items.txt", use_cache=True, workers=1,
+               use_mmap=False):
     """
     Load item data from file
     
@@ -84,45 +79,53 @@ def load_items(filename="data/items.txt"):
     COST: 100
     DESCRIPTION: Item description
     
+    When use_cache is True the parsed items are stored in a compiled
+    cache file next to the data file and reused until the file changes.
+    With workers > 1 the file is parsed by that many processes, and
+    use_mmap=True switches to the memory-mapped tokenizer. Files ending in
+    .gz, .bz2 or .xz are decompressed while streaming (those always load
+    serially through the text tokenizer).
+    
     Returns: Dictionary of items {item_id: item_data_dict}
     Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
+    return _load_data(filename, "item", use_cache, workers, use_mmap)
 
-    try:
-        with open(filename, "r") as file:
-            lines = file.readlines()
-    except FileNotFoundError:
-        raise MissingDataFileError(f"Data file not found: {filename}")
-    except Exception:
-        raise CorruptedDataError(f"Error reading data file.")
+
+def iter_quests(filename="data/quests.txt", use_mmap=False):
+    """
+    Stream quests from file one block at a time
     
-    items= {}
-    current_block = []
+    Only the block currently being parsed is held in memory, so this
+    works for content files far bigger than the game ever loads.
+    With use_mmap=True the file is tokenized through a memory map.
+    
+    Yields: Validated quest dictionaries in file order
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if use_mmap and not file_utils.is_compressed(filename):
+        quests = (build_quest(pairs) for pairs in _iter_mmap_blocks(filename))
+    else:
+        quests = (parse_quest_block(block) for start_line, block in _read_blocks(filename))
+    for quest_data in quests:
+        validate_quest_data(quest_data)
+        yield quest_data
 
-    for line in lines: 
-        stripped_line=line.strip()
-        if stripped_line =="":
-            if current_block:
-                item_data = parse_item_block(current_block)
-                
-                validate_item_data(item_data)
-                
-                item_id = item_data["item_id"]
-                items[item_id] = item_data
-                current_block = []
-        else:
-            current_block.append(stripped_line)
 
-    if current_block:
-        item_data = parse_item_block(current_block)
-        validate_item_data(item_data)
-        item_id = item_data["item_id"]
-        items[item_id] = item_data
+def iter_items(filename="data/items.txt", use_mmap=False):
+    """
+    Stream items from file one block at a time
     
-    return items
-
-    # TODO: Implement this function
-    # Must handle same exceptions as load_quests
+    Yields: Validated item dictionaries in file order
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    if use_mmap and not file_utils.is_compressed(filename):
+        items = (build_item(pairs) for pairs in _iter_mmap_blocks(filename))
+    else:
+        items = (parse_item_block(block) for start_line, block in _read_blocks(filename))
+    for item_data in items:
+        validate_item_data(item_data)
+        yield item_data
     
 
 def validate_quest_data(quest_dict):
@@ -135,25 +138,7 @@ def validate_quest_data(quest_dict):
     Returns: True if valid
     Raises: InvalidDataFormatError if missing required fields
     """
-    required_fields = ["quest_id", 
-                       "title", 
-                       "description", 
-                       "reward_xp", 
-                       "reward_gold", 
-                       "required_level", 
-                       "prerequisite"]
-    for field in required_fields:
-        if field not in quest_dict:
-            raise InvalidDataFormatError(f"Missing required field: {field}")
-        
-    number_fields = ["reward_xp", "reward_gold", "required_level"]
-    for field in number_fields:
-        if not isinstance(quest_dict[field], int):
-            raise InvalidDataFormatError(f"Field {field} must be an integer")
-    return True
-    # TODO: Implement validation
-    # Check that all required keys exist
-    # Check that numeric values are actually numbers
+    return validate_record(QUEST_PARSER, quest_dict)
     
 
 def validate_item_data(item_dict):
@@ -163,45 +148,12 @@ def validate_item_data(item_dict):
     Required fields: item_id, name, type, effect, cost, description
     Valid types: weapon, armor, consumable
     
+    An effect given as a "stat:value" string is converted to a dict.
+    
     Returns: True if valid
     Raises: InvalidDataFormatError if missing required fields or invalid type
     """
-    # TODO: Implement validation
-    # fields can only be item_id, name, type, effect, cost, description
-    requried_fields = ["item_id", "name", "type", "effect", "cost", "description"]
-    for field in requried_fields:
-        if field not in item_dict:
-            raise InvalidDataFormatError(f"Missing required field: {field}")
-    
-    #Types can only be weapon, armor, or consumable
-    valid_types = ["weapon", "armor", "consumable"]
-    if item_dict["type"] not in valid_types:
-        raise InvalidDataFormatError(f"Invalid item type: {item_dict['type']}")
-        
-    #Cost has to be an interger to work propperly 
-
-    if not isinstance(item_dict["cost"], int):
-        raise InvalidDataFormatError("Field cost must be an integer")   
-    
-    #Used Ai Assistant to help with this part
-    #Effect has to be a dictionary with one stat and integer value
-    effect = item_dict.get("effect")
-    
-    if isinstance(effect, str):
-        try:
-            stat, value = effect.split(":", 1)
-            effect = {stat: int(value)}
-            item_dict["effect"] = effect
-        except Exception:
-            raise InvalidDataFormatError("Effect must be in format stat_name:value")
-        
-    if not isinstance(effect, dict) or len(effect) != 1:
-        raise InvalidDataFormatError("Effect must be a dictionary with one stat")
-    
-    for stat, value in effect.items():
-        if not isinstance(value, int):
-            raise InvalidDataFormatError("Effect value must be an integer")
-    return True 
+    return validate_record(ITEM_PARSER, item_dict)
 
 def create_default_data_files():
     """
@@ -245,50 +197,559 @@ def create_default_data_files():
     # Handle any file permission errors appropriately
     
 
+# ============================================================================
+# DATA SCHEMAS
+# ============================================================================
+
+# Each content type is described by a schema: a list of fields, where
+# every field has a name, the type it ends up as, a converter from the raw
+# text value, whether it is required and an optional extra check. The
+# schema is compiled once into a dispatch table so parsing a line is a
+# single dict lookup. New content types (enemies, recipes, ...) only need
+# a new schema.
+
+def _parse_effect(value):
+    """Convert "stat_name:value" into {stat_name: value}"""
+    if isinstance(value, dict):
+        return value
+    stat, amount = value.split(":", 1)
+    return {stat.strip().lower(): int(amount.strip())}
+
+
+def _check_item_type(value):
+    """Return an error message if value is not a valid item type"""
+    if value not in VALID_ITEM_TYPES:
+        return f"Invalid item type: {value}"
+    return None
+
+
+def _check_effect(value):
+    """Return an error message if value is not a one stat effect dict"""
+    if not isinstance(value, dict) or len(value) != 1:
+        return "Effect must be a dictionary with one stat"
+    for amount in value.values():
+        if not isinstance(amount, int):
+            return "Effect value must be an integer"
+    return None
+
+
+QUEST_SCHEMA = {
+    "kind": "quest",
+    # Quests keep any extra fields they are given
+    "strict": False,
+    "fields": [
+        {"name": "quest_id", "type": str, "convert": str, "required": True},
+        {"name": "title", "type": str, "convert": str, "required": True},
+        {"name": "description", "type": str, "convert": str, "required": True},
+        {"name": "reward_xp", "type": int, "convert": int, "required": True},
+        {"name": "reward_gold", "type": int, "convert": int, "required": True},
+        {"name": "required_level", "type": int, "convert": int, "required": True},
+        {"name": "prerequisite", "type": str, "convert": str, "required": True},
+    ],
+}
+
+ITEM_SCHEMA = {
+    "kind": "item",
+    # Items reject fields that aren't in the schema
+    "strict": True,
+    "fields": [
+        {"name": "item_id", "type": str, "convert": str, "required": True},
+        {"name": "name", "type": str, "convert": str, "required": True},
+        {"name": "type", "type": str, "convert": str.lower, "required": True,
+         "check": _check_item_type},
+        {"name": "effect", "type": dict, "convert": _parse_effect, "required": True,
+         "check": _check_effect},
+        {"name": "cost", "type": int, "convert": int, "required": True},
+        {"name": "description", "type": str, "convert": str, "required": True},
+    ],
+}
+
+
+def compile_schema(schema):
+    """
+    Compile a schema into the tables parse_record and validate_record use
+    
+    Args:
+        schema: Dictionary with "kind", "strict" and a "fields" list
+    
+    Returns: Compiled parser dictionary
+    """
+    converters = {}
+    types = {}
+    required = []
+    checks = []
+    for field in schema["fields"]:
+        name = field["name"]
+        convert = field.get("convert", str)
+        # str values are already strings, so they skip the converter call
+        converters[name] = (name, None if convert is str else convert)
+        types[name] = (field["type"], convert)
+        if field.get("required", False):
+            required.append(name)
+        if field.get("check") is not None:
+            checks.append((name, field["check"]))
+    kind = schema["kind"]
+    return {"kind": kind,
+            "label": kind.capitalize(),
+            "strict": schema.get("strict", False),
+            "converters": converters,
+            "types": types,
+            "type_checks": [(name, field_type) for name, (field_type, convert) in types.items()],
+            "required": required,
+            "checks": checks}
+
+
+def convert_field(parser, key, value):
+    """
+    Convert one raw (key, value) pair with a compiled parser
+    
+    Returns: Tuple of (field name, converted value)
+    Raises: InvalidDataFormatError for a missing colon, an unknown field in
+            a strict schema, or a value the converter rejects
+    """
+    if key is None:
+        raise InvalidDataFormatError(f"{parser['label']} line is missing ':': {value}")
+    entry = parser["converters"].get(key)
+    if entry is None:
+        if parser["strict"]:
+            raise InvalidDataFormatError(f"Unknown {parser['kind']} field: {key}")
+        return key, value
+    name, convert = entry
+    if convert is None:
+        return name, value
+    try:
+        return name, convert(value)
+    except (ValueError, TypeError, AttributeError):
+        if parser["types"][name][0] is int:
+            raise InvalidDataFormatError(f"Field {name} must be an integer")
+        raise InvalidDataFormatError(f"Field {name} has invalid format: {value}")
+
+
+def parse_record(parser, pairs):
+    """
+    Build a record dictionary from (key, value) pairs
+    
+    Args:
+        parser: Compiled parser from compile_schema
+        pairs: (lowercase key, stripped value) tuples for one block
+    
+    Returns: Dictionary with the converted fields
+    Raises: InvalidDataFormatError if a line can't be parsed
+    """
+    converters = parser["converters"]
+    record = {}
+    for key, value in pairs:
+        entry = converters.get(key)
+        if entry is None:
+            name, value = convert_field(parser, key, value)
+            record[name] = value
+            continue
+        name, convert = entry
+        if convert is None:
+            record[name] = value
+            continue
+        try:
+            record[name] = convert(value)
+        except (ValueError, TypeError, AttributeError):
+            convert_field(parser, key, value)
+    return record
+
+
+def record_errors(parser, record):
+    """
+    List every problem with a record, without stopping at the first
+    
+    Values that are still raw strings (e.g. an effect written as
+    "health:20") are converted in place first, same as the loaders do.
+    
+    Returns: List of (field name, reason) tuples (empty if valid)
+    """
+    errors = []
+    for name in parser["required"]:
+        if name not in record:
+            errors.append((name, f"Missing required field: {name}"))
+
+    bad_types = set()
+    for name, (field_type, convert) in parser["types"].items():
+        if name not in record:
+            continue
+        value = record[name]
+        if not isinstance(value, field_type) and isinstance(value, str):
+            try:
+                record[name] = convert(value)
+            except (ValueError, TypeError, AttributeError):
+                pass
+        if not isinstance(record[name], field_type):
+            bad_types.add(name)
+            if field_type is int:
+                errors.append((name, f"Field {name} must be an integer"))
+            else:
+                errors.append((name, f"Field {name} must be a {field_type.__name__}"))
+
+    for name, check in parser["checks"]:
+        if name in record and name not in bad_types:
+            message = check(record[name])
+            if message is not None:
+                errors.append((name, message))
+    return errors
+
+
+def validate_record(parser, record):
+    """
+    Validate a record against a compiled parser
+    
+    Returns: True if valid
+    Raises: InvalidDataFormatError describing the first problem found
+    """
+    # Fast path for the common case of a valid, already converted record
+    valid = True
+    for name in parser["required"]:
+        if name not in record:
+            valid = False
+    for name, field_type in parser["type_checks"]:
+        if name in record and not isinstance(record[name], field_type):
+            valid = False
+    for name, check in parser["checks"]:
+        if valid and name in record and check(record[name]) is not None:
+            valid = False
+    if valid:
+        return True
+
+    errors = record_errors(parser, record)
+    if errors:
+        raise InvalidDataFormatError(errors[0][1])
+    return True
+
+
+QUEST_PARSER = compile_schema(QUEST_SCHEMA)
+ITEM_PARSER = compile_schema(ITEM_SCHEMA)
+
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
-def parse_quest_block(lines):
+def _load_data(filename, kind, use_cache, workers, use_mmap):
+    """Shared implementation of load_quests and load_items"""
+    def build(name):
+        if workers > 1:
+            return _build_parallel(name, kind, workers)
+        return _build_data(name, kind, use_mmap)
+
+    if use_cache:
+        return _load_with_cache(filename, kind, build)
+    return build(filename)
+
+
+def _kind_functions(kind):
     """
-    Parse a block of lines into a quest dictionary
+    Look up the parser, validator and ID field for a kind of data
+    
+    Returns: Tuple of (parse function, validate function, id field name)
+    """
+    if kind == "quest":
+        return parse_quest_block, validate_quest_data, "quest_id"
+    if kind == "item":
+        return parse_item_block, validate_item_data, "item_id"
+    raise ValueError(f"Unknown data kind: {kind}")
+
+
+def _build_data(filename, kind, use_mmap=False):
+    """Parse every block in a file into a {id: data} dict"""
+    iterate = iter_quests if kind == "quest" else iter_items
+    id_field = _kind_functions(kind)[2]
+    data = {}
+    for block_data in iterate(filename, use_mmap):
+        data[block_data[id_field]] = block_data
+    return data
+
+
+# ============================================================================
+# PARALLEL LOADING
+# ============================================================================
+
+def _build_parallel(filename, kind, workers):
+    """
+    Parse a data file with a pool of worker processes
+    
+    The file is cut into byte ranges that always end on a blank line, so
+    every chunk holds whole blocks. Chunks are merged back in file order,
+    which keeps the result (and which error gets raised) the same as a
+    serial load: the first bad block in the file wins, and a repeated ID
+    keeps its last definition.
+    
+    Returns: Dictionary of parsed data
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+    """
+    # Byte ranges of a compressed file can't be read independently
+    if file_utils.is_compressed(filename):
+        return _build_data(filename, kind)
+
+    chunks = _split_chunks(filename, workers)
+    if len(chunks) <= 1:
+        return _build_data(filename, kind)
+
+    data = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_parse_chunk, filename, kind, start, end)
+                   for start, end in chunks]
+        for future in futures:
+            for block_id, block_data in future.result():
+                data[block_id] = block_data
+    return data
+
+
+def _split_chunks(filename, workers):
+    """
+    Split a file into byte ranges that start right after a blank line
+    
+    Returns: List of (start, end) byte offsets covering the whole file
+    Raises: MissingDataFileError, CorruptedDataError
+    """
+    try:
+        file = open(filename, "rb")
+    except FileNotFoundError:
+        raise MissingDataFileError(f"Data file not found: {filename}")
+    except OSError:
+        raise CorruptedDataError(f"Error reading data file.")
+
+    with file:
+        size = os.fstat(file.fileno()).st_size
+        count = max(workers * 4, size // MAX_CHUNK_BYTES + 1)
+        boundaries = [0]
+        for i in range(1, count):
+            target = size * i // count
+            if target <= boundaries[-1]:
+                continue
+            boundary = _next_block_boundary(file, target)
+            if boundaries[-1] < boundary < size:
+                boundaries.append(boundary)
+        boundaries.append(size)
+
+    return list(zip(boundaries, boundaries[1:]))
+
+
+def _next_block_boundary(file, position):
+    """Return the offset just past the first blank line after position"""
+    file.seek(position)
+    file.readline()  # finish the line position landed in
+    while True:
+        line = file.readline()
+        if not line:
+            return file.tell()
+        if line.strip() == b"":
+            return file.tell()
+
+
+def _parse_chunk(filename, kind, start, end):
+    """
+    Parse the blocks in one byte range of a data file (runs in a worker)
+    
+    Returns: List of (id, data) tuples in file order
+    Raises: InvalidDataFormatError, CorruptedDataError
+    """
+    parse, validate, id_field = _kind_functions(kind)
+    try:
+        with open(filename, "rb") as file:
+            file.seek(start)
+            text = file.read(end - start).decode("utf-8")
+    except (OSError, UnicodeDecodeError):
+        raise CorruptedDataError(f"Error reading data file.")
+
+    # Split the way a text-mode file is read: str.splitlines would also
+    # break on form feeds, \x1c-\x1e, \x85 and \u2028/\u2029
+    parsed = []
+    for start_line, block in _iter_blocks(io.StringIO(text, newline=None)):
+        block_data = parse(block)
+        validate(block_data)
+        parsed.append((block_data[id_field], block_data))
+    return parsed
+
+
+def _load_with_cache(filename, kind, build):
+    """
+    Load parsed data from the compiled cache, rebuilding it when stale
+    
+    The cache header records the data file's size, mtime and a SHA-256
+    of its contents. A matching size and mtime is trusted as-is; if only
+    the mtime moved (file touched or copied) the contents are hashed and
+    the cache is reused when the hash still matches.
     
     Args:
-        lines: List of strings representing one quest
+        filename: Data file to load
+        kind: "quest" or "item", stored in the header as a sanity check
+        build: Function that parses filename into a dictionary
     
-    Returns: Dictionary with quest data
-    Raises: InvalidDataFormatError if parsing fails
+    Returns: Dictionary of parsed data
+    Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
     """
-    # A new quest dictionary is created 
-    quest = {}
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        raise MissingDataFileError(f"Data file not found: {filename}")
+    except OSError:
+        raise CorruptedDataError(f"Error reading data file.")
 
-    for line in lines:
-        if ":" not in line:
-            raise InvalidDataFormatError(f"Quest dosent have : in lines")
-        
-        key, value = line.split(":", 1)
-        
-        key = key.strip().lower()
-        value = value.strip()
+    cache_file = filename + CACHE_SUFFIX
+    header, payload = _read_cache(cache_file)
+    digest = None
+
+    if header is not None and header[1] == kind and header[2] == stat.st_size:
+        if header[3] != stat.st_mtime_ns:
+            digest = _file_digest(filename)
+        if digest is None or header[4] == digest:
+            data = _unmarshal(payload)
+            if data is not None:
+                if digest is not None:
+                    _write_cache(cache_file, kind, stat, digest, data)
+                return data
 
-        quest[key] = value
+    if digest is None:
+        digest = _file_digest(filename)
+    data = build(filename)
+    _write_cache(cache_file, kind, stat, digest, data)
+    return data
 
+
+def _read_cache(cache_file):
+    """
+    Read a compiled cache file
+    
+    The file is a 4 byte header length, the marshalled header, then the
+    marshalled data. The data is returned still marshalled so a stale
+    cache is never deserialized. (marshal.load on a file object reads in
+    tiny pieces, so everything is read in one go and decoded with loads.)
+    
+    Returns: Tuple of (header, marshalled data bytes), or (None, None) if
+             the cache is missing, unreadable or from another CACHE_VERSION
+    """
+    try:
+        with open(cache_file, "rb") as file:
+            header_size = int.from_bytes(file.read(4), "little")
+            header = marshal.loads(file.read(header_size))
+            if header[0] != CACHE_VERSION:
+                return None, None
+            return header, file.read()
+    except (OSError, EOFError, ValueError, TypeError, IndexError):
+        return None, None
+
+
+def _unmarshal(payload):
+    """
+    Decode cached data, or return None if it is damaged
+    
+    The garbage collector is paused while decoding: the result is plain
+    dicts and strings with no cycles, and otherwise the collector keeps
+    rescanning the hundreds of thousands of new dicts as they are built.
+    """
+    was_enabled = gc.isenabled()
+    gc.disable()
     try:
-        quest["reward_xp"] = int(quest["reward_xp"])
-        quest["reward_gold"] = int(quest["reward_gold"])
-        quest["required_level"] = int(quest["required_level"])
+        return marshal.loads(payload)
+    except (EOFError, ValueError, TypeError):
+        return None
+    finally:
+        if was_enabled:
+            gc.enable()
+
+
+def _write_cache(cache_file, kind, stat, digest, data):
+    """
+    Write a compiled cache file atomically
+    
+    The cache is only an optimization, so failing to write it (read-only
+    data directory, full disk) is silently ignored.
+    """
+    header = marshal.dumps((CACHE_VERSION, kind, stat.st_size, stat.st_mtime_ns, digest))
+    temp_file = cache_file + ".tmp"
+    try:
+        with open(temp_file, "wb") as file:
+            file.write(len(header).to_bytes(4, "little"))
+            file.write(header)
+            marshal.dump(data, file)
+        os.replace(temp_file, cache_file)
+    except (OSError, ValueError):
+        try:
+            os.remove(temp_file)
+        except OSError:
+            pass
+
+
+def _file_digest(filename):
+    """
+    Hash a file's contents in fixed size chunks
+    
+    Returns: Hex SHA-256 digest string
+    Raises: CorruptedDataError if the file can't be read
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(filename, "rb") as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+    except OSError:
+        raise CorruptedDataError(f"Error reading data file.")
+    return digest.hexdigest()
+
+
+def _read_blocks(filename):
+    """
+    Read a data file lazily as blank-line separated blocks
+    
+    Lines are stripped and blank lines are dropped, matching what the
+    parse_*_block functions expect.
+    
+    Yields: Tuples of (line number of the block's first line, list of lines)
+    Raises: MissingDataFileError, CorruptedDataError
+    """
+    try:
+        file = file_utils.open_text(filename)
+    except FileNotFoundError:
+        raise MissingDataFileError(f"Data file not found: {filename}")
     except Exception:
-        raise InvalidDataFormatError("Quest fields must be integers.")
-    return quest
-        
+        raise CorruptedDataError(f"Error reading data file.")
 
+    with file:
+        yield from _iter_blocks(file)
 
 
-    # TODO: Implement parsing logic
-    # Split each line on ": " to get key-value pairs
-    # Convert numeric strings to integers
-    # Handle parsing errors gracefully
+def _iter_blocks(file):
+    """
+    Split an open text file (or any iterable of lines) into blocks
     
+    Yields: Tuples of (line number of the block's first line, list of lines)
+    Raises: CorruptedDataError if the file can't be decoded or read
+    """
+    current_block = []
+    start_line = 0
+    try:
+        for line_number, line in enumerate(file, 1):
+            stripped_line = line.strip()
+            if stripped_line == "":
+                if current_block:
+                    yield start_line, current_block
+                    current_block = []
+            else:
+                if not current_block:
+                    start_line = line_number
+                current_block.append(stripped_line)
+    except (UnicodeDecodeError,) + file_utils.DECOMPRESSION_ERRORS:
+        raise CorruptedDataError(f"Error reading data file.")
+
+    if current_block:
+        yield start_line, current_block
+
+def parse_quest_block(lines):
+    """
+    Parse a block of lines into a quest dictionary
+    
+    Args:
+        lines: List of strings representing one quest
+    
+    Returns: Dictionary with quest data
+    Raises: InvalidDataFormatError if parsing fails
+    """
+    return build_quest(_split_lines(lines))
+
 
 def parse_item_block(lines):
     """
@@ -300,43 +761,251 @@ def parse_item_block(lines):
     Returns: Dictionary with item data
     Raises: InvalidDataFormatError if parsing fails
     """
-    item = {}
-    #Checking for dict format and splitting on :
+    return build_item(_split_lines(lines))
+
+
+def _split_lines(lines):
+    """
+    Turn "KEY: value" lines into (key, value) pairs
+    
+    Keys are lowercased and both sides are stripped. A line with no colon
+    becomes (None, line) so the builder can report it.
+    """
+    pairs = []
+    for line in lines:
+        if ":" not in line:
+            pairs.append((None, line))
+            continue
+        key, value = line.split(":", 1)
+        pairs.append((key.strip().lower(), value.strip()))
+    return pairs
+
+
+def build_quest(pairs):
+    """
+    Build a quest dictionary from (key, value) pairs
+    
+    Args:
+        pairs: (lowercase key, stripped value) tuples for one quest
+    
+    Returns: Dictionary with quest data
+    Raises: InvalidDataFormatError if parsing fails
+    """
+    return parse_record(QUEST_PARSER, pairs)
+
+
+def build_item(pairs):
+    """
+    Build an item dictionary from (key, value) pairs
+    
+    Args:
+        pairs: (lowercase key, stripped value) tuples for one item
+    
+    Returns: Dictionary with item data
+    Raises: InvalidDataFormatError if parsing fails
+    """
+    return parse_record(ITEM_PARSER, pairs)
+
+
+# ============================================================================
+# MMAP TOKENIZER
+# ============================================================================
+
+def _iter_mmap_blocks(filename):
+    """
+    Tokenize a data file straight out of a memory map
+    
+    Block boundaries are found with mmap.find, and each block is sliced
+    out as bytes and split into lines and "KEY: value" halves in C, so
+    there is no per-byte Python loop and only one block is ever copied
+    out of the map. Only the values are decoded; keys are looked up by
+    their raw bytes in a small table, so each distinct key is decoded
+    and lowercased once.
+    
+    Yields: Lists of (lowercase key, value) pairs, one list per block
+    Raises: MissingDataFileError, CorruptedDataError
+    """
     try:
-        for line in lines:
-            if ":" not in line:
-                raise InvalidDataFormatError(f"Item dosent have : in lines")
-            
+        file = open(filename, "rb")
+    except FileNotFoundError:
+        raise MissingDataFileError(f"Data file not found: {filename}")
+    except OSError:
+        raise CorruptedDataError(f"Error reading data file.")
 
-            key, value = line.split(":", 1)
-            key = key.strip().lower()
-            value = value.strip()
-
-            if key == "item_id":
-                item["item_id"] = value
-            elif key == "name":
-                item["name"] = value
-            elif key == "type":
-                item["type"] = value.lower()
-            elif key == "effect":
-
-                stat, amount = value.split(":", 1)
-                stat = stat.strip()
-                amount = int(amount.strip())
-                item["effect"] = {stat.lower(): amount}
-
-            elif key == "cost":
-                item["cost"] = int(value)
-            elif key == "description":
-                item["description"] = value
-            else:
-                raise InvalidDataFormatError(f"Unknown item field: {key}")
-    except ValueError:
-        raise InvalidDataFormatError("Item fields have invalid format.")
-    except Exception as e:
-        raise InvalidDataFormatError(f"Error parsing item: {e}")
-    return item
+    with file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield from _tokenize(buffer)
+        except UnicodeDecodeError:
+            raise CorruptedDataError(f"Error reading data file.")
+        finally:
+            buffer.close()
+
+
+def _tokenize(buffer):
+    """Slice a memory map into blocks and yield each block's pairs"""
+    key_names = {}
+    size = len(buffer)
+    first_newline = buffer.find(b"\n")
+    if first_newline > 0 and buffer[first_newline - 1] == ord("\r"):
+        separator = b"\r\n\r\n"
+    else:
+        separator = b"\n\n"
+    position = 0
+    block = []
+
+    while position < size:
+        # Blank lines the separator misses (extra whitespace, mixed line
+        # endings) still end a block below, just within one slice
+        end = buffer.find(separator, position)
+        if end == -1:
+            end = size
+        for line in buffer[position:end].split(b"\n"):
+            raw_key, colon, value = line.partition(b":")
+            if not colon:
+                line = line.decode("utf-8").strip()
+                if line:
+                    block.append((None, line))
+                elif block:
+                    yield block
+                    block = []
+                continue
+            key = key_names.get(raw_key)
+            if key is None:
+                key = key_names[raw_key] = raw_key.decode("utf-8").strip().lower()
+            block.append((key, value.decode("utf-8").strip()))
+        if block:
+            yield block
+            block = []
+        position = end + len(separator)
+
+
+# ============================================================================
+# LAZY CATALOG
+# ============================================================================
+
+class LazyCatalog(Mapping):
+    """
+    Read-only {id: data} mapping that parses blocks on first access
+    
+    The file is scanned once to record the byte offset of every block,
+    keyed by its ITEM_ID or QUEST_ID. A block is only parsed and validated
+    the first time it is looked up, and the result is cached. Iterating
+    keys and len() never parse anything, so this can stand in for the
+    dicts returned by load_items / load_quests.
+    
+    Errors inside a block surface as InvalidDataFormatError when that
+    block is first looked up, not when the catalog is created.
+    """
+
+    def __init__(self, filename="data/items.txt", kind="item"):
+        """
+        Scan filename and index its blocks
+        
+        Args:
+            filename: Data file to index
+            kind: "item" or "quest"
         
+        Raises: MissingDataFileError, InvalidDataFormatError, CorruptedDataError
+        """
+        if kind == "item":
+            self._id_key = b"ITEM_ID"
+            self._parse = parse_item_block
+            self._validate = validate_item_data
+        elif kind == "quest":
+            self._id_key = b"QUEST_ID"
+            self._parse = parse_quest_block
+            self._validate = validate_quest_data
+        else:
+            raise ValueError(f"Unknown catalog kind: {kind}")
+
+        self.filename = filename
+        self.kind = kind
+        self._offsets = {}
+        self._parsed = {}
+        self._scan()
+
+    def _scan(self):
+        """Record the starting byte offset of every block by its ID"""
+        try:
+            file = file_utils.open_binary(self.filename)
+        except FileNotFoundError:
+            raise MissingDataFileError(f"Data file not found: {self.filename}")
+        except OSError:
+            raise CorruptedDataError(f"Error reading data file.")
+
+        offset = 0
+        block_start = None
+        block_id = None
+        with file:
+            try:
+                for line in file:
+                    if line.strip() == b"":
+                        self._finish_block(block_start, block_id)
+                        block_start = None
+                        block_id = None
+                    else:
+                        if block_start is None:
+                            block_start = offset
+                        key, colon, value = line.partition(b":")
+                        if colon and key.strip().upper() == self._id_key:
+                            block_id = value.strip().decode("utf-8", "replace")
+                    offset += len(line)
+            except file_utils.DECOMPRESSION_ERRORS:
+                raise CorruptedDataError(f"Error reading data file.")
+        self._finish_block(block_start, block_id)
+
+    def _finish_block(self, block_start, block_id):
+        """Index a scanned block, rejecting blocks without an ID"""
+        if block_start is None:
+            return
+        if block_id is None:
+            raise InvalidDataFormatError(
+                f"Missing required field: {self._id_key.decode().lower()}")
+        # Later blocks win, same as load_items / load_quests
+        self._offsets[block_id] = block_start
+
+    def _read_block(self, offset):
+        """Read the stripped lines of the block starting at offset"""
+        lines = []
+        try:
+            # Seeking in a compressed file works but decompresses up to offset
+            with file_utils.open_binary(self.filename) as file:
+                file.seek(offset)
+                for line in file:
+                    stripped_line = line.decode("utf-8").strip()
+                    if stripped_line == "":
+                        break
+                    lines.append(stripped_line)
+        except (UnicodeDecodeError,) + file_utils.DECOMPRESSION_ERRORS:
+            raise CorruptedDataError(f"Error reading data file.")
+        return lines
+
+    def __getitem__(self, key):
+        if key in self._parsed:
+            return self._parsed[key]
+        offset = self._offsets[key]
+        data = self._parse(self._read_block(offset))
+        self._validate(data)
+        self._parsed[key] = data
+        return data
+
+    def __contains__(self, key):
+        return key in self._offsets
+
+    def __iter__(self):
+        return iter(self._offsets)
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def parsed_count(self):
+        """Return how many blocks have actually been parsed so far"""
+        return len(self._parsed)
+
+
 # ============================================================================
 # TESTING
 # ============================================================================
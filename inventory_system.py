@@ -16,6 +16,7 @@ from custom_exceptions import (
     InvalidItemTypeError
 )
 import game_data
+from character_manager import mark_dirty
 # Maximum inventory size
 MAX_INVENTORY_SIZE = 20
 
@@ -37,6 +38,7 @@ def add_item_to_inventory(character, item_id):
     if len(character['inventory']) >= MAX_INVENTORY_SIZE:
         raise InventoryFullError("Inventory is full")
     character['inventory'].append(item_id)
+    mark_dirty(character)
     return True
 
     
@@ -59,6 +61,7 @@ def remove_item_from_inventory(character, item_id):
     if item_id not in character['inventory']:
         raise ItemNotFoundError
     character['inventory'].remove(item_id)
+    mark_dirty(character)
     return True
     # TODO: Implement item removal
     # Check if item exists in inventory
@@ -109,6 +112,7 @@ def clear_inventory(character):
     """
     inventory = character['inventory']
     character['inventory'].clear()
+    mark_dirty(character)
     return inventory
     # TODO: Implement inventory clearing
     # Save current inventory before clearing
@@ -144,6 +148,7 @@ def use_item(character, item_id, item_data):
     stat, value = parse_item_effect(item_data["effect"])
     apply_stat_effect(character, stat, value)
     character["inventory"].remove(item_id)
+    mark_dirty(character)
     return "Consumable took effect successfully"
 
     # TODO: Implement item usage
@@ -190,6 +195,7 @@ def equip_weapon(character, item_id, item_data):
     character["equipped_weapon"] = item_id
     character[stat] += value
     character["inventory"].remove(item_id)
+    mark_dirty(character)
 
     return "Weapon equipped successfully"
 
@@ -233,6 +239,7 @@ def equip_armor(character, item_id, item_data):
     character["equipped_armor"] = [stat, value]
     character[character["equipped_armor"][0]] += character["equipped_armor"][1]
     character["inventory"].remove(item_id)
+    mark_dirty(character)
     return "Armor equipped successfully"
 
     # TODO: Implement armor equipping
@@ -307,6 +314,7 @@ def purchase_item(character, item_id, item_data):
         raise InventoryFullError("Inventory is full")
     character['gold'] -= item_data['cost']
     character['inventory'].append(item_id)
+    mark_dirty(character)
     
     # TODO: Implement purchasing
     # Check if character has enough gold
@@ -332,6 +340,7 @@ def sell_item(character, item_id, item_data):
         raise ItemNotFoundError("Item not found in inventory")
     character['gold'] += value
     character['inventory'].remove(item_id)
+    mark_dirty(character)
     return value
 
 
@@ -378,6 +387,7 @@ def apply_stat_effect(character, stat_name, value):
     character[stat_name] += value
     if stat_name == "health" and character["health"] > character["max_health"]:
         character["health"] = character["max_health"]
+    mark_dirty(character)
 
     # TODO: Implement stat application
     # Add value to character[stat_name]
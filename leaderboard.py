@@ -0,0 +1,237 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Leaderboard Module
+
+Ranks every saved character by level, gold and experience ("top 100 by
+level", "richest Rogues", "what rank is Hero?") without loading saves.
+
+For each stat the leaderboard keeps a list of (-value, name) keys sorted
+with bisect, one over all characters and one per class. A top-k query
+is a slice, a rank query one bisect. Once attached, the leaderboard
+follows save_character and delete_character in this process (see
+character_manager.add_save_listener); saves made by other processes show
+up after the next rebuild.
+
+Usage:
+    board = leaderboard.open_leaderboard("data/save_games")
+    board.top("level", 100)
+    board.top("gold", 10, character_class="Rogue")
+    board.rank("Hero", "gold")
+"""
+
+import os
+import threading
+from bisect import bisect_left, insort
+
+import character_manager
+import save_index
+from custom_exceptions import (
+    CharacterNotFoundError,
+    SaveFileCorruptedError,
+    InvalidSaveDataError
+)
+
+LEADERBOARD_STATS = ["level", "gold", "experience"]
+
+# ============================================================================
+# LEADERBOARD
+# ============================================================================
+
+class Leaderboard:
+    """
+    Sorted per-stat indexes over the characters of one save directory
+
+    Ties are broken by name, so ranks are stable. Characters whose save
+    can't be read are left out.
+    """
+
+    def __init__(self, save_directory="data/save_games", stats=LEADERBOARD_STATS):
+        """
+        Create an empty leaderboard (see rebuild and attach)
+
+        Raises: ValueError if a stat isn't a numeric save field
+        """
+        for stat in stats:
+            if stat not in character_manager.NUMERIC_SAVE_FIELDS:
+                raise ValueError(f"Can't rank characters by: {stat}")
+        self.save_directory = save_directory
+        self.stats = list(stats)
+        self._directory = os.path.abspath(save_directory)
+        self._entries = {}
+        self._sorted = {}
+        self._lock = threading.Lock()
+        self._attached = False
+        # One {name: character, or None once deleted} per rebuild in
+        # progress, holding the updates that arrive while it reads saves
+        self._rebuilds = []
+
+    def __len__(self):
+        """Return the number of characters on the leaderboard"""
+        with self._lock:
+            return len(self._entries)
+
+    def rebuild(self):
+        """
+        Reread every character from the save directory
+
+        One pass over the save index (see character_manager.get_roster).
+        Stats the index doesn't hold are read with load_character_summary,
+        which stops reading each save once it has them. Updates that
+        arrive while the saves are read are applied again on top, so a
+        save made during the rebuild isn't lost.
+        """
+        pending = {}
+        with self._lock:
+            self._rebuilds.append(pending)
+        try:
+            entries, sorted_keys = self._read_entries()
+        finally:
+            with self._lock:
+                self._rebuilds.remove(pending)
+        with self._lock:
+            self._entries = entries
+            self._sorted = sorted_keys
+            for name, character in pending.items():
+                self._remove(name)
+                if character is not None:
+                    self._insert(character)
+
+    def _read_entries(self):
+        """Read the entries and sorted keys for rebuild from the saves"""
+        entries = {}
+        from_index = all(stat in save_index.INDEX_FIELDS for stat in self.stats)
+        fields = ["class"] + self.stats
+        for entry in character_manager.get_roster(self.save_directory):
+            name = entry["name"]
+            if not from_index:
+                try:
+                    entry = character_manager.load_character_summary(
+                        name, self.save_directory, fields)
+                except (CharacterNotFoundError, SaveFileCorruptedError, InvalidSaveDataError):
+                    continue
+            if entry["class"] is None:
+                continue
+            entries[name] = (entry["class"], tuple(entry[stat] for stat in self.stats))
+
+        sorted_keys = {}
+        for name, (character_class, values) in entries.items():
+            for stat, value in zip(self.stats, values):
+                key = (-value, name)
+                sorted_keys.setdefault((stat, None), []).append(key)
+                sorted_keys.setdefault((stat, character_class), []).append(key)
+        for keys in sorted_keys.values():
+            keys.sort()
+        return entries, sorted_keys
+
+    def attach(self):
+        """Start following saves and deletes made in this process"""
+        if not self._attached:
+            character_manager.add_save_listener(self._on_save)
+            self._attached = True
+
+    def detach(self):
+        """Stop following saves and deletes"""
+        if self._attached:
+            character_manager.remove_save_listener(self._on_save)
+            self._attached = False
+
+    def update(self, character):
+        """Add a character, or move it to its new place on every stat"""
+        with self._lock:
+            for pending in self._rebuilds:
+                pending[character["name"]] = character
+            self._remove(character["name"])
+            self._insert(character)
+
+    def remove(self, character_name):
+        """Take a character off the leaderboard (no error if it isn't on it)"""
+        with self._lock:
+            for pending in self._rebuilds:
+                pending[character_name] = None
+            self._remove(character_name)
+
+    def top(self, stat, count=10, character_class=None):
+        """
+        Return the count highest characters by stat
+
+        Args:
+            stat: One of the leaderboard's stats
+            count: Number of entries
+            character_class: Only rank characters of this class
+
+        Returns: List of (name, value), highest first
+        Raises: ValueError if stat isn't on the leaderboard
+        """
+        self._check_stat(stat)
+        with self._lock:
+            keys = self._sorted.get((stat, character_class), [])[:count]
+        return [(name, -negative) for negative, name in keys]
+
+    def rank(self, character_name, stat, character_class=None):
+        """
+        Return a character's place by stat, 1 for the highest
+
+        Raises: ValueError if stat isn't on the leaderboard,
+                CharacterNotFoundError if the character isn't on it (or
+                isn't of character_class)
+        """
+        index = self._check_stat(stat)
+        with self._lock:
+            entry = self._entries.get(character_name)
+            if entry is None or character_class not in (None, entry[0]):
+                raise CharacterNotFoundError(f"{character_name} is not on the leaderboard")
+            key = (-entry[1][index], character_name)
+            return bisect_left(self._sorted[(stat, character_class)], key) + 1
+
+    def _check_stat(self, stat):
+        """Return the position of stat in self.stats, or raise ValueError"""
+        try:
+            return self.stats.index(stat)
+        except ValueError:
+            raise ValueError(f"Leaderboard doesn't rank by: {stat}")
+
+    def _insert(self, character):
+        """Add a character's keys to every sorted list; hold self._lock"""
+        name = character["name"]
+        values = tuple(character[stat] for stat in self.stats)
+        self._entries[name] = (character["class"], values)
+        for stat, value in zip(self.stats, values):
+            key = (-value, name)
+            insort(self._sorted.setdefault((stat, None), []), key)
+            insort(self._sorted.setdefault((stat, character["class"]), []), key)
+
+    def _remove(self, name):
+        """Delete a character's keys from every sorted list; hold self._lock"""
+        entry = self._entries.pop(name, None)
+        if entry is None:
+            return
+        character_class, values = entry
+        for stat, value in zip(self.stats, values):
+            key = (-value, name)
+            for keys in (self._sorted[(stat, None)], self._sorted[(stat, character_class)]):
+                del keys[bisect_left(keys, key)]
+
+    def _on_save(self, event, save_directory, character_name, character):
+        """Save listener: keep the leaderboard in step with this directory"""
+        if os.path.abspath(save_directory) != self._directory:
+            return
+        if event == "save":
+            self.update(character)
+        else:
+            self.remove(character_name)
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def open_leaderboard(save_directory="data/save_games", stats=LEADERBOARD_STATS):
+    """
+    Return a leaderboard built from save_directory and attached to it
+
+    It is attached before the rebuild, so saves made while the rebuild
+    reads the directory are merged in rather than missed.
+    """
+    board = Leaderboard(save_directory, stats)
+    board.attach()
+    board.rebuild()
+    return board
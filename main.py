@@ -16,6 +16,7 @@ import inventory_system
 import quest_handler
 import combat_system
 import game_data
+import save_writer
 from custom_exceptions import *
 
 # ============================================================================
@@ -105,6 +106,7 @@ def load_game():
     saved_characters = character_manager.list_saved_characters()
     print(f"Saved Characters: {saved_characters}")
     character_choice = input()
+    finish_saves()
     try:
         character_manager.load_character(character_choice)
     except (CharacterNotFoundError, SaveFileCorruptedError):
@@ -195,10 +197,12 @@ def view_character_stats():
     
 
     for key in current_character:
+        if key.startswith("_"):
+            continue
         if key not in ['inventory', 'active_quests', 'completed_quests']:
             print(f"{key}: {current_character[key]}")
         else:
-            print(f"{key}: {", ".join(current_character[key])}")
+            print(f"{key}: {', '.join(current_character[key])}")
     # TODO: Implement stats display
     # Show: name, class, level, health, stats, gold, etc.
     # Use character_manager functions
@@ -323,15 +327,40 @@ def save_game():
     # TODO: Implement save
     # Use character_manager.save_character()
     # Handle any file I/O exceptions
-    character_manager.save_character(current_character)
+    # Queued on the background writer; written by save_writer.flush/shutdown
+    save_writer.enqueue_save(current_character, only_if_dirty=True, journal=True)
 
-def load_game_data():
-    """Load all quest and item data from files"""
+def finish_saves(stop=False):
+    """
+    Wait for queued saves to be written, reporting any that failed
+    
+    Args:
+        stop: Also stop the background writer (when quitting)
+    """
+    try:
+        if stop:
+            save_writer.shutdown()
+        else:
+            save_writer.flush()
+    except (OSError, InvalidSaveDataError, SaveConflictError, ValueError) as e:
+        print(f"Error saving game: {e}")
+
+def load_game_data(lazy=False):
+    """
+    Load all quest and item data from files
+    
+    With lazy=True the data is held in game_data.LazyCatalog objects that
+    only parse a quest or item the first time it is looked up.
+    """
     global all_quests, all_items
     
     try:
-        all_quests = game_data.load_quests()
-        all_items = game_data.load_items()
+        if lazy:
+            all_quests = game_data.LazyCatalog("data/quests.txt", "quest")
+            all_items = game_data.LazyCatalog("data/items.txt", "item")
+        else:
+            all_quests = game_data.load_quests()
+            all_items = game_data.load_items()
     except (MissingDataFileError, InvalidDataFormatError):
         game_data.create_default_data_files()
 
@@ -402,6 +431,7 @@ def main():
             load_game()
         elif choice == 3:
             print("\nThanks for playing Quest Chronicles!")
+            finish_saves(stop=True)
             break
         else:
             print("Invalid choice. Please select 1-3.")
@@ -0,0 +1,244 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Population Module
+
+Mass-produces NPC adventurers for world simulation, from a class
+distribution and a name generator.
+
+spawn_characters returns ordinary Character records. spawn_population
+returns a Population: one compact array per stat instead of one object
+per NPC, built with a few whole-array operations instead of a Python
+loop per character. NPCs are only turned into Character records when
+one is looked at.
+
+Usage:
+    npcs = population.spawn_population(1000000, {"Warrior": 3, "Mage": 1}, seed=7)
+    npcs.column("gold")[42] += 10
+    hero = npcs.character(42)
+"""
+
+import random
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+import character_manager
+from custom_exceptions import InvalidCharacterClassError
+from records import Character
+
+CLASS_NAMES = list(character_manager.CLASS_BASE_STATS)
+
+# Columns of a Population, in NUMERIC_SAVE_FIELDS order
+COLUMNS = character_manager.NUMERIC_SAVE_FIELDS
+
+# Array type of every column: signed, so health can drop below 0 in
+# combat as it can on a Character
+COLUMN_TYPECODE = "i"
+
+# Each NPC's class comes from one random byte, picking one of this many
+# equal slices of the class weights (see _class_codes)
+CLASS_BUCKETS = 256
+
+# Marks a slice that spans two classes while drawing (never a class code)
+SPLIT_BUCKET = 255
+
+# ============================================================================
+# SPAWNING
+# ============================================================================
+
+def default_name(index):
+    """Name NPC number index (NPC0, NPC1, ...)"""
+    return f"NPC{index}"
+
+
+def spawn_characters(count, class_weights=None, name_generator=default_name, seed=None):
+    """
+    Create count new characters as Character records
+
+    Args:
+        count: Number of characters
+        class_weights: {class name: relative weight}, default all equal
+        name_generator: Function from NPC number to name
+        seed: Seed for the class draw, for a repeatable population
+
+    Returns: List of Character records, like create_character's
+    Raises: InvalidCharacterClassError for an unknown class,
+            ValueError if the weights don't add up to more than 0
+    """
+    codes = _class_codes(count, class_weights, seed)
+    # One argument tuple per class, worked out once
+    templates = [(name, stats["health"], stats["strength"], stats["magic"])
+                 for name, stats in character_manager.CLASS_BASE_STATS.items()]
+    level = character_manager.STARTING_LEVEL
+    gold = character_manager.STARTING_GOLD
+    characters = []
+    for index, code in enumerate(codes):
+        name, health, strength, magic = templates[code]
+        characters.append(Character(name_generator(index), name, level, health, health,
+                                    strength, magic, 0, gold, [], [], []))
+    return characters
+
+
+def spawn_population(count, class_weights=None, name_generator=default_name, seed=None):
+    """
+    Create count new characters in a columnar Population
+
+    Same arguments and errors as spawn_characters.
+
+    Returns: Population
+    """
+    codes = _class_codes(count, class_weights, seed)
+    stats = character_manager.CLASS_BASE_STATS
+    starting = {"level": character_manager.STARTING_LEVEL, "experience": 0,
+                "gold": character_manager.STARTING_GOLD}
+    columns = {}
+    for field in COLUMNS:
+        if field in starting:
+            columns[field] = array(COLUMN_TYPECODE, [starting[field]]) * count
+        else:
+            stat = "health" if field == "max_health" else field
+            values = [stats[name][stat] for name in CLASS_NAMES]
+            columns[field] = _lookup_column(codes, values)
+    return Population(array("B", codes), columns, name_generator)
+
+# ============================================================================
+# POPULATION
+# ============================================================================
+
+class Population:
+    """
+    NPCs stored column by column
+
+    Each stat in COLUMNS is a signed array(COLUMN_TYPECODE) with one
+    entry per NPC, and the classes are an array("B") of indexes into
+    CLASS_NAMES. Names are not stored: name_generator(index) recreates
+    them. NPCs start with no items or quests, so those lists aren't
+    stored either.
+
+    Simulation code can change the columns directly, e.g.
+    population.column("health")[index] -= damage. Health may go below 0
+    there; clamp it as SimpleBattle.apply_damage does if that matters.
+    """
+
+    def __init__(self, class_codes, columns, name_generator=default_name):
+        """
+        Args:
+            class_codes: array("B") of CLASS_NAMES indexes
+            columns: {field: array(COLUMN_TYPECODE)} for every field in COLUMNS
+            name_generator: Function from NPC number to name
+        """
+        self.class_codes = class_codes
+        self.columns = columns
+        self.name_generator = name_generator
+
+    def __len__(self):
+        """Return the number of NPCs"""
+        return len(self.class_codes)
+
+    def column(self, field):
+        """
+        Return the array holding one stat of every NPC
+
+        Raises: KeyError if field isn't in COLUMNS
+        """
+        return self.columns[field]
+
+    def class_counts(self):
+        """Return {class name: number of NPCs of that class}"""
+        codes = self.class_codes.tobytes()
+        return {name: codes.count(code) for code, name in enumerate(CLASS_NAMES)}
+
+    def character(self, index):
+        """
+        Return NPC number index as a Character record
+
+        The record is a copy: changing it doesn't change the population.
+
+        Raises: IndexError if there's no such NPC
+        """
+        columns = self.columns
+        return Character(self.name_generator(index), CLASS_NAMES[self.class_codes[index]],
+                         columns["level"][index], columns["health"][index],
+                         columns["max_health"][index], columns["strength"][index],
+                         columns["magic"][index], columns["experience"][index],
+                         columns["gold"][index], [], [], [])
+
+    def __iter__(self):
+        """Yield every NPC as a Character record (see character)"""
+        for index in range(len(self)):
+            yield self.character(index)
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def _class_codes(count, class_weights, seed):
+    """
+    Draw a class for each of count NPCs
+    
+    Each NPC gets one random byte, i.e. one of CLASS_BUCKETS equal slices
+    of the weights laid end to end. Most slices lie inside one class, and
+    bytes.translate maps all of those in one C-level pass. Only NPCs in a
+    slice split between classes (at most one slice per class boundary)
+    are drawn again in Python, from an exact position inside the slice,
+    so even a class with a tiny weight gets its share.
+    
+    Returns: bytes of CLASS_NAMES indexes
+    """
+    if class_weights is None:
+        class_weights = {name: 1 for name in CLASS_NAMES}
+    for name, weight in class_weights.items():
+        if name not in character_manager.CLASS_BASE_STATS:
+            raise InvalidCharacterClassError(f"Class not in valid list: {name}")
+        if weight < 0:
+            raise ValueError(f"Class weight can't be negative: {name}")
+    total = sum(class_weights.values())
+    if total <= 0:
+        raise ValueError("Class weights must add up to more than 0")
+    
+    # Where each class's slices end, from 0 to CLASS_BUCKETS
+    ends = []
+    running = 0
+    for name in CLASS_NAMES:
+        running += class_weights.get(name, 0)
+        ends.append(running * CLASS_BUCKETS / total)
+    ends[-1] = CLASS_BUCKETS
+    
+    table = bytearray()
+    for bucket in range(CLASS_BUCKETS):
+        if any(bucket < end < bucket + 1 for end in ends):
+            table.append(SPLIT_BUCKET)
+        else:
+            table.append(bisect_right(ends, bucket))
+    
+    # 255 + random() can round up to CLASS_BUCKETS itself; that position
+    # belongs to the last class with a weight
+    last_code = bisect_left(ends, CLASS_BUCKETS)
+    generator = random.Random(seed)
+    draws = generator.randbytes(count)
+    codes = bytearray(draws.translate(table))
+    index = codes.find(SPLIT_BUCKET)
+    while index != -1:
+        position = draws[index] + generator.random()
+        codes[index] = min(bisect_right(ends, position), last_code)
+        index = codes.find(SPLIT_BUCKET, index + 1)
+    return bytes(codes)
+
+
+def _lookup_column(codes, values):
+    """
+    Return array(COLUMN_TYPECODE) of values[code] for each class code
+
+    Built a byte at a time: byte k of every entry is codes translated
+    through a table of byte k of each value, written into every
+    itemsize-th byte of the buffer. No Python-level loop per NPC.
+    """
+    column = array(COLUMN_TYPECODE)
+    size = column.itemsize
+    buffer = bytearray(len(codes) * size)
+    value_bytes = [value.to_bytes(size, sys.byteorder, signed=True) for value in values]
+    for k in range(size):
+        table = bytes(value[k] for value in value_bytes) + bytes(256 - len(values))
+        buffer[k::size] = codes.translate(table)
+    column.frombytes(buffer)
+    return column
@@ -74,6 +74,7 @@ def accept_quest(character, quest_id, quest_data_dict):
         return False  # Already active
     
     character['active_quests'].append(quest_id)
+    character_manager.mark_dirty(character)
     return True
 
     # TODO: Implement quest acceptance
@@ -121,6 +122,7 @@ def complete_quest(character, quest_id, quest_data_dict):
 
     character["active_quests"].remove(quest_id)
     character["completed_quests"].append(quest_id)
+    character_manager.mark_dirty(character)
 
     return f"Completed Quest '{quest_id}' successfully"
         
@@ -150,6 +152,7 @@ def abandon_quest(character, quest_id):
         raise QuestNotActiveError(f"Quest '{quest_id}' is not active.")
     
     character['active_quests'].remove(quest_id)
+    character_manager.mark_dirty(character)
     return True
     # TODO: Implement quest abandonment
     
@@ -358,6 +361,10 @@ def get_quests_by_level(quest_data_dict, min_level, max_level):
     
     Returns: List of quest dictionaries
     """
+    # Indexed stores (content_store.QuestCatalog) answer this without a scan
+    if hasattr(quest_data_dict, "quests_by_level"):
+        return quest_data_dict.quests_by_level(min_level, max_level)
+
     result = []
     for quest in quest_data_dict.values():
         req_level = quest.get("required_level", 1)
@@ -0,0 +1,171 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Records Module
+
+Slotted record types for characters and enemies. A record stores its
+fields in __slots__ instead of a per-object dictionary, which takes far
+less memory when many NPCs are alive at once, and its fields can be read
+as attributes (enemy.health), which is faster than a dictionary lookup.
+Subscripting a record (enemy["health"]) runs Python code and is about
+half as fast as a dictionary, so hot paths such as combat use attributes.
+
+Records are also mutable mappings, so every existing
+character["health"] style access, "key in character", .get(), dict(...)
+and == against a plain dictionary keep working. Keys that aren't fields
+(anything the game adds later) go into a small overflow dictionary.
+"""
+
+from collections.abc import MutableMapping
+
+# ============================================================================
+# RECORD BASE CLASS
+# ============================================================================
+
+class Record(MutableMapping):
+    """
+    A fixed set of fields stored in __slots__, used like a dictionary
+
+    Subclasses list their fields in FIELDS as {key: attribute name}, in
+    the order the keys are iterated. A field that was never set (or was
+    deleted) is simply missing, as it would be from a dictionary.
+    """
+
+    __slots__ = ("_extra",)
+    FIELDS = {}
+
+    @classmethod
+    def from_mapping(cls, mapping):
+        """Create a record with the keys and values of mapping"""
+        record = cls.__new__(cls)
+        record._extra = None
+        record.update(mapping)
+        return record
+
+    def __getitem__(self, key):
+        """Return the value of a field or overflow key"""
+        try:
+            return getattr(self, self.FIELDS[key])
+        except KeyError:
+            if self._extra is not None and key in self._extra:
+                return self._extra[key]
+        except AttributeError:
+            pass
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        """Set a field, or an overflow key if key isn't a field"""
+        attribute = self.FIELDS.get(key)
+        if attribute is not None:
+            setattr(self, attribute, value)
+        else:
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key):
+        """Remove a field or overflow key"""
+        attribute = self.FIELDS.get(key)
+        try:
+            if attribute is not None:
+                delattr(self, attribute)
+            elif self._extra is not None:
+                del self._extra[key]
+            else:
+                raise KeyError(key)
+        except AttributeError:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        """Check if a field is set or an overflow key exists"""
+        attribute = self.FIELDS.get(key)
+        if attribute is not None:
+            return hasattr(self, attribute)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self):
+        """Iterate over the set fields in FIELDS order, then overflow keys"""
+        for key, attribute in self.FIELDS.items():
+            if hasattr(self, attribute):
+                yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        """Return the number of set fields plus overflow keys"""
+        count = sum(1 for attribute in self.FIELDS.values() if hasattr(self, attribute))
+        return count + (len(self._extra) if self._extra is not None else 0)
+
+    def __repr__(self):
+        """Show the record like the dictionary it stands in for"""
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def copy(self):
+        """Return a shallow copy of the same type, like dict.copy"""
+        return type(self).from_mapping(self)
+
+# ============================================================================
+# GAME RECORDS
+# ============================================================================
+
+class Character(Record):
+    """
+    A player character (see character_manager.create_character)
+
+    The "class" key is the character_class attribute, "_version" and
+    "_dirty" are version and dirty. equipped_weapon and equipped_armor
+    are only set once something is equipped.
+    """
+
+    __slots__ = ("name", "character_class", "level", "health", "max_health", "strength",
+                 "magic", "experience", "gold", "inventory", "active_quests",
+                 "completed_quests", "version", "dirty", "equipped_weapon", "equipped_armor")
+    FIELDS = {"name": "name", "class": "character_class", "level": "level",
+              "health": "health", "max_health": "max_health", "strength": "strength",
+              "magic": "magic", "experience": "experience", "gold": "gold",
+              "inventory": "inventory", "active_quests": "active_quests",
+              "completed_quests": "completed_quests", "_version": "version",
+              "_dirty": "dirty", "equipped_weapon": "equipped_weapon",
+              "equipped_armor": "equipped_armor"}
+
+    def __init__(self, name, character_class, level, health, max_health, strength, magic,
+                 experience, gold, inventory, active_quests, completed_quests,
+                 version=0, dirty=True):
+        """Create a character with every saved field set"""
+        self._extra = None
+        self.name = name
+        self.character_class = character_class
+        self.level = level
+        self.health = health
+        self.max_health = max_health
+        self.strength = strength
+        self.magic = magic
+        self.experience = experience
+        self.gold = gold
+        self.inventory = inventory
+        self.active_quests = active_quests
+        self.completed_quests = completed_quests
+        self.version = version
+        self.dirty = dirty
+
+
+class Enemy(Record):
+    """An enemy in combat (see combat_system.create_enemy)"""
+
+    __slots__ = ("name", "enemy_type", "health", "max_health", "strength", "magic",
+                 "xp_reward", "gold_reward")
+    FIELDS = {"name": "name", "enemy_type": "enemy_type", "health": "health",
+              "max_health": "max_health", "strength": "strength", "magic": "magic",
+              "xp_reward": "xp_reward", "gold_reward": "gold_reward"}
+
+    def __init__(self, name, enemy_type, health, max_health, strength, magic,
+                 xp_reward, gold_reward):
+        """Create an enemy with every field set"""
+        self._extra = None
+        self.name = name
+        self.enemy_type = enemy_type
+        self.health = health
+        self.max_health = max_health
+        self.strength = strength
+        self.magic = magic
+        self.xp_reward = xp_reward
+        self.gold_reward = gold_reward
@@ -0,0 +1,175 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Index Module
+
+A manifest of every save in a save directory (name, class, level, gold
+and file mtime), so the roster can be listed, sorted and paged with one
+file read instead of opening every save.
+
+The manifest is a JSON-lines log: save_character appends a "set" line
+and delete_character a "delete" line. When too many lines are superseded
+the log is rewritten (compacted) in one atomic os.replace.
+
+The index is trusted only while it is at least as new as its directory.
+Writing or removing a save changes the directory mtime, and
+save_character / delete_character append to the manifest afterwards. So
+a save added or removed behind the game's back makes the directory newer
+than the manifest, and character_manager rebuilds the manifest from an
+os.scandir pass.
+"""
+
+import json
+import os
+
+INDEX_FILENAME = "_save_index.jsonl"
+INDEX_FIELDS = ["name", "class", "level", "gold", "mtime"]
+SORT_FIELDS = INDEX_FIELDS
+
+# Compact once the log has this many more lines than live entries
+COMPACT_SLACK = 1000
+
+# ============================================================================
+# READING
+# ============================================================================
+
+def get_index_path(save_directory):
+    """Return the path of a save directory's manifest"""
+    return os.path.join(save_directory, INDEX_FILENAME)
+
+
+def is_fresh(save_directory):
+    """
+    Check that the manifest exists and nothing changed in the directory
+    since it was last written
+
+    Returns: True if read_index can be trusted
+    """
+    try:
+        index_mtime = os.stat(get_index_path(save_directory)).st_mtime_ns
+        directory_mtime = os.stat(save_directory).st_mtime_ns
+    except OSError:
+        return False
+    return index_mtime >= directory_mtime
+
+
+def read_index(save_directory):
+    """
+    Read the manifest of a save directory
+
+    Returns: Dictionary {name: entry} where entry has INDEX_FIELDS keys,
+             or None if the manifest is missing, stale or unreadable
+    """
+    log = read_index_log(save_directory)
+    return log[0] if log is not None else None
+
+
+def read_index_log(save_directory):
+    """
+    Read the manifest of a save directory and count its lines
+
+    Returns: Tuple of ({name: entry}, number of lines), or None like
+             read_index
+    """
+    if not is_fresh(save_directory):
+        return None
+    try:
+        with open(get_index_path(save_directory), encoding="utf-8") as file:
+            text = file.read()
+        # One json.loads for the whole log is much faster than one per line
+        records = json.loads("[" + text.rstrip("\n").replace("\n", ",") + "]")
+        entries = {}
+        for record in records:
+            if record[0] == "set":
+                entries[record[1]] = dict(zip(INDEX_FIELDS, record[1:]))
+            else:
+                entries.pop(record[1], None)
+    except (OSError, ValueError, IndexError, TypeError):
+        return None
+    return entries, len(records)
+
+
+def needs_compaction(entries, lines):
+    """Check if a log of lines lines has grown well past its live entries"""
+    return lines > len(entries) + COMPACT_SLACK
+
+# ============================================================================
+# WRITING
+# ============================================================================
+
+def write_index(save_directory, entries):
+    """
+    Replace the manifest with entries ({name: entry})
+
+    The index is only an optimization, so failing to write it (read-only
+    directory, full disk) is silently ignored.
+    """
+    index_path = get_index_path(save_directory)
+    temp_path = index_path + ".tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as file:
+            for entry in entries.values():
+                file.write(_format_record("set", entry))
+        os.replace(temp_path, index_path)
+        # The rename itself made the directory newer than the file's
+        # contents; stamp the manifest again so it counts as fresh
+        os.utime(index_path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+def compact_index(save_directory):
+    """
+    Rewrite the manifest without its superseded lines, if it needs it
+
+    The caller must hold the directory's index lock
+    (character_manager._lock_directory): a save appending to the old
+    file while it is being replaced would be lost, and the new file
+    would still look fresh.
+
+    Returns: True if the manifest was rewritten
+    """
+    log = read_index_log(save_directory)
+    if log is None or not needs_compaction(*log):
+        return False
+    write_index(save_directory, log[0])
+    return True
+
+
+def record_save(save_directory, entry):
+    """Append a "set" line for entry (a dictionary with INDEX_FIELDS keys)"""
+    _append(save_directory, _format_record("set", entry))
+
+
+def record_delete(save_directory, name):
+    """Append a "delete" line for a character"""
+    _append(save_directory, json.dumps(["delete", name]) + "\n")
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def _format_record(operation, entry):
+    """Return one manifest line"""
+    return json.dumps([operation] + [entry[field] for field in INDEX_FIELDS]) + "\n"
+
+
+def _append(save_directory, line):
+    """
+    Append one line to an existing manifest, ignoring write failures
+
+    A missing manifest is not created here: one holding a single line
+    would look complete. It is rebuilt on the next read instead.
+    """
+    try:
+        descriptor = os.open(get_index_path(save_directory), os.O_WRONLY | os.O_APPEND)
+    except OSError:
+        return
+    try:
+        os.write(descriptor, line.encode("utf-8"))
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
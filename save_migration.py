@@ -0,0 +1,156 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Migration Module
+
+Moves a flat save directory to the sharded layout (see
+character_manager.get_save_directory).
+
+Usage:
+    python save_migration.py data/save_games --workers 16
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import character_manager
+import file_utils
+import save_index
+
+# ============================================================================
+# MIGRATION
+# ============================================================================
+
+def migrate_to_sharded(save_directory="data/save_games", workers=8):
+    """
+    Move every flat save in save_directory into its shard subdirectory
+
+    The shard marker is written first. From then on the game looks in
+    the shards and also falls back to the flat location. Saves stay
+    loadable while they are moved. An interrupted migration can simply
+    be run again.
+
+    The moves are os.replace calls spread over a thread pool. If a
+    sharded copy already exists it was written after the marker, so it
+    is newer and the flat copy is deleted instead.
+
+    Index entries are carried over from a fresh flat index into the
+    shard indexes. Otherwise the shards rebuild theirs on the next
+    listing.
+
+    Args:
+        save_directory: Directory to migrate
+        workers: Number of threads moving files
+
+    Returns: Dictionary {"moved": int, "replaced": int}
+    """
+    entries = save_index.read_index(save_directory) or {}
+    with open(os.path.join(save_directory, character_manager.SHARD_MARKER), "a"):
+        pass
+
+    filenames = []
+    with os.scandir(save_directory) as scan:
+        for entry in scan:
+            name = file_utils.strip_compression(entry.name)
+            if ((name.endswith(character_manager.SAVE_SUFFIX)
+                    or entry.name.endswith(character_manager.JOURNAL_SUFFIX))
+                    and entry.is_file()):
+                filenames.append(entry.name)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda filename: _move_save(save_directory, filename),
+                                    filenames))
+
+    shard_entries = {}
+    for name, entry in entries.items():
+        shard = character_manager.get_save_directory(name, save_directory)
+        shard_entries.setdefault(shard, {})[name] = entry
+    for shard, shard_entry in shard_entries.items():
+        if not os.path.isdir(shard):
+            continue
+        with character_manager._lock_directory(shard):
+            if (not os.path.exists(save_index.get_index_path(shard))
+                    and _shard_matches(shard, shard_entry)):
+                save_index.write_index(shard, shard_entry)
+    try:
+        os.remove(save_index.get_index_path(save_directory))
+    except OSError:
+        pass
+
+    return {"moved": results.count("moved"), "replaced": results.count("replaced")}
+
+
+def _move_save(save_directory, filename):
+    """
+    Move one flat save or journal file into its shard
+
+    Holds the character's lock and then the shard's index lock, like
+    save_character, so a save made during the migration can't be
+    overwritten by the older flat copy or slip past the shard's index.
+
+    Returns: "moved", or "replaced" if a newer sharded copy was kept
+    """
+    source = os.path.join(save_directory, filename)
+    if filename.endswith(character_manager.JOURNAL_SUFFIX):
+        name = filename[:-len(character_manager.JOURNAL_SUFFIX)]
+        find_files = character_manager._find_journal_files
+    else:
+        name = file_utils.strip_compression(filename)[:-len(character_manager.SAVE_SUFFIX)]
+        find_files = character_manager._find_save_files
+    shard = character_manager.get_save_directory(name, save_directory)
+    os.makedirs(shard, exist_ok=True)
+    with character_manager._lock_character(name, save_directory, exclusive=True), \
+            character_manager._lock_directory(shard):
+        # A save since the scan may have replaced the flat copy already
+        files = find_files(name, save_directory)
+        if source not in files:
+            return "replaced"
+        if files[0] != source:
+            os.remove(source)
+            return "replaced"
+        os.replace(source, os.path.join(shard, filename))
+    return "moved"
+
+
+def _shard_matches(shard, shard_entry):
+    """
+    Check that the index entries carried over from the flat index still
+    describe exactly the saves in a shard
+
+    Saves made after the shard marker was written go straight into the
+    shard without an index entry, so the carried entries can be missing
+    a character or be out of date. Each entry's mtime must be the mtime
+    of the character's newest save or journal file.
+    """
+    newest = {}
+    with os.scandir(shard) as scan:
+        for entry in scan:
+            filename = file_utils.strip_compression(entry.name)
+            if filename.endswith(character_manager.SAVE_SUFFIX):
+                name = filename[:-len(character_manager.SAVE_SUFFIX)]
+            elif entry.name.endswith(character_manager.JOURNAL_SUFFIX):
+                name = entry.name[:-len(character_manager.JOURNAL_SUFFIX)]
+            else:
+                continue
+            newest[name] = max(newest.get(name, 0), entry.stat().st_mtime_ns)
+    return newest == {name: entry["mtime"] for name, entry in shard_entry.items()}
+
+# ============================================================================
+# COMMAND LINE
+# ============================================================================
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Move saves to the sharded layout.")
+    parser.add_argument("save_directory", nargs="?", default="data/save_games")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    result = migrate_to_sharded(args.save_directory, args.workers)
+    print(f"Moved {result['moved']} saves, dropped {result['replaced']} stale flat copies")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+COMP 163 - Project 3: Quest Chronicles
+Save Writer Module
+
+Writes save files on a background thread so the game never waits on the
+disk. Saving becomes "copy the character and queue it"; if a character
+is saved again before its last save was written, only the newest copy
+is written.
+
+Usage:
+    save_writer.enqueue_save(character)   # returns immediately
+    save_writer.flush()                   # wait until everything is on disk
+    save_writer.shutdown()                # flush and stop (also run at exit)
+"""
+
+import atexit
+import os
+import threading
+
+import character_manager
+
+# ============================================================================
+# SAVE WRITER
+# ============================================================================
+
+class SaveWriter:
+    """
+    A background thread plus a queue of pending saves
+
+    Pending saves are keyed by (save directory, character name), so the
+    queue holds at most one save per character. Writes go through
+    character_manager.save_character, which replaces the file atomically.
+
+    Attributes:
+        stats: {"queued": int, "coalesced": int, "written": int, "failed": int}
+    """
+
+    def __init__(self):
+        """Create an idle writer; the thread starts with the first save"""
+        self._pending = {}
+        self._writing = None
+        self._errors = []
+        self._stopped = False
+        self._thread = None
+        self._condition = threading.Condition()
+        self.stats = {"queued": 0, "coalesced": 0, "written": 0, "failed": 0}
+
+    def enqueue(self, character, save_directory="data/save_games", compression=None,
+                save_format="text", journal=False):
+        """
+        Queue a save of character and return without writing it
+
+        The character is copied now, so changes made after this call go
+        into the next save, not this one. Its dirty flag is cleared here
+        because the copy is what will be written; if writing it fails,
+        the character is marked dirty again (unless a newer save of it
+        is already queued), so an only_if_dirty save retries it.
+
+        Raises: RuntimeError if the writer has been shut down
+        """
+        snapshot = _snapshot(character)
+        key = (os.path.abspath(save_directory), character["name"])
+        with self._condition:
+            if self._stopped:
+                raise RuntimeError("Save writer has been shut down")
+            if key in self._pending:
+                self.stats["coalesced"] += 1
+            self._pending[key] = (character, (snapshot, save_directory, compression, False,
+                                              save_format, journal))
+            self.stats["queued"] += 1
+            # Cleared before the writer can see the job, so a failure it
+            # reports with mark_dirty is never overwritten here
+            character["_dirty"] = False
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="save-writer",
+                                                daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def pending_count(self):
+        """Return how many saves are queued or being written"""
+        with self._condition:
+            return len(self._pending) + (self._writing is not None)
+
+    def flush(self, timeout=None):
+        """
+        Block until every queued save has been written
+
+        Args:
+            timeout: Seconds to wait at most (None = no limit)
+
+        Returns: True if the queue drained, False on timeout
+        Raises: The first error a background write hit since the last
+                flush (e.g. PermissionError), so failures aren't lost
+        """
+        with self._condition:
+            drained = self._condition.wait_for(
+                lambda: not self._pending and self._writing is None, timeout)
+            errors, self._errors = self._errors, []
+        if errors:
+            raise errors[0]
+        return drained
+
+    def shutdown(self, timeout=None):
+        """Write everything still queued, then stop the thread"""
+        try:
+            self.flush(timeout)
+        finally:
+            with self._condition:
+                self._stopped = True
+                self._condition.notify_all()
+                thread = self._thread
+            if thread is not None:
+                thread.join(timeout)
+
+    def _run(self):
+        """Thread body: write pending saves, oldest first, until stopped"""
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending or self._stopped)
+                if not self._pending:
+                    return
+                key = next(iter(self._pending))
+                character, job = self._pending.pop(key)
+                self._writing = key
+            try:
+                character_manager.save_character(*job)
+                failed = None
+            except Exception as error:
+                failed = error
+            with self._condition:
+                if failed is None:
+                    self.stats["written"] += 1
+                else:
+                    self.stats["failed"] += 1
+                    self._errors.append(failed)
+                    if key not in self._pending:
+                        character_manager.mark_dirty(character)
+                self._writing = None
+                self._condition.notify_all()
+
+# ============================================================================
+# DEFAULT WRITER
+# ============================================================================
+
+_writer = SaveWriter()
+
+
+def get_writer():
+    """Return the writer used by enqueue_save, flush and shutdown"""
+    return _writer
+
+
+def enqueue_save(character, save_directory="data/save_games", compression=None,
+                 only_if_dirty=False, save_format="text", journal=False):
+    """
+    Queue a save on the default writer (see SaveWriter.enqueue)
+
+    With only_if_dirty=True an unchanged character isn't queued at all
+    and counts as skipped in character_manager.SAVE_STATS.
+
+    Returns: True if a save was queued, False if it was skipped
+    """
+    if only_if_dirty and not character_manager.is_dirty(character):
+        character_manager._count(character_manager.SAVE_STATS, "skipped")
+        return False
+    _writer.enqueue(character, save_directory, compression, save_format, journal)
+    return True
+
+
+def flush(timeout=None):
+    """Wait for the default writer's queue to drain (see SaveWriter.flush)"""
+    return _writer.flush(timeout)
+
+
+def shutdown(timeout=None):
+    """Flush and stop the default writer (see SaveWriter.shutdown)"""
+    _writer.shutdown(timeout)
+
+
+atexit.register(shutdown)
+
+# ============================================================================
+# HELPER FUNCTIONS
+# ============================================================================
+
+def _snapshot(character):
+    """Copy a character deeply enough that later game actions can't change it"""
+    return {key: list(value) if isinstance(value, list) else value
+            for key, value in character.items()}
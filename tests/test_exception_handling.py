@@ -24,10 +24,10 @@ def test_invalid_character_class_exception():
     with pytest.raises(InvalidCharacterClassError):
         character_manager.create_character("Test", "InvalidClass")
 
-def test_character_not_found_exception():
+def test_character_not_found_exception(tmp_path):
     """Test that CharacterNotFoundError is raised for missing character"""
     with pytest.raises(CharacterNotFoundError):
-        character_manager.load_character("NonexistentCharacter")
+        character_manager.load_character("NonexistentCharacter", str(tmp_path))
 
 def test_character_dead_exception():
     """Test that CharacterDeadError is raised when appropriate"""
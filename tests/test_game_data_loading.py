@@ -0,0 +1,569 @@
+"""
+Test Game Data Loading
+Tests the streaming and alternative loaders in game_data
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_data
+from custom_exceptions import InvalidDataFormatError, MissingDataFileError
+
+QUEST_TEXT = """QUEST_ID: first_steps
+TITLE: First Steps
+DESCRIPTION: Begin your adventure
+REWARD_XP: 50
+REWARD_GOLD: 25
+REQUIRED_LEVEL: 1
+PREREQUISITE: NONE
+
+QUEST_ID: goblin_hunter
+TITLE: Goblin Hunter
+DESCRIPTION: Defeat 3 goblins
+REWARD_XP: 100
+REWARD_GOLD: 75
+REQUIRED_LEVEL: 2
+PREREQUISITE: first_steps
+"""
+
+ITEM_TEXT = """ITEM_ID: health_potion
+NAME: Health Potion
+TYPE: consumable
+EFFECT: health:20
+COST: 25
+DESCRIPTION: Restores 20 health points
+
+
+ITEM_ID: iron_sword
+NAME: Iron Sword
+TYPE: Weapon
+EFFECT: Strength:5
+COST: 100
+DESCRIPTION: A sturdy iron sword
+"""
+
+
+def write_file(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+# ============================================================================
+# STREAMING LOADER TESTS
+# ============================================================================
+
+def test_iter_quests_yields_blocks_in_order(tmp_path):
+    """Test that iter_quests streams parsed quests"""
+    filename = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    quests = list(game_data.iter_quests(filename))
+
+    assert [quest["quest_id"] for quest in quests] == ["first_steps", "goblin_hunter"]
+    assert quests[1]["reward_xp"] == 100
+    assert quests[1]["prerequisite"] == "first_steps"
+
+def test_iter_items_yields_blocks_in_order(tmp_path):
+    """Test that iter_items streams parsed items"""
+    filename = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    items = list(game_data.iter_items(filename))
+
+    assert [item["item_id"] for item in items] == ["health_potion", "iron_sword"]
+    assert items[1]["type"] == "weapon"
+    assert items[1]["effect"] == {"strength": 5}
+
+def test_iter_quests_is_lazy(tmp_path):
+    """Test that blocks are parsed only as they are requested"""
+    filename = write_file(tmp_path, "quests.txt", QUEST_TEXT + "\nthis block is broken\n")
+    quests = game_data.iter_quests(filename)
+
+    assert next(quests)["quest_id"] == "first_steps"
+    assert next(quests)["quest_id"] == "goblin_hunter"
+    with pytest.raises(InvalidDataFormatError):
+        next(quests)
+
+def test_iter_items_missing_file():
+    """Test that streaming a missing file raises MissingDataFileError"""
+    with pytest.raises(MissingDataFileError):
+        list(game_data.iter_items("nonexistent_items_file.txt"))
+
+def test_load_items_matches_stream(tmp_path):
+    """Test that load_items is built on iter_items"""
+    filename = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    items = game_data.load_items(filename)
+
+    assert items == {item["item_id"]: item for item in game_data.iter_items(filename)}
+
+# ============================================================================
+# COMPILED CACHE TESTS
+# ============================================================================
+
+def test_load_items_writes_and_reuses_cache(tmp_path, monkeypatch):
+    """Test that a second load comes from the cache without parsing"""
+    filename = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    items = game_data.load_items(filename)
+    assert os.path.exists(filename + game_data.CACHE_SUFFIX)
+
+    def fail_parse(lines):
+        raise AssertionError("cache should have been used")
+
+    monkeypatch.setattr(game_data, "parse_item_block", fail_parse)
+    assert game_data.load_items(filename) == items
+
+def test_cache_rebuilds_when_file_changes(tmp_path):
+    """Test that editing the data file invalidates the cache"""
+    filename = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    assert len(game_data.load_quests(filename)) == 2
+
+    with open(filename, "w") as file:
+        file.write(QUEST_TEXT.replace("goblin_hunter", "orc_hunter"))
+    os.utime(filename, ns=(1, 1))
+
+    assert sorted(game_data.load_quests(filename)) == ["first_steps", "orc_hunter"]
+
+def test_cache_survives_touch(tmp_path, monkeypatch):
+    """Test that a changed mtime with identical contents reuses the cache"""
+    filename = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    quests = game_data.load_quests(filename)
+    os.utime(filename, ns=(1, 1))
+
+    monkeypatch.setattr(game_data, "parse_quest_block", None)
+    assert game_data.load_quests(filename) == quests
+
+def test_corrupt_cache_is_ignored(tmp_path):
+    """Test that a garbage cache file falls back to parsing"""
+    filename = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    with open(filename + game_data.CACHE_SUFFIX, "wb") as file:
+        file.write(b"not a cache")
+
+    assert sorted(game_data.load_items(filename)) == ["health_potion", "iron_sword"]
+
+# ============================================================================
+# LAZY CATALOG TESTS
+# ============================================================================
+
+def test_lazy_catalog_parses_on_first_access(tmp_path):
+    """Test that LazyCatalog only parses the blocks that are used"""
+    filename = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    catalog = game_data.LazyCatalog(filename, "item")
+
+    assert len(catalog) == 2
+    assert "iron_sword" in catalog
+    assert catalog.parsed_count() == 0
+
+    assert catalog["iron_sword"]["effect"] == {"strength": 5}
+    assert catalog.parsed_count() == 1
+    assert catalog["iron_sword"] is catalog["iron_sword"]
+
+def test_lazy_catalog_matches_load_quests(tmp_path):
+    """Test that LazyCatalog is a drop-in for the loaded dict"""
+    filename = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    catalog = game_data.LazyCatalog(filename, "quest")
+
+    assert dict(catalog) == game_data.load_quests(filename, use_cache=False)
+    with pytest.raises(KeyError):
+        catalog["missing_quest"]
+
+def test_lazy_catalog_reports_bad_block_on_access(tmp_path):
+    """Test that a broken block raises when it is looked up"""
+    filename = write_file(tmp_path, "items.txt", ITEM_TEXT.replace("COST: 100", "COST: lots"))
+    catalog = game_data.LazyCatalog(filename, "item")
+
+    assert catalog["health_potion"]["cost"] == 25
+    with pytest.raises(InvalidDataFormatError):
+        catalog["iron_sword"]
+
+# ============================================================================
+# PARALLEL LOADING TESTS
+# ============================================================================
+
+def make_item_text(count):
+    blocks = []
+    for i in range(count):
+        blocks.append(f"ITEM_ID: item_{i}\nNAME: Item {i}\nTYPE: consumable\n"
+                      f"EFFECT: health:{i}\nCOST: {i}\nDESCRIPTION: Item number {i}\n")
+    return "\n".join(blocks)
+
+def test_parallel_load_matches_serial(tmp_path):
+    """Test that a parallel load gives the same dict as a serial one"""
+    filename = write_file(tmp_path, "items.txt", make_item_text(500))
+    serial = game_data.load_items(filename, use_cache=False)
+    parallel = game_data.load_items(filename, use_cache=False, workers=2)
+
+    assert parallel == serial
+    assert list(parallel) == list(serial)
+
+def test_parallel_load_keeps_unusual_line_breaks(tmp_path):
+    """Test that only newlines end lines, as in a serial load"""
+    text = make_item_text(500).replace("Item number 7\n", "Item\x0cnumber\u2028seven\x85\n")
+    filename = write_file(tmp_path, "items.txt", text)
+    serial = game_data.load_items(filename, use_cache=False)
+    parallel = game_data.load_items(filename, use_cache=False, workers=2)
+
+    assert serial["item_7"]["description"] == "Item\x0cnumber\u2028seven"
+    assert parallel == serial
+
+def test_parallel_chunks_cover_file_on_block_boundaries(tmp_path):
+    """Test that chunks start on block boundaries and cover every byte"""
+    text = make_item_text(200)
+    filename = write_file(tmp_path, "items.txt", text)
+    chunks = game_data._split_chunks(filename, 3)
+
+    assert chunks[0][0] == 0
+    assert chunks[-1][1] == os.path.getsize(filename)
+    for (start, end), (next_start, next_end) in zip(chunks, chunks[1:]):
+        assert end == next_start
+        assert text.encode()[next_start:].startswith(b"ITEM_ID")
+
+def test_parallel_load_raises_first_error(tmp_path):
+    """Test that the earliest bad block decides the error, as in a serial load"""
+    text = make_item_text(300).replace("COST: 10\n", "COST: ten\n")
+    text = text.replace("TYPE: consumable\nEFFECT: health:250", "TYPE: potion\nEFFECT: health:250")
+    filename = write_file(tmp_path, "items.txt", text)
+
+    with pytest.raises(InvalidDataFormatError) as serial_error:
+        game_data.load_items(filename, use_cache=False)
+    with pytest.raises(InvalidDataFormatError) as parallel_error:
+        game_data.load_items(filename, use_cache=False, workers=2)
+    assert str(parallel_error.value) == str(serial_error.value)
+
+# ============================================================================
+# MMAP TOKENIZER TESTS
+# ============================================================================
+
+def test_mmap_load_matches_text_load(tmp_path):
+    """Test that the mmap tokenizer parses the same data"""
+    items_file = write_file(tmp_path, "items.txt", ITEM_TEXT.replace("\n", "\r\n"))
+    quests_file = write_file(tmp_path, "quests.txt", "\n\n" + QUEST_TEXT + "   \n")
+
+    assert (game_data.load_items(items_file, use_cache=False, use_mmap=True)
+            == game_data.load_items(items_file, use_cache=False))
+    assert (game_data.load_quests(quests_file, use_cache=False, use_mmap=True)
+            == game_data.load_quests(quests_file, use_cache=False))
+
+def test_mmap_tokenizer_pairs(tmp_path):
+    """Test the raw (key, value) pairs produced by the tokenizer"""
+    filename = write_file(tmp_path, "items.txt", "ITEM_ID :  potion \nEFFECT: health:5\n\nNAME:x")
+    blocks = list(game_data._iter_mmap_blocks(filename))
+
+    assert blocks == [[("item_id", "potion"), ("effect", "health:5")], [("name", "x")]]
+
+@pytest.mark.parametrize("newline", ["\n", "\r\n"])
+def test_mmap_matches_line_tokenizer(tmp_path, newline):
+    """Test that the mmap tokenizer splits lines like the line tokenizer"""
+    text = make_item_text(50).replace("Item number 3\n", "Item number 3 " + "x" * 40 + "\n")
+    text = text.replace("ITEM_ID:", " Item_ID \t: ", 5).replace("\n\n", "\n  \n", 3)
+    filename = write_file(tmp_path, "items.txt", text.replace("\n", newline) + newline)
+
+    assert list(game_data._iter_mmap_blocks(filename)) == [
+        game_data._split_lines(block) for start_line, block in game_data._read_blocks(filename)]
+
+def test_mmap_empty_file_and_bad_line(tmp_path):
+    """Test the mmap path on an empty file and a line without a colon"""
+    empty = write_file(tmp_path, "empty.txt", "")
+    assert game_data.load_items(empty, use_cache=False, use_mmap=True) == {}
+
+    bad = write_file(tmp_path, "bad.txt", "This is not valid quest data")
+    with pytest.raises(InvalidDataFormatError):
+        game_data.load_quests(bad, use_cache=False, use_mmap=True)
+
+# ============================================================================
+# HOT RELOAD TESTS
+# ============================================================================
+
+def test_content_watcher_applies_block_changes(tmp_path, monkeypatch):
+    """Test that only edited blocks are re-parsed and applied in place"""
+    import content_watcher
+
+    filename = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    items = game_data.load_items(filename, use_cache=False)
+    watcher = content_watcher.ContentWatcher()
+    watcher.watch(filename, "item", items)
+    assert watcher.poll() == {}
+
+    parsed = []
+    original_parse = game_data.parse_item_block
+    monkeypatch.setattr(game_data, "parse_item_block",
+                        lambda lines: parsed.append(lines[0]) or original_parse(lines))
+
+    new_text = ITEM_TEXT.replace("COST: 100", "COST: 120").replace("health_potion", "mana_potion")
+    with open(filename, "w") as file:
+        file.write(new_text + "\nITEM_ID: shield\nNAME: Shield\nTYPE: armor\n"
+                   "EFFECT: max_health:5\nCOST: 30\nDESCRIPTION: A shield\n")
+    os.utime(filename, ns=(1, 1))
+
+    report = watcher.poll()[filename]
+    assert sorted(report["added"]) == ["mana_potion", "shield"]
+    assert report["removed"] == ["health_potion"]
+    assert report["changed"] == ["iron_sword"]
+    assert len(parsed) == 3
+    assert items["iron_sword"]["cost"] == 120
+    assert "health_potion" not in items
+
+def test_content_watcher_duplicate_ids_last_block_wins(tmp_path):
+    """Test that editing a shadowed duplicate block changes nothing, as in a load"""
+    import content_watcher
+
+    sword = ITEM_TEXT[ITEM_TEXT.index("ITEM_ID: iron_sword"):]
+    filename = write_file(tmp_path, "items.txt", ITEM_TEXT + "\n" + sword)
+    items = game_data.load_items(filename, use_cache=False)
+    watcher = content_watcher.ContentWatcher()
+    watcher.watch(filename, "item", items)
+
+    with open(filename, "w") as file:
+        file.write(ITEM_TEXT.replace("COST: 100", "COST: 999") + "\n" + sword)
+    os.utime(filename, ns=(1, 1))
+
+    assert watcher.poll() == {}
+    assert items == game_data.load_items(filename, use_cache=False)
+    assert items["iron_sword"]["cost"] == 100
+
+def test_content_watcher_bad_edit_is_not_applied(tmp_path):
+    """Test that a broken edit leaves the live data untouched"""
+    import content_watcher
+
+    filename = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    quests = game_data.load_quests(filename, use_cache=False)
+    watcher = content_watcher.ContentWatcher()
+    watcher.watch(filename, "quest", quests)
+
+    with open(filename, "w") as file:
+        file.write(QUEST_TEXT.replace("REWARD_XP: 100", "REWARD_XP: lots"))
+    os.utime(filename, ns=(1, 1))
+
+    with pytest.raises(InvalidDataFormatError):
+        watcher.poll()
+    assert quests["goblin_hunter"]["reward_xp"] == 100
+
+def test_content_watcher_keeps_polling_after_a_file_is_deleted(tmp_path):
+    """Test that a deleted file is reported and the other files still reload"""
+    import content_watcher
+
+    quests_file = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    items_file = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    quests = game_data.load_quests(quests_file, use_cache=False)
+    items = game_data.load_items(items_file, use_cache=False)
+    watcher = content_watcher.ContentWatcher()
+    watcher.watch(quests_file, "quest", quests)
+    watcher.watch(items_file, "item", items)
+
+    os.remove(quests_file)
+    with open(items_file, "w") as file:
+        file.write(ITEM_TEXT.replace("COST: 100", "COST: 120"))
+    os.utime(items_file, ns=(1, 1))
+
+    reports = watcher.poll()
+    assert "not found" in reports[quests_file]["error"]
+    assert reports[items_file]["changed"] == ["iron_sword"]
+    assert items["iron_sword"]["cost"] == 120
+    assert watcher.poll() == {}
+
+    write_file(tmp_path, "quests.txt", QUEST_TEXT.replace("REWARD_XP: 100", "REWARD_XP: 150"))
+    assert watcher.poll()[quests_file]["changed"] == ["goblin_hunter"]
+    assert quests["goblin_hunter"]["reward_xp"] == 150
+
+# ============================================================================
+# BATCH VALIDATION TESTS
+# ============================================================================
+
+def test_lint_reports_every_error_with_location(tmp_path):
+    """Test that batch validation keeps going after the first error"""
+    import content_lint
+
+    text = ITEM_TEXT.replace("COST: 25", "COST: cheap").replace("TYPE: Weapon", "TYPE: wand")
+    text = text.replace("DESCRIPTION: A sturdy iron sword\n", "") + "\nITEM_ID: rock\nNAME Rock\n"
+    filename = write_file(tmp_path, "items.txt", text)
+
+    errors = content_lint.lint_content(item_files=[filename])
+    found = {(error["block"], error["line"], error["field"]) for error in errors}
+    assert (1, 5, "cost") in found
+    assert (2, 11, "type") in found
+    assert (2, 9, "description") in found
+    assert (3, 16, None) in found
+    assert len([error for error in errors if error["block"] == 3]) == 6
+
+def test_lint_cross_file_checks(tmp_path):
+    """Test duplicate IDs and prerequisite references across files"""
+    import content_lint
+
+    first = write_file(tmp_path, "quests_a.txt", QUEST_TEXT)
+    second = write_file(tmp_path, "quests_b.txt",
+                        QUEST_TEXT.replace("PREREQUISITE: first_steps", "PREREQUISITE: lost_quest")
+                                  .replace("QUEST_ID: first_steps", "QUEST_ID: side_quest"))
+    errors = content_lint.lint_content(quest_files=[first, second])
+    reasons = [error["reason"] for error in errors]
+
+    assert len(errors) == 2
+    assert any(reason.startswith("Duplicate ID 'goblin_hunter'") for reason in reasons)
+    assert "Unknown prerequisite quest 'lost_quest'" in reasons
+
+def test_lint_command_line(tmp_path, capsys):
+    """Test the command line exit codes"""
+    import content_lint
+
+    good = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    bad = write_file(tmp_path, "bad.txt", "This is not valid quest data")
+
+    assert content_lint.main(["--items", good]) == 0
+    assert content_lint.main(["--quests", bad]) == 1
+    assert "bad.txt:1: block 1" in capsys.readouterr().out
+
+# ============================================================================
+# SQLITE CONTENT STORE TESTS
+# ============================================================================
+
+def test_content_store_matches_loaders(tmp_path):
+    """Test that the SQLite catalogs hold the same data as the loaders"""
+    import content_store
+
+    quests_file = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    items_file = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    store = content_store.open_store(str(tmp_path / "content.db"), quests_file, items_file)
+
+    assert dict(store.quests) == game_data.load_quests(quests_file, use_cache=False)
+    assert dict(store.items) == game_data.load_items(items_file, use_cache=False)
+    assert "iron_sword" in store.items
+    assert "missing" not in store.items
+    store.close()
+
+def test_content_store_indexed_queries(tmp_path):
+    """Test the range queries and the quest_handler integration"""
+    import content_store
+    import quest_handler
+
+    quests_file = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    items_file = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    store = content_store.open_store(str(tmp_path / "content.db"), quests_file, items_file)
+
+    assert [item["item_id"] for item in store.items_by_type("weapon", max_cost=200)] == ["iron_sword"]
+    assert store.items_by_type("weapon", max_cost=50) == []
+    assert [quest["quest_id"] for quest in quest_handler.get_quests_by_level(store.quests, 2, 5)] == ["goblin_hunter"]
+    assert [quest["quest_id"] for quest in store.quests.quests_requiring("first_steps")] == ["goblin_hunter"]
+    store.close()
+
+def test_content_store_keeps_file_order_for_duplicate_ids(tmp_path):
+    """Test that a redefined ID keeps its first place, as in load_quests"""
+    import content_store
+
+    redefined = QUEST_TEXT.split("\n\n")[0].replace("REQUIRED_LEVEL: 1", "REQUIRED_LEVEL: 2")
+    quests_file = write_file(tmp_path, "quests.txt", QUEST_TEXT + "\n" + redefined + "\n")
+    items_file = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    store = content_store.open_store(str(tmp_path / "content.db"), quests_file, items_file)
+
+    loaded = game_data.load_quests(quests_file, use_cache=False)
+    assert list(store.quests) == list(loaded) == ["first_steps", "goblin_hunter"]
+    assert store.quests.values() == list(loaded.values())
+    assert [quest["quest_id"] for quest in store.quests.quests_by_level(1, 2)] == [
+        "first_steps", "goblin_hunter"]
+    store.close()
+
+def test_content_store_closes_connection_on_failed_import(tmp_path, monkeypatch):
+    """Test that open_store doesn't leak the connection when a file is bad"""
+    import sqlite3
+    import content_store
+
+    connections = []
+    real_connect = sqlite3.connect
+
+    def connect(*args):
+        connections.append(real_connect(*args))
+        return connections[-1]
+
+    monkeypatch.setattr(sqlite3, "connect", connect)
+    items_file = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    with pytest.raises(MissingDataFileError):
+        content_store.open_store(str(tmp_path / "content.db"),
+                                 str(tmp_path / "missing.txt"), items_file)
+    with pytest.raises(sqlite3.ProgrammingError):
+        connections[0].execute("SELECT 1")
+
+def test_content_store_reimports_changed_files(tmp_path):
+    """Test that editing a source file refreshes the database"""
+    import content_store
+
+    quests_file = write_file(tmp_path, "quests.txt", QUEST_TEXT)
+    items_file = write_file(tmp_path, "items.txt", ITEM_TEXT)
+    db_path = str(tmp_path / "content.db")
+    content_store.open_store(db_path, quests_file, items_file).close()
+
+    with open(items_file, "w") as file:
+        file.write(ITEM_TEXT.replace("COST: 100", "COST: 40"))
+    os.utime(items_file, ns=(1, 1))
+
+    store = content_store.open_store(db_path, quests_file, items_file)
+    assert store.items["iron_sword"]["cost"] == 40
+    store.close()
+
+# ============================================================================
+# CONTENT GENERATOR TESTS
+# ============================================================================
+
+def test_generated_files_load_and_lint_cleanly(tmp_path):
+    """Test that generated content is valid and has the requested chains"""
+    import content_generator
+    import content_lint
+    import quest_handler
+
+    items_file = str(tmp_path / "items.txt")
+    quests_file = str(tmp_path / "quests.txt")
+    content_generator.write_items(items_file, 300)
+    content_generator.write_quests(quests_file, 120, chain_depth=4)
+
+    assert len(game_data.load_items(items_file, use_cache=False)) == 300
+    quests = game_data.load_quests(quests_file, use_cache=False)
+    assert len(quests) == 120
+    assert quest_handler.get_quest_prerequisite_chain("quest_7", quests) == [
+        "quest_4", "quest_5", "quest_6", "quest_7"]
+    assert content_lint.lint_content([quests_file], [items_file]) == []
+
+# ============================================================================
+# SCHEMA TESTS
+# ============================================================================
+
+def test_custom_schema_reuses_machinery():
+    """Test that a new content type only needs a schema"""
+    parser = game_data.compile_schema({
+        "kind": "enemy",
+        "strict": True,
+        "fields": [
+            {"name": "enemy_id", "type": str, "convert": str, "required": True},
+            {"name": "health", "type": int, "convert": int, "required": True},
+            {"name": "loot", "type": str, "convert": str, "required": False},
+        ],
+    })
+    lines = ["ENEMY_ID: troll", "HEALTH: 90"]
+    record = game_data.parse_record(parser, game_data._split_lines(lines))
+
+    assert record == {"enemy_id": "troll", "health": 90}
+    assert game_data.validate_record(parser, record) == True
+    with pytest.raises(InvalidDataFormatError):
+        game_data.parse_record(parser, [("speed", "3")])
+    with pytest.raises(InvalidDataFormatError):
+        game_data.validate_record(parser, {"enemy_id": "troll"})
+
+def test_record_errors_collects_everything():
+    """Test that record_errors reports every problem at once"""
+    errors = game_data.record_errors(game_data.ITEM_PARSER,
+                                     {"item_id": "x", "type": "wand", "cost": "free"})
+    fields = [field for field, reason in errors]
+
+    assert sorted(fields) == ["cost", "description", "effect", "name", "type"]
+
+# ============================================================================
+# COMPRESSED CONTENT TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("extension", [".gz", ".bz2", ".xz"])
+def test_compressed_data_files_load(tmp_path, extension):
+    """Test that compressed data files load like plain ones"""
+    import file_utils
+
+    filename = str(tmp_path / ("items.txt" + extension))
+    with file_utils.open_text(filename, "w") as file:
+        file.write(ITEM_TEXT)
+
+    items = game_data.load_items(filename, use_cache=False)
+    assert sorted(items) == ["health_potion", "iron_sword"]
+    assert game_data.load_items(filename, use_cache=False, use_mmap=True, workers=2) == items
+    assert game_data.LazyCatalog(filename)["iron_sword"] == items["iron_sword"]
@@ -19,7 +19,7 @@ import game_data
 # CHARACTER INTEGRATION TESTS
 # ============================================================================
 
-def test_character_creation_and_saving():
+def test_character_creation_and_saving(tmp_path):
     """Test creating and saving a character"""
     char = character_manager.create_character("IntegrationTest", "Warrior")
     
@@ -29,16 +29,16 @@ def test_character_creation_and_saving():
     assert char['level'] == 1
     
     # Test saving
-    result = character_manager.save_character(char)
+    result = character_manager.save_character(char, str(tmp_path))
     assert result == True
     
     # Test loading
-    loaded = character_manager.load_character("IntegrationTest")
+    loaded = character_manager.load_character("IntegrationTest", str(tmp_path))
     assert loaded['name'] == char['name']
     assert loaded['class'] == char['class']
     
     # Cleanup
-    character_manager.delete_character("IntegrationTest")
+    character_manager.delete_character("IntegrationTest", str(tmp_path))
 
 def test_character_leveling_system():
     """Test that character leveling works correctly"""
@@ -54,6 +54,45 @@ def test_character_leveling_system():
     assert char['max_health'] > original_health
     assert char['health'] == char['max_health']  # Health restored on level up
 
+def level_up_one_at_a_time(char, xp_amount):
+    """The original gain_experience loop, to check the closed form against"""
+    char['experience'] += xp_amount
+    while char['experience'] >= char['level'] * 100:
+        char['experience'] -= char['level'] * 100
+        char['level'] += 1
+        char['max_health'] += 10
+        char['strength'] += 2
+        char['magic'] += 2
+        char['health'] = char['max_health']
+
+def test_large_experience_grants_match_leveling_loop():
+    """Test that leveling in one step matches leveling one level at a time"""
+    import random
+    rng = random.Random(163)
+    for _ in range(300):
+        char = character_manager.create_character("LevelTest", "Warrior")
+        char['level'] = rng.randint(1, 60)
+        char['experience'] = rng.randint(0, char['level'] * 100 - 1)
+        char['health'] = 7
+        expected = dict(char)
+        xp = rng.choice([0, 1, 99, 100, 12345, rng.randint(0, 10 ** 7)])
+        level_up_one_at_a_time(expected, xp)
+        character_manager.gain_experience(char, xp)
+        assert char == dict(expected, _dirty=True)
+
+    assert character_manager.level_for_total_xp(0) == 1
+    assert character_manager.level_for_total_xp(99) == 1
+    assert character_manager.level_for_total_xp(100) == 2
+    assert character_manager.level_for_total_xp(299) == 2
+    assert character_manager.level_for_total_xp(300) == 3
+    level = character_manager.level_for_total_xp(10 ** 40)
+    assert (character_manager.total_xp_for_level(level) <= 10 ** 40
+            < character_manager.total_xp_for_level(level + 1))
+    char = character_manager.create_character("LevelTest", "Mage")
+    character_manager.gain_experience(char, 250)
+    assert (char['level'], char['experience']) == (2, 150)
+    assert character_manager.xp_to_next_level(char) == 50
+
 def test_character_gold_management():
     """Test adding and spending gold"""
     char = character_manager.create_character("GoldTest", "Rogue")
@@ -278,7 +317,7 @@ def test_data_validation():
 # FULL GAME WORKFLOW TEST
 # ============================================================================
 
-def test_complete_game_workflow():
+def test_complete_game_workflow(tmp_path):
     """Test a complete game workflow from start to victory"""
     # Create character
     char = character_manager.create_character("WorkflowTest", "Warrior")
@@ -309,7 +348,7 @@ def test_complete_game_workflow():
     inventory_system.purchase_item(char, 'health_potion', items['health_potion'])
     
     # Save character
-    character_manager.save_character(char)
+    character_manager.save_character(char, str(tmp_path))
     
     # Verify workflow
     assert char['level'] >= 1
@@ -318,7 +357,7 @@ def test_complete_game_workflow():
     assert char['gold'] >= 0
     
     # Cleanup
-    character_manager.delete_character("WorkflowTest")
+    character_manager.delete_character("WorkflowTest", str(tmp_path))
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,99 @@
+"""
+Test Leaderboard
+Tests ranking saved characters by stat, overall and per class
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import leaderboard
+from custom_exceptions import *
+
+
+def save_party(save_directory):
+    """Save five characters with known levels, gold and experience"""
+    party = [("Ann", "Rogue", 5, 900, 10), ("Bo", "Warrior", 7, 300, 40),
+             ("Cy", "Rogue", 5, 1200, 0), ("Di", "Mage", 2, 50, 90),
+             ("Ed", "Rogue", 9, 900, 5)]
+    for name, character_class, level, gold, experience in party:
+        char = character_manager.create_character(name, character_class)
+        char['level'] = level
+        char['gold'] = gold
+        char['experience'] = experience
+        character_manager.save_character(char, save_directory)
+
+# ============================================================================
+# LEADERBOARD TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("stats", [["level", "gold"], ["level", "gold", "experience"]])
+def test_leaderboard_top_and_rank(tmp_path, stats):
+    """Test top-k and rank queries after a rebuild from disk"""
+    save_party(str(tmp_path))
+    board = leaderboard.Leaderboard(str(tmp_path), stats)
+    board.rebuild()
+
+    assert len(board) == 5
+    assert board.top("level", 3) == [("Ed", 9), ("Bo", 7), ("Ann", 5)]
+    assert board.top("gold", 2, character_class="Rogue") == [("Cy", 1200), ("Ann", 900)]
+    assert board.rank("Ann", "gold") == 2     # tied with Ed, ahead by name
+    assert board.rank("Ed", "gold") == 3
+    assert board.rank("Ed", "level", character_class="Rogue") == 1
+    assert board.top("gold", 5, character_class="Cleric") == []
+    if "experience" in stats:
+        assert board.top("experience", 1) == [("Di", 90)]
+    with pytest.raises(ValueError):
+        board.top("magic")
+    with pytest.raises(CharacterNotFoundError):
+        board.rank("Bo", "gold", character_class="Rogue")
+
+def test_leaderboard_follows_saves_and_deletes(tmp_path):
+    """Test that an attached leaderboard updates as characters are saved"""
+    save_party(str(tmp_path))
+    board = leaderboard.open_leaderboard(str(tmp_path))
+    other = leaderboard.open_leaderboard(str(tmp_path / "elsewhere"))
+    try:
+        ann = character_manager.load_character("Ann", str(tmp_path))
+        ann['gold'] = 5000
+        character_manager.save_character(ann, str(tmp_path))
+        newcomer = character_manager.create_character("Fay", "Cleric")
+        character_manager.save_character(newcomer, str(tmp_path))
+        character_manager.delete_character("Cy", str(tmp_path))
+
+        assert board.top("gold", 2) == [("Ann", 5000), ("Ed", 900)]
+        assert board.rank("Fay", "level") == 5
+        with pytest.raises(CharacterNotFoundError):
+            board.rank("Cy", "gold")
+        assert len(other) == 0
+
+        rebuilt = leaderboard.Leaderboard(str(tmp_path))
+        rebuilt.rebuild()
+        assert rebuilt.top("gold", 10) == board.top("gold", 10)
+    finally:
+        board.detach()
+        other.detach()
+
+def test_leaderboard_keeps_saves_made_during_rebuild(tmp_path, monkeypatch):
+    """Test that saves and deletes made while the roster is read aren't lost"""
+    save_party(str(tmp_path))
+    real_get_roster = character_manager.get_roster
+
+    def roster_then_save(save_directory):
+        roster = real_get_roster(save_directory)
+        ann = character_manager.load_character("Ann", save_directory)
+        ann['gold'] = 5000
+        character_manager.save_character(ann, save_directory)
+        character_manager.delete_character("Cy", save_directory)
+        return roster
+
+    monkeypatch.setattr(character_manager, "get_roster", roster_then_save)
+    board = leaderboard.open_leaderboard(str(tmp_path), ["level", "gold"])
+    try:
+        assert board.top("gold", 2) == [("Ann", 5000), ("Ed", 900)]
+        assert len(board) == 4
+    finally:
+        board.detach()
@@ -0,0 +1,74 @@
+"""
+Test Population
+Tests mass-producing NPC characters, as records and in columns
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import population
+from custom_exceptions import *
+
+# ============================================================================
+# POPULATION TESTS
+# ============================================================================
+
+def test_spawned_characters_match_create_character():
+    """Test that spawned NPCs are exactly what create_character makes"""
+    npcs = population.spawn_characters(200, {"Rogue": 1, "Cleric": 1}, seed=3)
+    columns = population.spawn_population(200, {"Rogue": 1, "Cleric": 1}, seed=3)
+
+    assert {npc['class'] for npc in npcs} == {"Rogue", "Cleric"}
+    for index, npc in enumerate(npcs):
+        assert npc == character_manager.create_character(f"NPC{index}", npc['class'])
+        assert columns.character(index) == npc
+    assert list(columns) == npcs
+
+def test_population_class_distribution():
+    """Test that classes follow the weights and the seed repeats the draw"""
+    npcs = population.spawn_population(100000, {"Warrior": 3, "Mage": 1}, seed=7)
+    counts = npcs.class_counts()
+
+    assert len(npcs) == 100000
+    assert counts["Rogue"] == counts["Cleric"] == 0
+    assert abs(counts["Warrior"] - 75000) < 1500
+    again = population.spawn_population(100000, {"Warrior": 3, "Mage": 1}, seed=7)
+    assert again.class_codes == npcs.class_codes
+
+def test_population_columns_are_writable():
+    """Test changing an NPC through its columns"""
+    npcs = population.spawn_population(10, {"Mage": 1},
+                                       name_generator=lambda index: f"Villager {index}")
+    npcs.column("gold")[4] += 70000
+    npcs.column("health")[4] -= 30
+
+    npc = npcs.character(4)
+    assert (npc['name'], npc['gold'], npc['health'], npc['max_health']) == \
+        ("Villager 4", 70100, 50, 80)
+
+    npcs.column("health")[5] -= 500
+    assert npcs.character(5)['health'] == -420
+
+def test_population_keeps_small_classes():
+    """Test that a class far below 1/256 of the weight still spawns"""
+    counts = population.spawn_population(100000, {"Warrior": 999, "Mage": 1},
+                                         seed=2).class_counts()
+    assert 50 < counts["Mage"] < 160
+    assert counts["Warrior"] + counts["Mage"] == 100000
+
+    npcs = population.spawn_characters(30000, {"Warrior": 1, "Mage": 1, "Rogue": 1}, seed=5)
+    for name in ("Warrior", "Mage", "Rogue"):
+        assert abs(sum(npc['class'] == name for npc in npcs) - 10000) < 400
+
+def test_population_rejects_bad_weights():
+    """Test unknown classes, negative weights and empty weights"""
+    with pytest.raises(InvalidCharacterClassError):
+        population.spawn_population(10, {"Bard": 1})
+    with pytest.raises(ValueError):
+        population.spawn_characters(10, {"Mage": 0})
+    with pytest.raises(ValueError):
+        population.spawn_population(10, {"Mage": 2, "Rogue": -1})
@@ -0,0 +1,82 @@
+"""
+Test Records
+Tests the slotted Character and Enemy records used in place of dictionaries
+"""
+
+import pytest
+import sys
+import os
+import pickle
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+import combat_system
+from records import Character, Enemy
+
+# ============================================================================
+# RECORD TESTS
+# ============================================================================
+
+def test_character_record_works_like_a_dictionary():
+    """Test mapping access, attributes and overflow keys on a character"""
+    char = character_manager.create_character("Hero", "Mage")
+    assert isinstance(char, Character)
+    assert char['class'] == char.character_class == "Mage"
+    assert list(char)[:3] == ["name", "class", "level"]
+
+    char['gold'] += 50
+    assert char.gold == 150
+    char['equipped_weapon'] = "iron_sword"
+    char['pet'] = "owl"
+    assert 'pet' in char and char.get('mount') is None
+    assert dict(char)['pet'] == "owl"
+
+    del char['pet']
+    assert 'pet' not in char
+    with pytest.raises(KeyError):
+        char['pet']
+    with pytest.raises(AttributeError):
+        char.pet = "owl"
+
+def test_records_compare_copy_and_pickle_like_dictionaries():
+    """Test ==, copy and pickle against the equivalent dictionary"""
+    enemy = combat_system.create_enemy("orc")
+    assert isinstance(enemy, Enemy)
+    assert enemy == {"name": "Orc", "enemy_type": "orc", "health": 80, "max_health": 80,
+                     "strength": 12, "magic": 5, "xp_reward": 50, "gold_reward": 25}
+    copy = enemy.copy()
+    copy['health'] = 1
+    assert enemy['health'] == 80
+    assert pickle.loads(pickle.dumps(enemy)) == enemy
+    assert Enemy.from_mapping(dict(enemy)) == enemy
+
+def test_records_have_no_instance_dictionary():
+    """Test that records keep their fields in slots"""
+    assert not hasattr(character_manager.create_character("Hero", "Rogue"), "__dict__")
+    assert not hasattr(combat_system.create_enemy("goblin"), "__dict__")
+
+def test_loaded_character_is_a_record(tmp_path):
+    """Test that loading a save gives back a Character"""
+    char = character_manager.create_character("Hero", "Cleric")
+    character_manager.save_character(char, str(tmp_path))
+    loaded = character_manager.load_character("Hero", str(tmp_path))
+    assert isinstance(loaded, Character)
+    assert loaded == char
+
+def test_battle_turns_on_records():
+    """Test damage, healing and the battle end check through attributes"""
+    char = character_manager.create_character("Hero", "Cleric")
+    enemy = combat_system.create_enemy("dragon")
+    battle = combat_system.SimpleBattle(char, enemy)
+    char['_dirty'] = False
+
+    damage = battle.calculate_damage(enemy, char)
+    battle.apply_damage(char, damage)
+    assert char.health == char.max_health - damage and char.dirty
+    assert combat_system.use_special_ability(char, enemy) == 30
+    assert char.health == char.max_health
+
+    battle.apply_damage(enemy, enemy.health + 10)
+    assert enemy['health'] == 0
+    assert battle.check_battle_end() == 'player'
@@ -0,0 +1,761 @@
+"""
+Test Save System
+Tests saving, loading and storage options for characters
+"""
+
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import character_manager
+from custom_exceptions import *
+
+
+def make_character(name="SaveTest", character_class="Warrior"):
+    char = character_manager.create_character(name, character_class)
+    char['inventory'] = ["health_potion", "iron_sword"]
+    char['completed_quests'] = ["first_steps"]
+    char['gold'] = 275
+    return char
+
+def list_saves(directory):
+    """List a save directory like os.listdir, leaving out its lock files"""
+    return [name for name in os.listdir(directory) if name != character_manager.LOCK_DIRNAME]
+
+# ============================================================================
+# COMPRESSED SAVE TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("compression", ["gz", "bz2", "xz"])
+def test_compressed_save_round_trip(tmp_path, compression):
+    """Test saving and loading a compressed character"""
+    char = make_character()
+    character_manager.save_character(char, str(tmp_path), compression=compression)
+
+    assert list_saves(tmp_path) == [f"SaveTest_save.txt.{compression}"]
+    assert character_manager.load_character("SaveTest", str(tmp_path)) == char
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["SaveTest"]
+
+def test_changing_compression_replaces_old_save(tmp_path):
+    """Test that only the newest save of a character is kept"""
+    char = make_character()
+    character_manager.save_character(char, str(tmp_path), compression="gz")
+    char['gold'] = 10
+    character_manager.save_character(char, str(tmp_path))
+
+    assert list_saves(tmp_path) == ["SaveTest_save.txt"]
+    assert character_manager.load_character("SaveTest", str(tmp_path))['gold'] == 10
+
+    character_manager.delete_character("SaveTest", str(tmp_path))
+    assert list_saves(tmp_path) == []
+
+def test_corrupted_compressed_save(tmp_path):
+    """Test that a damaged compressed save raises SaveFileCorruptedError"""
+    with open(tmp_path / "Broken_save.txt.gz", "wb") as file:
+        file.write(b"definitely not gzip")
+
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.load_character("Broken", str(tmp_path))
+
+# ============================================================================
+# DIRTY TRACKING TESTS
+# ============================================================================
+
+def test_unchanged_character_is_not_rewritten(tmp_path):
+    """Test that only_if_dirty skips saves when nothing changed"""
+    char = make_character()
+    character_manager.reset_save_stats()
+
+    assert character_manager.save_character(char, str(tmp_path), only_if_dirty=True)
+    assert not character_manager.save_character(char, str(tmp_path), only_if_dirty=True)
+    assert character_manager.get_save_stats() == {"written": 1, "skipped": 1}
+
+def test_mutators_mark_character_dirty(tmp_path):
+    """Test that game actions flag the character for the next save"""
+    import inventory_system
+    import quest_handler
+
+    char = make_character()
+    character_manager.save_character(char, str(tmp_path))
+    assert not character_manager.is_dirty(char)
+
+    character_manager.add_gold(char, 5)
+    assert character_manager.is_dirty(char)
+    character_manager.save_character(char, str(tmp_path))
+
+    inventory_system.add_item_to_inventory(char, "leather_armor")
+    assert character_manager.is_dirty(char)
+    character_manager.save_character(char, str(tmp_path))
+
+    quest_data = {"first_steps": {"required_level": 1, "prerequisite": "NONE"}}
+    char['completed_quests'] = []
+    quest_handler.accept_quest(char, "first_steps", quest_data)
+    assert character_manager.is_dirty(char)
+
+def test_loaded_character_starts_clean(tmp_path):
+    """Test that a freshly loaded character doesn't need saving"""
+    character_manager.save_character(make_character(), str(tmp_path))
+    loaded = character_manager.load_character("SaveTest", str(tmp_path))
+
+    assert not character_manager.is_dirty(loaded)
+    assert not character_manager.save_character(loaded, str(tmp_path), only_if_dirty=True)
+
+# ============================================================================
+# SAVE WRITER TESTS
+# ============================================================================
+
+def test_save_writer_coalesces_pending_saves(tmp_path, monkeypatch):
+    """Test that repeated saves of a queued character become one write"""
+    import threading
+    import save_writer
+
+    release = threading.Event()
+    real_save = character_manager.save_character
+
+    def slow_save(*args):
+        release.wait(5)
+        return real_save(*args)
+
+    monkeypatch.setattr(character_manager, "save_character", slow_save)
+    writer = save_writer.SaveWriter()
+    writer.enqueue(make_character("First"), str(tmp_path))
+
+    char = make_character()
+    for gold in (1, 2, 3):
+        char['gold'] = gold
+        writer.enqueue(char, str(tmp_path))
+    char['gold'] = 999   # changed after the last enqueue, so not saved
+    release.set()
+    writer.shutdown()
+
+    assert writer.stats["written"] == 2
+    assert writer.stats["coalesced"] == 2
+    assert character_manager.load_character("SaveTest", str(tmp_path))['gold'] == 3
+    assert sorted(list_saves(tmp_path)) == ["First_save.txt", "SaveTest_save.txt"]
+
+def test_save_writer_flush_reports_errors(tmp_path):
+    """Test that a failed background write is raised by flush"""
+    import save_writer
+
+    blocker = tmp_path / "not_a_directory"
+    blocker.write_text("")
+    writer = save_writer.SaveWriter()
+    writer.enqueue(make_character(), str(blocker))
+
+    with pytest.raises(OSError):
+        writer.flush()
+    assert writer.stats["failed"] == 1
+    writer.shutdown()
+
+    with pytest.raises(RuntimeError):
+        writer.enqueue(make_character(), str(tmp_path))
+
+def test_failed_background_write_is_retried(tmp_path, monkeypatch):
+    """Test that a character whose write failed is saved by the next dirty-only save"""
+    import save_writer
+
+    monkeypatch.setattr(save_writer, "_writer", save_writer.SaveWriter())
+    blocker = tmp_path / "saves"
+    blocker.write_text("")
+    char = make_character()
+    assert save_writer.enqueue_save(char, str(blocker), only_if_dirty=True)
+    with pytest.raises(OSError):
+        save_writer.flush()
+    assert character_manager.is_dirty(char)
+
+    blocker.unlink()
+    assert save_writer.enqueue_save(char, str(blocker), only_if_dirty=True)
+    save_writer.shutdown()
+    assert character_manager.load_character("SaveTest", str(blocker))['gold'] == 275
+
+def test_main_reports_failed_background_saves(tmp_path, monkeypatch, capsys):
+    """Test that the game prints a failed save instead of crashing"""
+    import main
+    import save_writer
+
+    monkeypatch.setattr(save_writer, "_writer", save_writer.SaveWriter())
+    char = make_character()
+    character_manager.save_character(char, str(tmp_path))
+    stale = character_manager.load_character("SaveTest", str(tmp_path))
+    character_manager.save_character(char, str(tmp_path))
+
+    real_save = character_manager.save_character
+    monkeypatch.setattr(character_manager, "save_character",
+                        lambda *args: real_save(*args, expected_version=stale['_version']))
+    save_writer.enqueue_save(stale, str(tmp_path))
+    main.finish_saves()
+    assert "Error saving game" in capsys.readouterr().out
+
+    save_writer.enqueue_save(stale, str(tmp_path))
+    main.finish_saves(stop=True)
+    assert "Error saving game" in capsys.readouterr().out
+
+def test_write_failing_before_enqueue_returns_stays_dirty(tmp_path, monkeypatch):
+    """Test that a write failing straight away isn't marked clean by enqueue afterwards"""
+    import threading
+    import save_writer
+
+    failed = threading.Event()
+
+    def failing_save(*args):
+        failed.set()
+        raise OSError("disk full")
+
+    class FailBeforeEnqueueReturns:
+        """The writer's condition, but enqueue waits for the failure after releasing it"""
+        def __init__(self, condition):
+            self.condition = condition
+        def __enter__(self):
+            return self.condition.__enter__()
+        def __exit__(self, *exc):
+            result = self.condition.__exit__(*exc)
+            if threading.current_thread() is threading.main_thread():
+                failed.wait(5)
+            return result
+        def __getattr__(self, name):
+            return getattr(self.condition, name)
+
+    monkeypatch.setattr(character_manager, "save_character", failing_save)
+    writer = save_writer.SaveWriter()
+    writer._condition = FailBeforeEnqueueReturns(writer._condition)
+    char = make_character()
+    writer.enqueue(char, str(tmp_path))
+
+    with pytest.raises(OSError):
+        writer.flush()
+    assert character_manager.is_dirty(char)
+    writer.shutdown()
+
+# ============================================================================
+# BINARY SAVE TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("compression", [None, "gz"])
+def test_binary_save_round_trip(tmp_path, compression):
+    """Test saving and loading a character in the binary format"""
+    char = make_character()
+    char['active_quests'] = ["a,b", "ünïcode"]
+    character_manager.save_character(char, str(tmp_path), compression=compression,
+                                     save_format="binary")
+
+    loaded = character_manager.load_character("SaveTest", str(tmp_path))
+    assert loaded == char
+    assert list(loaded) == [key for key in char if key != "_dirty"] + ["_dirty"]
+
+def test_binary_save_is_smaller_than_text(tmp_path):
+    """Test that the binary format takes less space"""
+    char = make_character()
+    text_dir = tmp_path / "text"
+    binary_dir = tmp_path / "binary"
+    character_manager.save_character(char, str(text_dir))
+    character_manager.save_character(char, str(binary_dir), save_format="binary")
+
+    text_size = os.path.getsize(text_dir / "SaveTest_save.txt")
+    assert os.path.getsize(binary_dir / "SaveTest_save.txt") < text_size
+
+def test_damaged_binary_saves(tmp_path):
+    """Test that truncated or future-version binary saves are rejected"""
+    character_manager.save_character(make_character(), str(tmp_path), save_format="binary")
+    path = tmp_path / "SaveTest_save.txt"
+    data = path.read_bytes()
+
+    path.write_bytes(data[:-3])
+    with pytest.raises(SaveFileCorruptedError):
+        character_manager.load_character("SaveTest", str(tmp_path))
+
+    path.write_bytes(data[:4] + bytes([99]) + data[5:])
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.load_character("SaveTest", str(tmp_path))
+
+def test_unknown_save_format(tmp_path):
+    """Test that an unknown save_format is refused"""
+    with pytest.raises(ValueError):
+        character_manager.save_character(make_character(), str(tmp_path), save_format="xml")
+
+def test_binary_save_rejects_out_of_range_stats(tmp_path):
+    """Test that stats the binary header can't hold are refused"""
+    char = make_character()
+    char['gold'] = -1
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.save_character(char, str(tmp_path), save_format="binary")
+
+# ============================================================================
+# SAVE INDEX TESTS
+# ============================================================================
+
+def save_roster(directory):
+    for name, character_class, level in [("Cara", "Mage", 3), ("Abe", "Rogue", 7),
+                                         ("Bo", "Cleric", 5)]:
+        char = character_manager.create_character(name, character_class)
+        char['level'] = level
+        character_manager.save_character(char, directory)
+
+def test_roster_sorting_and_paging(tmp_path):
+    """Test listing saves from the index with sorting and paging"""
+    save_roster(str(tmp_path))
+
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["Abe", "Bo", "Cara"]
+    roster = character_manager.get_roster(str(tmp_path), sort_by="level", reverse=True)
+    assert [(entry['name'], entry['level']) for entry in roster] == [
+        ("Abe", 7), ("Bo", 5), ("Cara", 3)]
+    page = character_manager.get_roster(str(tmp_path), sort_by="class", offset=1, limit=1)
+    assert [entry['class'] for entry in page] == ["Mage"]
+
+    with pytest.raises(ValueError):
+        character_manager.get_roster(str(tmp_path), sort_by="strength")
+
+def test_save_and_delete_update_index(tmp_path):
+    """Test that the index is kept current without rescanning"""
+    import save_index
+
+    save_roster(str(tmp_path))
+    character_manager.list_saved_characters(str(tmp_path))
+
+    char = character_manager.create_character("Dee", "Warrior")
+    char['gold'] = 42
+    character_manager.save_character(char, str(tmp_path), compression="gz")
+    character_manager.delete_character("Abe", str(tmp_path))
+
+    entries = save_index.read_index(str(tmp_path))
+    assert sorted(entries) == ["Bo", "Cara", "Dee"]
+    assert entries["Dee"]["gold"] == 42
+
+def test_stale_index_is_rebuilt(tmp_path):
+    """Test that saves added behind the index's back are picked up"""
+    import save_index
+
+    save_roster(str(tmp_path))
+    character_manager.list_saved_characters(str(tmp_path))
+
+    with open(tmp_path / "Zed_save.txt", "w") as file:
+        file.write("not a save\n")
+    # Make sure the directory counts as newer even on coarse clocks
+    os.utime(save_index.get_index_path(str(tmp_path)), ns=(1, 1))
+
+    roster = character_manager.get_roster(str(tmp_path))
+    assert [entry['name'] for entry in roster] == ["Abe", "Bo", "Cara", "Zed"]
+    assert roster[-1]['level'] is None
+    assert save_index.is_fresh(str(tmp_path))
+
+def test_index_compaction_keeps_concurrent_saves(tmp_path, monkeypatch):
+    """Test that a save made while the index is compacted isn't lost"""
+    import threading
+    import time
+    import save_index
+
+    save_roster(str(tmp_path))
+    character_manager.list_saved_characters(str(tmp_path))
+    char = make_character("Cara")
+    for gold in range(5):
+        char['gold'] = gold
+        character_manager.save_character(char, str(tmp_path))
+    monkeypatch.setattr(save_index, "COMPACT_SLACK", 2)
+
+    real_write_index = save_index.write_index
+    saver = threading.Thread(target=character_manager.save_character,
+                             args=(make_character("Dee"), str(tmp_path)))
+
+    def write_during_save(directory, entries):
+        saver.start()
+        time.sleep(0.2)   # the save runs now, unless the index is locked
+        real_write_index(directory, entries)
+
+    monkeypatch.setattr(save_index, "write_index", write_during_save)
+    character_manager.get_roster(str(tmp_path))
+    saver.join()
+
+    assert save_index.is_fresh(str(tmp_path))
+    assert sorted(save_index.read_index(str(tmp_path))) == ["Abe", "Bo", "Cara", "Dee"]
+
+def test_index_complete_after_concurrent_saves(tmp_path):
+    """Test that threads saving at once never leave a fresh but incomplete index"""
+    import save_index
+
+    save_roster(str(tmp_path))
+    character_manager.list_saved_characters(str(tmp_path))
+    for batch in range(5):
+        chars = [character_manager.create_character(f"Batch{batch}_{i}", "Mage")
+                 for i in range(400)]
+        saved, errors = character_manager.save_characters(chars, str(tmp_path),
+                                                          max_workers=16)
+        assert len(saved) == 400 and errors == {}
+
+    on_disk = [name for name in os.listdir(tmp_path) if name.endswith("_save.txt")]
+    if save_index.is_fresh(str(tmp_path)):
+        assert len(save_index.read_index(str(tmp_path))) == len(on_disk)
+    assert len(character_manager.list_saved_characters(str(tmp_path))) == len(on_disk)
+
+# ============================================================================
+# SHARDED LAYOUT TESTS
+# ============================================================================
+
+def test_sharded_save_layout(tmp_path):
+    """Test saving, loading, listing and deleting in a sharded directory"""
+    (tmp_path / character_manager.SHARD_MARKER).touch()
+    char = make_character()
+    character_manager.save_character(char, str(tmp_path), compression="xz")
+
+    shard = character_manager.get_shard_name("SaveTest")
+    assert os.listdir(tmp_path / shard) == ["SaveTest_save.txt.xz"]
+    assert character_manager.load_character("SaveTest", str(tmp_path)) == char
+    assert character_manager.list_saved_characters(str(tmp_path)) == ["SaveTest"]
+
+    character_manager.delete_character("SaveTest", str(tmp_path))
+    assert character_manager.list_saved_characters(str(tmp_path)) == []
+
+def test_migrate_flat_saves_to_shards(tmp_path):
+    """Test moving an existing flat directory to the sharded layout"""
+    import save_migration
+
+    save_roster(str(tmp_path))
+    character_manager.save_character(make_character(), str(tmp_path), compression="gz")
+    before = character_manager.get_roster(str(tmp_path))
+
+    result = save_migration.migrate_to_sharded(str(tmp_path), workers=4)
+
+    assert result == {"moved": 4, "replaced": 0}
+    assert character_manager.is_sharded(str(tmp_path))
+    assert not [name for name in os.listdir(tmp_path) if "_save.txt" in name]
+    assert character_manager.get_roster(str(tmp_path)) == before
+    assert character_manager.load_character("Bo", str(tmp_path))['class'] == "Cleric"
+
+def test_migration_keeps_save_made_while_moving(tmp_path, monkeypatch):
+    """Test that a save made while its flat copy is moved isn't lost"""
+    import threading
+    import time
+    import save_migration
+
+    char = make_character()
+    character_manager.save_character(char, str(tmp_path))
+    char['gold'] = 999
+    saver = threading.Thread(target=character_manager.save_character,
+                             args=(char, str(tmp_path)))
+    real_find_save_files = character_manager._find_save_files
+
+    def find_during_save(name, directory):
+        files = real_find_save_files(name, directory)
+        if not saver.is_alive() and saver.ident is None:
+            saver.start()
+            time.sleep(0.2)   # the save runs now, unless the character is locked
+        return files
+
+    monkeypatch.setattr(character_manager, "_find_save_files", find_during_save)
+    save_migration.migrate_to_sharded(str(tmp_path), workers=1)
+    saver.join()
+    monkeypatch.undo()
+
+    assert character_manager.load_character("SaveTest", str(tmp_path))['gold'] == 999
+    assert not [name for name in os.listdir(tmp_path) if "_save.txt" in name]
+
+def test_flat_saves_load_during_migration(tmp_path):
+    """Test that saves not yet moved are still found once sharding is on"""
+    character_manager.save_character(make_character(), str(tmp_path))
+    (tmp_path / character_manager.SHARD_MARKER).touch()
+
+    assert character_manager.load_character("SaveTest", str(tmp_path))['gold'] == 275
+    character_manager.save_character(make_character(), str(tmp_path))
+    assert not (tmp_path / "SaveTest_save.txt").exists()
+
+# ============================================================================
+# JOURNAL TESTS
+# ============================================================================
+
+def test_journal_appends_only_changes(tmp_path):
+    """Test that journaled saves append deltas and load replays them"""
+    char = make_character()
+    character_manager.save_character(char, str(tmp_path), journal=True)
+    save_file = tmp_path / "SaveTest_save.txt"
+    snapshot = save_file.read_bytes()
+
+    character_manager.add_gold(char, 25)
+    character_manager.save_character(char, str(tmp_path), journal=True)
+    char['inventory'].append("mana_potion")
+    character_manager.save_character(char, str(tmp_path), journal=True)
+
+    assert save_file.read_bytes() == snapshot
+    journal = (tmp_path / "SaveTest_journal.log").read_text()
+    assert journal == ("VERSION: 2\nGOLD: 300\nCOMMIT\n"
+                       "VERSION: 3\nINVENTORY: health_potion,iron_sword,mana_potion\nCOMMIT\n")
+    assert character_manager.load_character("SaveTest", str(tmp_path)) == char
+
+def test_journal_compacts_into_full_save(tmp_path, monkeypatch):
+    """Test that a long journal is folded back into the save file"""
+    monkeypatch.setattr(character_manager, "JOURNAL_COMPACT_RECORDS", 2)
+    char = make_character()
+    character_manager.save_character(char, str(tmp_path), journal=True)
+    for gold in (1, 2, 3):
+        char['gold'] = gold
+        character_manager.save_character(char, str(tmp_path), journal=True)
+
+    assert not (tmp_path / "SaveTest_journal.log").exists()
+    assert "GOLD: 3" in (tmp_path / "SaveTest_save.txt").read_text()
+    assert character_manager.load_character("SaveTest", str(tmp_path)) == char
+
+def test_torn_journal_record_is_ignored(tmp_path):
+    """Test that a record without its COMMIT line is dropped on load"""
+    char = make_character()
+    character_manager.save_character(char, str(tmp_path), journal=True)
+    with open(tmp_path / "SaveTest_journal.log", "a") as file:
+        file.write("GOLD: 5\nCOMMIT\nHEALTH: 1\nGO")
+
+    loaded = character_manager.load_character("SaveTest", str(tmp_path))
+    assert loaded['gold'] == 5
+    assert loaded['health'] == char['health']
+    assert (tmp_path / "SaveTest_journal.log").read_text() == "GOLD: 5\nCOMMIT\n"
+
+def test_crash_during_compaction_loses_nothing(tmp_path, monkeypatch):
+    """Test that a journal left behind by a full save replays harmlessly"""
+    char = make_character()
+    character_manager.save_character(char, str(tmp_path), journal=True)
+    char['gold'] = 10
+    character_manager.save_character(char, str(tmp_path), journal=True)
+
+    def crash(path):
+        raise OSError("simulated crash")
+
+    char['gold'] = 20
+    char['health'] = 50
+    monkeypatch.setattr(character_manager.os, "remove", crash)
+    with pytest.raises(OSError):
+        character_manager.save_character(char, str(tmp_path))
+    monkeypatch.undo()
+
+    loaded = character_manager.load_character("SaveTest", str(tmp_path))
+    assert (loaded['gold'], loaded['health']) == (20, 50)
+
+# ============================================================================
+# BULK LOAD/SAVE TESTS
+# ============================================================================
+
+def test_bulk_save_and_load(tmp_path):
+    """Test saving and loading many characters with per-name errors"""
+    chars = [make_character(f"Hero{i}") for i in range(20)]
+    broken = make_character("Broken")
+    broken['gold'] = -1
+    saved, errors = character_manager.save_characters(chars + [broken], str(tmp_path),
+                                                      max_workers=4, save_format="binary")
+
+    assert saved == [f"Hero{i}" for i in range(20)]
+    assert list(errors) == ["Broken"]
+    assert isinstance(errors["Broken"], InvalidSaveDataError)
+
+    with open(tmp_path / "Garbled_save.txt", "w") as file:
+        file.write("LEVEL: lots\n")
+    names = [f"Hero{i}" for i in range(20)] + ["Missing", "Garbled"]
+    loaded, errors = character_manager.load_characters(names, str(tmp_path), max_workers=4)
+
+    assert list(loaded) == [f"Hero{i}" for i in range(20)]
+    assert loaded["Hero7"] == chars[7]
+    assert isinstance(errors["Missing"], CharacterNotFoundError)
+    assert isinstance(errors["Garbled"], InvalidSaveDataError)
+
+# ============================================================================
+# SUMMARY LOAD TESTS
+# ============================================================================
+
+@pytest.mark.parametrize("save_format", ["text", "binary"])
+@pytest.mark.parametrize("compression", [None, "gz"])
+def test_load_character_summary(tmp_path, save_format, compression):
+    """Test loading just a few fields of a save"""
+    char = make_character()
+    character_manager.save_character(char, str(tmp_path), compression=compression,
+                                     save_format=save_format)
+
+    summary = character_manager.load_character_summary("SaveTest", str(tmp_path))
+    assert summary == {"name": "SaveTest", "class": "Warrior", "level": 1, "gold": 275}
+    summary = character_manager.load_character_summary(
+        "SaveTest", str(tmp_path), fields=["completed_quests", "health"])
+    assert summary == {"completed_quests": ["first_steps"], "health": 120}
+
+def test_text_summary_stops_before_lists(tmp_path):
+    """Test that the text summary never reads past the fields it needs"""
+    character_manager.save_character(make_character(), str(tmp_path))
+    with open(tmp_path / "SaveTest_save.txt", "a") as file:
+        file.write("not even a save line\n")
+
+    with pytest.raises(InvalidSaveDataError):
+        character_manager.load_character("SaveTest", str(tmp_path))
+    assert character_manager.load_character_summary("SaveTest", str(tmp_path))['gold'] == 275
+
+def test_summary_includes_journal(tmp_path):
+    """Test that journaled changes show up in the summary"""
+    char = make_character()
+    character_manager.save_character(char, str(tmp_path), journal=True)
+    char['level'] = 4
+    character_manager.save_character(char, str(tmp_path), journal=True)
+
+    assert character_manager.load_character_summary("SaveTest", str(tmp_path))['level'] == 4
+    with pytest.raises(ValueError):
+        character_manager.load_character_summary("SaveTest", str(tmp_path), fields=["mana"])
+
+# ============================================================================
+# LOCKING AND VERSION TESTS
+# ============================================================================
+
+def test_save_versions_and_conflicts(tmp_path):
+    """Test version stamps and compare-and-swap saves"""
+    char = make_character()
+    character_manager.save_character(char, str(tmp_path), expected_version=0)
+    assert char['_version'] == 1
+
+    other = character_manager.load_character("SaveTest", str(tmp_path))
+    other['gold'] = 5
+    character_manager.save_character(other, str(tmp_path), expected_version=other['_version'])
+    assert other['_version'] == 2
+
+    char['gold'] = 999
+    with pytest.raises(SaveConflictError):
+        character_manager.save_character(char, str(tmp_path), expected_version=char['_version'])
+    with pytest.raises(SaveConflictError):
+        character_manager.save_character(make_character(), str(tmp_path), expected_version=0)
+    loaded = character_manager.load_character("SaveTest", str(tmp_path))
+    assert loaded['gold'] == 5 and loaded['_version'] == 2
+    assert character_manager.get_lock_stats()['conflicts'] >= 2
+
+def test_lock_files_stay_beside_saves_and_bounded(tmp_path):
+    """Test that lock files live in the save directory and don't grow with the saves"""
+    saves = tmp_path / "saves"
+    chars = [make_character(f"Hero{i}") for i in range(600)]
+    character_manager.save_characters(chars, str(saves))
+
+    lock_files = os.listdir(saves / character_manager.LOCK_DIRNAME)
+    assert len(lock_files) <= 16 ** character_manager.LOCK_STRIPE_DIGITS
+    assert character_manager.list_saved_characters(str(saves)) == sorted(
+        char['name'] for char in chars)
+
+    missing = tmp_path / "missing"
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("Hero1", str(missing))
+    assert not missing.exists()
+
+def test_version_one_binary_save_still_loads(tmp_path):
+    """Test loading a binary save written before version stamps"""
+    char = make_character()
+    data = character_manager._format_binary_save(char)
+    fields = list(character_manager._BINARY_HEADER.unpack_from(data))
+    fields[1] = 1
+    old_header = character_manager._BINARY_HEADERS[1].pack(*fields[:-1])
+    with open(tmp_path / "SaveTest_save.txt", "wb") as file:
+        file.write(old_header + data[character_manager._BINARY_HEADER.size:])
+
+    assert character_manager.load_character("SaveTest", str(tmp_path)) == dict(char, _dirty=False)
+    character_manager.save_character(char, str(tmp_path), expected_version=0)
+    assert char['_version'] == 1
+
+def test_stale_journal_state_falls_back_to_full_save(tmp_path):
+    """Test that a journal save never drops a change made by another process"""
+    char = make_character()
+    character_manager.save_character(char, str(tmp_path), journal=True)
+    # Another process saves in between; this process's journal state
+    # doesn't know about it
+    state = dict(character_manager._JOURNAL_STATE)
+    other = character_manager.load_character("SaveTest", str(tmp_path))
+    other['level'] = 9
+    character_manager.save_character(other, str(tmp_path))
+    character_manager._JOURNAL_STATE.update(state)
+
+    char['level'] = 9
+    char['gold'] = 1
+    character_manager.save_character(char, str(tmp_path), journal=True)
+    loaded = character_manager.load_character("SaveTest", str(tmp_path))
+    assert (loaded['level'], loaded['gold'], loaded['_version']) == (9, 1, 3)
+
+
+def add_gold_concurrently(save_directory, count):
+    """Stress test worker: add 1 gold count times, one save each"""
+    def change(character):
+        character['gold'] += 1
+        character['inventory'].append(f"coin_{os.getpid()}")
+    for _ in range(count):
+        character_manager.update_character("SaveTest", change, save_directory, journal=True)
+    return character_manager.get_lock_stats()
+
+@pytest.mark.skipif(character_manager.fcntl is None, reason="needs fcntl locks")
+def test_concurrent_updates_lose_nothing(tmp_path):
+    """Test many processes updating one save at once"""
+    import multiprocessing
+    if "fork" not in multiprocessing.get_all_start_methods():
+        pytest.skip("needs fork")
+    character_manager.save_character(make_character(), str(tmp_path))
+
+    with multiprocessing.get_context("fork").Pool(4) as pool:
+        stats = pool.starmap(add_gold_concurrently, [(str(tmp_path), 25)] * 4)
+
+    loaded = character_manager.load_character("SaveTest", str(tmp_path))
+    assert loaded['gold'] == 275 + 100
+    assert len(loaded['inventory']) == 2 + 100
+    assert loaded['_version'] == 1 + 100
+    assert sum(stat['acquired'] for stat in stats) >= 200
+
+# ============================================================================
+# CHARACTER CACHE TESTS
+# ============================================================================
+
+def test_cached_loads_return_independent_copies(tmp_path):
+    """Test that a repeated load is a cache hit and copies don't share lists"""
+    character_manager.save_character(make_character(), str(tmp_path))
+    before = character_manager.get_cache_stats()
+    first = character_manager.load_character("SaveTest", str(tmp_path))
+    first['inventory'].append("stolen_gem")
+    first['gold'] = 0
+    second = character_manager.load_character("SaveTest", str(tmp_path))
+    after = character_manager.get_cache_stats()
+
+    assert after['misses'] - before['misses'] == 1
+    assert after['hits'] - before['hits'] == 1
+    assert second['inventory'] == ["health_potion", "iron_sword"]
+    assert second['gold'] == 275
+
+def test_cache_invalidated_by_save_delete_and_outside_edits(tmp_path):
+    """Test that the cache never returns an out of date character"""
+    char = make_character()
+    character_manager.save_character(char, str(tmp_path))
+    character_manager.load_character("SaveTest", str(tmp_path))
+
+    char['gold'] = 5
+    character_manager.save_character(char, str(tmp_path), journal=True)
+    assert character_manager.load_character("SaveTest", str(tmp_path))['gold'] == 5
+    char['gold'] = 6
+    character_manager.save_character(char, str(tmp_path), journal=True)
+    assert character_manager.load_character("SaveTest", str(tmp_path))['gold'] == 6
+
+    save_path = tmp_path / "SaveTest_save.txt"
+    with open(save_path, "a") as file:
+        file.write("GOLD: 7\n")
+    assert character_manager.load_character("SaveTest", str(tmp_path))['gold'] == 7
+
+    # Same size, mtime moved back: still caught
+    stat = os.stat(save_path)
+    with open(save_path, "r+") as file:
+        text = file.read()
+        file.seek(0)
+        file.write(text.replace("GOLD: 7", "GOLD: 8"))
+    os.utime(save_path, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10 ** 9))
+    assert character_manager.load_character("SaveTest", str(tmp_path))['gold'] == 8
+
+    character_manager.delete_character("SaveTest", str(tmp_path))
+    with pytest.raises(CharacterNotFoundError):
+        character_manager.load_character("SaveTest", str(tmp_path))
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    """Test the cache size limit"""
+    for name in ("Ann", "Bo", "Cy"):
+        character_manager.save_character(make_character(name), str(tmp_path))
+    old_size = character_manager.CHARACTER_CACHE_SIZE
+    character_manager.clear_character_cache()
+    character_manager.set_cache_size(2)
+    try:
+        before = character_manager.get_cache_stats()
+        for name in ("Ann", "Bo", "Ann", "Cy", "Ann", "Bo"):
+            character_manager.load_character(name, str(tmp_path))
+        after = character_manager.get_cache_stats()
+    finally:
+        character_manager.set_cache_size(old_size)
+
+    # Ann, Bo miss; Ann hits; Cy misses and evicts Bo; Ann hits; Bo misses
+    assert after['hits'] - before['hits'] == 2
+    assert after['misses'] - before['misses'] == 4
+    assert after['evictions'] - before['evictions'] == 2
+    assert after['size'] == 2